@@ -1,4 +1,6 @@
 """
 Модули искусственного интеллекта для игры Морской бой
 """
-from .smart_ai import SmartAI
\ No newline at end of file
+from .smart_ai import SmartAI
+from .density_ai import DensityAI
+from .anytime import AnytimeAI
\ No newline at end of file
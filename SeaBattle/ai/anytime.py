@@ -0,0 +1,268 @@
+"""
+Модуль с ИИ, ограниченным временем на ход
+"""
+
+import random
+import time
+
+from ai.smart_ai import SmartAI
+from ai.density_ai import DensityAI
+from utils.constants import AI_DIFFICULTY
+
+
+class AnytimeAI(DensityAI):
+    """
+    ИИ по плотности размещений с ограничением времени на ход
+
+    Поиск выстрела идёт шагами через генератор think(). В режиме охоты
+    клетки оцениваются по плотности размещений в случайном порядке, после
+    каждого шага известен лучший выстрел на данный момент, поэтому поиск
+    можно прервать в любой момент. После одного шага выстрел случаен,
+    полный поиск выбирает так же, как DensityAI; между ними сила растёт
+    вместе с числом шагов, поэтому уровни сложности задаются числом шагов
+    или временем на ход.
+
+    При добивании корабля первый шаг - случайная соседняя клетка попадания,
+    дальше соседние клетки оцениваются по размещениям, накрывающим
+    попадания, тоже в случайном порядке, а последний шаг - та же оценка
+    по всем клеткам, что у DensityAI.
+    """
+
+    # Количество клеток, оцениваемых за один шаг поиска (охота и добивание)
+    STEP_CELLS = 8
+    TARGET_STEP_CELLS = 2
+
+    def __init__(self, board, ship_configs=None, cache=None, budget=None, max_steps=None):
+        """
+        Инициализация ИИ
+
+        Args:
+            board (Board): Игровое поле игрока
+            ship_configs (list): Конфигурация флота [(размер, количество), ...]
+            cache (TranspositionTable): Кэш решений охоты (None - без кэша)
+            budget (float): Время на ход в секундах (None - без ограничения)
+            max_steps (int): Число шагов поиска на ход (None - без ограничения)
+        """
+        super().__init__(board, ship_configs, cache)
+        self.budget = budget
+        self.max_steps = max_steps
+
+        # Ход поиска: лучший выстрел и доля выполненной работы
+        self.best_shot = None
+        self.evaluated = 0
+        self.total = 0
+        self.elapsed = 0.0
+
+    @classmethod
+    def for_difficulty(cls, board, difficulty, ship_configs=None, cache=None):
+        """
+        ИИ с ограничениями поиска уровня сложности
+
+        Args:
+            board (Board): Игровое поле игрока
+            difficulty (str): Уровень сложности из AI_DIFFICULTY
+            ship_configs (list): Конфигурация флота
+            cache (TranspositionTable): Кэш решений охоты
+
+        Returns:
+            AnytimeAI: ИИ с бюджетом уровня
+        """
+        level = AI_DIFFICULTY[difficulty]
+        return cls(board, ship_configs, cache, level['budget'], level['steps'])
+
+    @property
+    def completed(self):
+        """Доля выполненного поиска последнего хода (1.0 - поиск завершён)"""
+        return self.evaluated / self.total if self.total else 1.0
+
+    def get_next_shot(self):
+        """Получить координаты следующего выстрела в пределах бюджета"""
+        return self.choose_shot(self.budget, max_steps=self.max_steps)
+
+    def choose_shot(self, budget=None, cancelled=None, max_steps=None):
+        """
+        Поиск выстрела до истечения бюджета
+
+        Бюджет отсчитывается от первого шага поиска, а каждый шаг выполняется
+        целиком: подготовка (кэш, список клеток) в бюджет не входит, поэтому
+        уровень сложности не зависит от того, сколько она заняла. Число шагов
+        от таймера не зависит вовсе: один шаг - случайный выстрел, два -
+        один шаг оценки клеток.
+
+        Args:
+            budget (float): Время в секундах (None - до конца поиска)
+            cancelled (threading.Event): Признак отмены, проверяемый между шагами
+            max_steps (int): Число шагов поиска (None - без ограничения)
+
+        Returns:
+            tuple: Координаты (x, y) лучшего найденного выстрела
+        """
+        started = time.perf_counter()
+        deadline = None
+
+        for steps, _ in enumerate(self.think(), 1):
+            if max_steps is not None and steps >= max_steps:
+                break
+            if budget is not None:
+                now = time.perf_counter()
+                if deadline is None:
+                    deadline = now + budget
+                if now >= deadline:
+                    break
+            if cancelled is not None and cancelled.is_set():
+                break
+
+        self.elapsed = time.perf_counter() - started
+        return self.best_shot
+
+    def think(self):
+        """
+        Пошаговый поиск выстрела
+
+        После каждого yield в self.best_shot лежит лучший выстрел на данный
+        момент, а в self.evaluated и self.total - сколько работы выполнено.
+        Между шагами поле и ИИ не меняются, поэтому генератор можно
+        остановить после любого шага.
+
+        Yields:
+            float: Доля выполненного поиска
+        """
+        self.best_shot = None
+        self.evaluated = 0
+        self.total = 0
+
+        if self.hit_mask:
+            yield from self.think_target()
+            return
+
+        if self.cache is not None:
+            cached = self.cache.get(self.knowledge_hash ^ self.hunt_salt())
+            if cached:
+                self.best_shot = random.choice(cached)
+                yield 1.0
+                return
+
+        # Клетки оцениваются в случайном порядке: прерванный поиск выбирает
+        # лучшую клетку из случайной выборки, и чем больше бюджет, тем она больше
+        order = [cell for cell in self.geometry.cells if cell not in self.shots]
+        if not order:
+            self.best_shot = SmartAI.get_next_shot(self)
+            yield 1.0
+            return
+        random.shuffle(order)
+
+        self.total = len(order)
+        self.best_shot = order[0]
+        yield 0.0
+
+        size = self.size
+        weighted = [(count, self.cover_count[ship_size])
+                    for ship_size, count in self.remaining.items() if count > 0]
+
+        best_score = 0
+        best_cells = []
+        for start in range(0, len(order), self.STEP_CELLS):
+            for x, y in order[start:start + self.STEP_CELLS]:
+                index = y * size + x
+                score = 0
+                for count, counts in weighted:
+                    score += count * counts[index]
+
+                if score > best_score:
+                    best_score = score
+                    best_cells = [(x, y)]
+                elif score == best_score and score:
+                    best_cells.append((x, y))
+
+            self.evaluated = min(start + self.STEP_CELLS, self.total)
+            if best_cells:
+                self.best_shot = best_cells[0]
+            if self.evaluated < self.total:
+                yield self.completed
+
+        if best_cells:
+            self.best_shot = random.choice(best_cells)
+            # Полный результат можно отдавать из кэша без поиска
+            if self.cache is not None:
+                self.cache.put(self.knowledge_hash ^ self.hunt_salt(), best_cells)
+        yield 1.0
+
+    def think_target(self):
+        """
+        Пошаговый поиск выстрела при добивании корабля
+
+        Первый шаг - случайная необстрелянная соседняя клетка попадания.
+        Дальше соседние клетки в случайном порядке оцениваются по
+        размещениям, накрывающим попадания, по TARGET_STEP_CELLS за шаг,
+        и лучшая из оценённых становится выстрелом. Последний шаг - оценка
+        всех клеток, как в DensityAI.
+
+        Yields:
+            float: Доля выполненного поиска
+        """
+        size = self.size
+        neighbors = self.geometry.neighbors4
+        hit_mask = self.hit_mask
+
+        candidates = []
+        for index in range(size * size):
+            if hit_mask >> index & 1:
+                candidates.extend(cell for cell in neighbors[index]
+                                  if cell not in self.shots and cell not in candidates)
+        random.shuffle(candidates)
+
+        # Оценка соседних клеток и итоговая оценка всех клеток
+        self.total = len(candidates) + 1
+        if candidates:
+            self.best_shot = candidates[0]
+            yield self.completed
+
+            best_score = 0
+            for start in range(0, len(candidates), self.TARGET_STEP_CELLS):
+                for x, y in candidates[start:start + self.TARGET_STEP_CELLS]:
+                    score = self.target_cell_score(y * size + x)
+                    if score > best_score:
+                        best_score = score
+                        self.best_shot = (x, y)
+                self.evaluated = min(start + self.TARGET_STEP_CELLS, len(candidates))
+                yield self.completed
+
+        shot = self.target_density_shot()
+        if shot is not None:
+            self.best_shot = shot
+        elif self.best_shot is None:
+            self.best_shot = SmartAI.get_next_shot(self)
+        self.evaluated = self.total
+        yield 1.0
+
+    def target_cell_score(self, index):
+        """
+        Вес клетки при добивании: размещения кораблей на плаву через неё и попадания
+
+        Args:
+            index (int): Индекс клетки
+
+        Returns:
+            int: Вес клетки (так же, как в target_density_shot)
+        """
+        hit_mask = self.hit_mask
+        score = 0
+        for ship_size, count in self.remaining.items():
+            if count <= 0:
+                continue
+
+            alive = self.alive[ship_size]
+            placements = self.tables.placements[ship_size]
+            for placement in self.tables.cover[ship_size][index]:
+                if not alive[placement]:
+                    continue
+                ship_mask, halo_mask, _ = placements[placement]
+                # Размещение должно накрывать попадание и не касаться других
+                if not ship_mask & hit_mask or halo_mask & hit_mask & ~ship_mask:
+                    continue
+                score += count * self.HIT_WEIGHT ** bin(ship_mask & hit_mask).count("1")
+        return score
+
+    def hunt_salt(self):
+        """Соль ключа кэша для решений охоты"""
+        return self.cache_salt(self.hunt_density_candidates)
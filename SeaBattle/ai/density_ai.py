@@ -0,0 +1,351 @@
+"""
+Модуль с ИИ, стреляющим по плотности вероятности размещений
+"""
+
+import random
+from functools import lru_cache
+
+from ai.endgame import EndgameSolver
+from ai.smart_ai import SmartAI
+from models.cell import Cell
+from models.placements import get_placement_table
+from utils.constants import GAME_SETTINGS
+
+
+class PlacementCover:
+    """Размещения кораблей каждого размера и списки размещений, покрывающих каждую клетку"""
+
+    def __init__(self, size, ship_sizes):
+        """
+        Построение таблиц
+
+        Args:
+            size (int): Размер поля
+            ship_sizes (tuple): Размеры кораблей флота
+        """
+        table = get_placement_table(size)
+
+        # размер -> список (маска корабля, маска ореола, индексы клеток)
+        self.placements = {}
+        # размер -> индекс клетки -> номера размещений, покрывающих клетку
+        self.cover = {}
+
+        for ship_size in ship_sizes:
+            placements = []
+            cover = [[] for _ in range(size * size)]
+            for x, y, horizontal, ship_mask, halo_mask in table.by_size[ship_size]:
+                if horizontal:
+                    cells = tuple(y * size + x + i for i in range(ship_size))
+                else:
+                    cells = tuple((y + i) * size + x for i in range(ship_size))
+                for index in cells:
+                    cover[index].append(len(placements))
+                placements.append((ship_mask, halo_mask, cells))
+
+            self.placements[ship_size] = placements
+            self.cover[ship_size] = [tuple(indices) for indices in cover]
+
+
+@lru_cache(maxsize=None)
+def get_placement_cover(size, ship_sizes):
+    """Таблицы покрытия для поля и набора размеров кораблей (строятся один раз)"""
+    return PlacementCover(size, ship_sizes)
+
+
+class DensityAI(SmartAI):
+    """
+    ИИ, выбирающий клетку, которую покрывает больше всего возможных
+    размещений оставшихся на плаву кораблей
+
+    Для каждого размера корабля хранится, какие размещения ещё возможны
+    (не задевают промахи, помеченные клетки и потопленные корабли), и сколько
+    возможных размещений покрывает каждую клетку. После выстрела исключаются
+    только размещения, задевающие новые известные клетки, поэтому обновление
+    не пересчитывает всё поле.
+
+    В режиме охоты выбирается клетка с наибольшей суммой по размерам:
+    количество оставшихся кораблей * число размещений через клетку. Пока есть
+    подбитый, но не потопленный корабль, учитываются только размещения,
+    накрывающие попадания и не касающиеся других попаданий.
+
+    С endgame=True (EndgameAI), когда на плаву остаётся мало кораблей, все их
+    расстановки перебираются точно (EndgameSolver), и выбирается клетка
+    с наибольшей вероятностью попадания. Если расстановок больше порога или
+    перебор не укладывается в бюджет времени, выстрел выбирается по
+    плотности. У DensityAI перебор выключен: на 2000 партиях он не сократил
+    число выстрелов, а время хода увеличил.
+    """
+
+    # Во сколько раз размещение, накрывающее на одно попадание больше, весомее
+    HIT_WEIGHT = 20
+
+    # Точный перебор: наибольшее число кораблей на плаву, наибольшее число
+    # расстановок и время на перебор в секундах
+    ENDGAME_SHIPS = 2
+    ENDGAME_LAYOUTS = 5000
+    ENDGAME_BUDGET = 0.01
+
+    def __init__(self, board, ship_configs=None, cache=None, endgame=False):
+        """
+        Инициализация ИИ
+
+        Args:
+            board (Board): Игровое поле игрока
+            ship_configs (list): Конфигурация флота [(размер, количество), ...]
+            cache (TranspositionTable): Кэш решений охоты (None - без кэша)
+            endgame (bool): Точный перебор расстановок в эндшпиле
+        """
+        if ship_configs is None:
+            ship_configs = GAME_SETTINGS['ship_configs']
+        self.ship_configs = tuple(sorted(ship_configs))
+        self.endgame = endgame
+
+        super().__init__(board, cache)
+
+        self.tables = get_placement_cover(self.size, tuple(size for size, _ in self.ship_configs))
+
+        self.reset_density()
+
+    def cache_name(self):
+        """Имя стратегии для соли хеша: решение зависит и от состава флота"""
+        return f"{super().cache_name()}:{self.ship_configs}"
+
+    def reset_density(self):
+        """Сброс счётчиков размещений к пустому полю"""
+        self.remaining = {ship_size: count for ship_size, count in self.ship_configs}
+        self.alive = {ship_size: bytearray(b"\x01") * len(placements)
+                      for ship_size, placements in self.tables.placements.items()}
+        self.cover_count = {ship_size: [len(indices) for indices in cover]
+                            for ship_size, cover in self.tables.cover.items()}
+
+        # Маски клеток: известные пустые (и потопленные), и попадания по кораблям на плаву
+        self.blocked_mask = 0
+        self.hit_mask = 0
+        self.known = set()
+        self.sunk_ships = set()
+
+    def block_cell(self, index):
+        """Исключение всех размещений, задевающих клетку"""
+        bit = 1 << index
+        if self.blocked_mask & bit:
+            return
+        self.blocked_mask |= bit
+
+        for ship_size, cover in self.tables.cover.items():
+            alive = self.alive[ship_size]
+            counts = self.cover_count[ship_size]
+            placements = self.tables.placements[ship_size]
+            for placement in cover[index]:
+                if alive[placement]:
+                    alive[placement] = 0
+                    for cell in placements[placement][2]:
+                        counts[cell] -= 1
+
+    def sync_with_shots(self):
+        """Учёт клеток, которые появились в self.shots после прошлого обновления"""
+        size = self.size
+        for x, y in self.shots - self.known:
+            self.known.add((x, y))
+            state = self.board.grid[y][x]
+            if state == Cell.HIT:
+                self.hit_mask |= 1 << (y * size + x)
+            elif state == Cell.DESTROYED:
+                self.sink_ship(x, y)
+            else:
+                self.block_cell(y * size + x)
+
+    def sink_ship(self, x, y):
+        """Учёт потопленного корабля в клетке (x, y)"""
+        ship = self.board.get_ship_at(x, y)
+        if ship is None:
+            self.block_cell(y * self.size + x)
+            return
+        if ship in self.sunk_ships:
+            return
+
+        self.sunk_ships.add(ship)
+        if self.remaining.get(ship.size, 0) > 0:
+            self.remaining[ship.size] -= 1
+        for sx, sy in ship.cells:
+            index = sy * self.size + sx
+            self.hit_mask &= ~(1 << index)
+            self.block_cell(index)
+
+    def register_shot(self, x, y, result):
+        """Зарегистрировать результат выстрела"""
+        super().register_shot(x, y, result)
+
+        if result == "destroyed":
+            self.known.add((x, y))
+            self.sink_ship(x, y)
+        self.sync_with_shots()
+
+    def set_state(self, state):
+        """Восстановление состояния ИИ с пересчётом размещений по полю"""
+        super().set_state(state)
+        self.reset_density()
+        self.sync_with_shots()
+
+    def get_next_shot(self):
+        """Получить координаты следующего выстрела"""
+        shot = self.endgame_shot() if self.endgame else None
+        if shot is None and self.hit_mask:
+            shot = self.target_density_shot()
+        elif shot is None:
+            shot = self.hunt_density_shot()
+
+        if shot is None:
+            return super().get_next_shot()
+        return shot
+
+    def endgame_shot(self):
+        """
+        Клетка с наибольшей вероятностью попадания по точному перебору расстановок
+
+        Returns:
+            tuple: Координаты (x, y) или None, если перебор не применим
+                (много кораблей, много расстановок или не хватило времени)
+        """
+        ships = sum(count for count in self.remaining.values() if count > 0)
+        if not ships or ships > self.ENDGAME_SHIPS:
+            return None
+
+        placements = {}
+        for ship_size, count in self.remaining.items():
+            if count > 0:
+                alive = self.alive[ship_size]
+                placements[ship_size] = [placement for number, placement
+                                         in enumerate(self.tables.placements[ship_size])
+                                         if alive[number]]
+
+        solver = EndgameSolver(placements, self.remaining, self.hit_mask,
+                               self.ENDGAME_BUDGET, self.ENDGAME_LAYOUTS)
+        result = solver.solve()
+        if result is None or not result[0]:
+            return None
+
+        size = self.size
+        best_score = 0
+        best_cells = []
+        for index, score in result[1].items():
+            cell = (index % size, index // size)
+            if cell in self.shots:
+                continue
+            if score > best_score:
+                best_score = score
+                best_cells = [cell]
+            elif score == best_score:
+                best_cells.append(cell)
+
+        if not best_cells:
+            return None
+        return random.choice(best_cells)
+
+    def hunt_density_shot(self):
+        """Клетка с наибольшим числом возможных размещений оставшихся кораблей"""
+        best_cells = self.cached_candidates(self.hunt_density_candidates)
+        if not best_cells:
+            return None
+        return random.choice(best_cells)
+
+    def hunt_density_candidates(self):
+        """Все клетки с наибольшим числом возможных размещений оставшихся кораблей"""
+        size = self.size
+        shots = self.shots
+        weighted = [(count, self.cover_count[ship_size])
+                    for ship_size, count in self.remaining.items() if count > 0]
+
+        best_score = 0
+        best_cells = []
+        for index in range(size * size):
+            cell = (index % size, index // size)
+            if cell in shots:
+                continue
+
+            score = 0
+            for count, counts in weighted:
+                score += count * counts[index]
+
+            if score > best_score:
+                best_score = score
+                best_cells = [cell]
+            elif score == best_score and score:
+                best_cells.append(cell)
+
+        return tuple(best_cells)
+
+    def target_density_shot(self):
+        """Клетка, которую чаще всего накрывают размещения добиваемого корабля"""
+        size = self.size
+        hit_mask = self.hit_mask
+        scores = {}
+        seen = set()
+
+        hit_cells = []
+        mask = hit_mask
+        while mask:
+            low = mask & -mask
+            hit_cells.append(low.bit_length() - 1)
+            mask ^= low
+
+        for ship_size, count in self.remaining.items():
+            if count <= 0:
+                continue
+
+            alive = self.alive[ship_size]
+            placements = self.tables.placements[ship_size]
+            cover = self.tables.cover[ship_size]
+
+            for hit in hit_cells:
+                for placement in cover[hit]:
+                    if not alive[placement] or (ship_size, placement) in seen:
+                        continue
+                    seen.add((ship_size, placement))
+
+                    ship_mask, halo_mask, cells = placements[placement]
+                    # Соседние попадания принадлежат тому же кораблю
+                    if halo_mask & hit_mask & ~ship_mask:
+                        continue
+
+                    weight = count * self.HIT_WEIGHT ** bin(ship_mask & hit_mask).count("1")
+                    for index in cells:
+                        if not hit_mask >> index & 1:
+                            scores[index] = scores.get(index, 0) + weight
+
+        best_score = 0
+        best_cells = []
+        for index, score in scores.items():
+            cell = (index % size, index // size)
+            if cell in self.shots:
+                continue
+            if score > best_score:
+                best_score = score
+                best_cells = [cell]
+            elif score == best_score:
+                best_cells.append(cell)
+
+        if not best_cells:
+            return None
+        return random.choice(best_cells)
+
+
+class EndgameAI(DensityAI):
+    """
+    ИИ по плотности размещений с точным перебором в эндшпиле
+
+    Когда на плаву остаётся не больше ENDGAME_SHIPS кораблей, выстрел
+    выбирается по точному перебору расстановок (EndgameSolver); если
+    расстановок больше ENDGAME_LAYOUTS или перебор не укладывается
+    в ENDGAME_BUDGET, ход делается так же, как у DensityAI.
+    """
+
+    def __init__(self, board, ship_configs=None, cache=None):
+        """
+        Инициализация ИИ
+
+        Args:
+            board (Board): Игровое поле игрока
+            ship_configs (list): Конфигурация флота [(размер, количество), ...]
+            cache (TranspositionTable): Кэш решений охоты (None - без кэша)
+        """
+        super().__init__(board, ship_configs, cache, endgame=True)
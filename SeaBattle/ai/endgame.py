@@ -0,0 +1,169 @@
+"""
+Модуль с точным решателем эндшпиля
+
+Когда на плаву остаётся несколько кораблей, все их расстановки, согласные
+с известными клетками, можно перебрать. Доля расстановок, в которых
+клетка занята кораблём, - точная вероятность попадания в неё.
+"""
+
+import time
+
+
+class SolverAborted(Exception):
+    """Перебор прерван: исчерпан бюджет времени или расстановок слишком много"""
+
+
+class EndgameSolver:
+    """
+    Перебор расстановок оставшихся кораблей на битовых масках
+
+    Каждая расстановка раскладывается однозначно: сначала ставится корабль,
+    накрывающий младшее ещё не накрытое попадание, и так до тех пор, пока
+    все попадания не накрыты; остальные корабли ставятся по убыванию
+    размера, а одинаковые - по возрастанию номера размещения, поэтому
+    каждая расстановка встречается ровно один раз. Результаты подзадач
+    (оставшиеся корабли, ненакрытые попадания, запрещённые клетки)
+    запоминаются и не пересчитываются.
+    """
+
+    # Как часто проверяется время, узлов перебора
+    CLOCK_INTERVAL = 256
+
+    def __init__(self, placements, ship_counts, hit_mask, budget=None, max_layouts=None):
+        """
+        Инициализация решателя
+
+        Args:
+            placements (dict): Размер -> список возможных размещений
+                (маска корабля, маска ореола, индексы клеток); размещения уже
+                не задевают промахи и потопленные корабли
+            ship_counts (dict): Размер -> сколько кораблей осталось на плаву
+            hit_mask (int): Попадания по кораблям на плаву
+            budget (float): Время на перебор в секундах (None - без ограничения)
+            max_layouts (int): Перебор прерывается, как только расстановок
+                больше (None - без ограничения)
+        """
+        self.sizes = tuple(sorted((size for size, count in ship_counts.items() if count > 0),
+                                  reverse=True))
+        self.counts = tuple(ship_counts[size] for size in self.sizes)
+        self.hit_mask = hit_mask
+        self.budget = budget
+        self.max_layouts = max_layouts
+
+        # Корабль, не накрывающий попаданий, не может их и касаться
+        self.free = tuple(tuple(placement for placement in placements.get(size, ())
+                                if not placement[1] & hit_mask)
+                          for size in self.sizes)
+
+        # Для каждого попадания - размещения каждого размера, которые его накрывают
+        # и не касаются других попаданий (соседние попадания - один корабль)
+        self.covering = {}
+        mask = hit_mask
+        while mask:
+            low = mask & -mask
+            self.covering[low] = tuple(
+                tuple(placement for placement in placements.get(size, ())
+                      if placement[0] & low and not placement[1] & hit_mask & ~placement[0])
+                for size in self.sizes)
+            mask ^= low
+
+        self.memo = {}
+        self.nodes = 0
+        self.deadline = None
+
+    def solve(self):
+        """
+        Перебор всех согласных расстановок
+
+        Returns:
+            tuple: (число расстановок, {индекс клетки: в скольких расстановках она занята})
+                или None, если перебор прерван
+        """
+        self.memo = {}
+        self.nodes = 0
+        self.deadline = None if self.budget is None else time.perf_counter() + self.budget
+
+        try:
+            return self._count(self.counts, self.hit_mask, 0, 0)
+        except SolverAborted:
+            return None
+
+    def _count(self, counts, uncovered, forbidden, start):
+        """
+        Число расстановок подзадачи и занятость клеток в них
+
+        Args:
+            counts (tuple): Оставшиеся корабли по размерам self.sizes
+            uncovered (int): Ещё не накрытые попадания
+            forbidden (int): Клетки, занятые уже поставленными кораблями и их ореолами
+            start (int): Наименьший номер размещения для корабля текущего размера
+
+        Returns:
+            tuple: (число расстановок, {индекс клетки: число расстановок})
+        """
+        key = (counts, uncovered, forbidden, start)
+        result = self.memo.get(key)
+        if result is not None:
+            return result
+
+        self.nodes += 1
+        if (self.deadline is not None and not self.nodes % self.CLOCK_INTERVAL
+                and time.perf_counter() > self.deadline):
+            raise SolverAborted()
+
+        total = 0
+        tallies = {}
+
+        if uncovered:
+            # Корабль, накрывающий младшее попадание, может быть любого оставшегося размера
+            low = uncovered & -uncovered
+            for level, options in enumerate(self.covering[low]):
+                if not counts[level]:
+                    continue
+                rest = counts[:level] + (counts[level] - 1,) + counts[level + 1:]
+                for ship_mask, halo_mask, cells in options:
+                    if ship_mask & forbidden:
+                        continue
+                    count, sub_tallies = self._count(rest, uncovered & ~ship_mask,
+                                                     forbidden | halo_mask, 0)
+                    if count:
+                        total = self._add(total, count)
+                        self._merge(tallies, sub_tallies, cells, count)
+        else:
+            level = next((level for level, count in enumerate(counts) if count), None)
+            if level is None:
+                result = (1, {})
+                self.memo[key] = result
+                return result
+
+            rest = counts[:level] + (counts[level] - 1,) + counts[level + 1:]
+            options = self.free[level]
+            for index in range(start, len(options)):
+                ship_mask, halo_mask, cells = options[index]
+                if ship_mask & forbidden:
+                    continue
+                # Следующий корабль того же размера - только с большим номером размещения
+                next_start = index + 1 if rest[level] else 0
+                count, sub_tallies = self._count(rest, 0, forbidden | halo_mask, next_start)
+                if count:
+                    total = self._add(total, count)
+                    self._merge(tallies, sub_tallies, cells, count)
+
+        result = (total, tallies)
+        self.memo[key] = result
+        return result
+
+    def _add(self, total, count):
+        """Сложение числа расстановок с проверкой порога (подзадача не больше всей задачи)"""
+        total += count
+        if self.max_layouts is not None and total > self.max_layouts:
+            raise SolverAborted()
+        return total
+
+    @staticmethod
+    def _merge(tallies, sub_tallies, cells, count):
+        """Добавление занятости клеток подзадачи и клеток поставленного корабля"""
+        for index, value in sub_tallies.items():
+            tallies[index] = tallies.get(index, 0) + value
+        for index in cells:
+            tallies[index] = tallies.get(index, 0) + count
@@ -0,0 +1,125 @@
+"""
+Модуль с индексированной двоичной кучей
+"""
+
+
+class IndexedHeap:
+    """
+    Двоичная куча с минимальным приоритетом наверху и индексом позиций
+
+    Каждый ключ хранится не больше одного раза. Индекс ключ -> позиция
+    позволяет изменить приоритет или удалить любой ключ за O(log n),
+    а не только вершину кучи.
+    """
+
+    def __init__(self, items=None):
+        """
+        Инициализация кучи
+
+        Args:
+            items (dict): Начальные элементы {ключ: приоритет}
+        """
+        self.entries = []
+        self.positions = {}
+
+        if items:
+            self.entries = [(priority, key) for key, priority in items.items()]
+            for position, (_, key) in enumerate(self.entries):
+                self.positions[key] = position
+            for position in reversed(range(len(self.entries) // 2)):
+                self._sift_down(position)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def push(self, key, priority):
+        """Добавление ключа или изменение его приоритета"""
+        position = self.positions.get(key)
+        if position is None:
+            self.entries.append((priority, key))
+            self.positions[key] = len(self.entries) - 1
+            self._sift_up(len(self.entries) - 1)
+            return
+
+        old_priority = self.entries[position][0]
+        self.entries[position] = (priority, key)
+        if priority < old_priority:
+            self._sift_up(position)
+        elif old_priority < priority:
+            self._sift_down(position)
+
+    def remove(self, key):
+        """Удаление ключа (если он есть в куче)"""
+        position = self.positions.pop(key, None)
+        if position is None:
+            return
+
+        last = self.entries.pop()
+        if position < len(self.entries):
+            self.entries[position] = last
+            self.positions[last[1]] = position
+            self._sift_up(position)
+            self._sift_down(self.positions[last[1]])
+
+    def peek(self):
+        """
+        Элемент с минимальным приоритетом
+
+        Returns:
+            tuple: (ключ, приоритет)
+        """
+        priority, key = self.entries[0]
+        return key, priority
+
+    def pop(self):
+        """
+        Извлечение элемента с минимальным приоритетом
+
+        Returns:
+            tuple: (ключ, приоритет)
+        """
+        key, priority = self.peek()
+        self.remove(key)
+        return key, priority
+
+    def _sift_up(self, position):
+        """Подъём элемента к вершине, пока родитель больше"""
+        entries = self.entries
+        positions = self.positions
+        entry = entries[position]
+
+        while position:
+            parent = (position - 1) >> 1
+            if not entry < entries[parent]:
+                break
+            entries[position] = entries[parent]
+            positions[entries[position][1]] = position
+            position = parent
+
+        entries[position] = entry
+        positions[entry[1]] = position
+
+    def _sift_down(self, position):
+        """Опускание элемента, пока меньший из потомков меньше него"""
+        entries = self.entries
+        positions = self.positions
+        count = len(entries)
+        entry = entries[position]
+
+        while True:
+            child = 2 * position + 1
+            if child >= count:
+                break
+            if child + 1 < count and entries[child + 1] < entries[child]:
+                child += 1
+            if not entries[child] < entry:
+                break
+            entries[position] = entries[child]
+            positions[entries[position][1]] = position
+            position = child
+
+        entries[position] = entry
+        positions[entry[1]] = position
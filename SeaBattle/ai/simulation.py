@@ -0,0 +1,283 @@
+"""
+Модуль с безоконными партиями ИИ против ИИ и турниром на пуле процессов
+"""
+
+import multiprocessing
+import random
+import time
+from collections import Counter
+
+from ai.smart_ai import SmartAI
+from ai.density_ai import DensityAI, EndgameAI
+from ai.transposition import TranspositionTable
+from models.bit_board import BitBoard
+from models.fleet_generator import FleetGenerator
+from models.fleet_sampler import UniformFleetSampler
+from utils.constants import GAME_SETTINGS
+
+
+# Стратегии стрельбы и генераторы расстановок по именам
+STRATEGIES = {
+    'smart': SmartAI,
+    'density': DensityAI,
+    'endgame': EndgameAI
+}
+
+GENERATORS = {
+    'auto': FleetGenerator,
+    'uniform': UniformFleetSampler
+}
+
+# Количество партий в одной задаче пула по умолчанию
+CHUNK_SIZE = 1000
+
+# Размер кэша решений ИИ в каждом процессе пула
+CACHE_CAPACITY = 100000
+
+# Кэш решений процесса: дебюты повторяются от партии к партии
+process_cache = None
+
+
+def get_process_cache():
+    """Кэш решений ИИ текущего процесса (создаётся при первом обращении)"""
+    global process_cache
+    if process_cache is None:
+        process_cache = TranspositionTable(CACHE_CAPACITY)
+    return process_cache
+
+
+def create_strategy(name, board, ship_configs, cache=None):
+    """
+    Создание ИИ по имени стратегии
+
+    Args:
+        name (str): Имя стратегии из STRATEGIES
+        board (Board): Поле, по которому стреляет ИИ
+        ship_configs (list): Конфигурация флота [(размер, количество), ...]
+        cache (TranspositionTable): Кэш решений ИИ
+
+    Returns:
+        SmartAI: ИИ стратегии
+    """
+    strategy = STRATEGIES[name]
+    if issubclass(strategy, DensityAI):
+        return strategy(board, ship_configs, cache)
+    return strategy(board, cache)
+
+
+def play_solo(strategy, layout, size, ship_configs, cache=None):
+    """
+    Стрельба ИИ по одному флоту до его полного уничтожения
+
+    Args:
+        strategy (str): Имя стратегии
+        layout (list): Расстановка флота [(размер, x, y, horizontal), ...]
+        size (int): Размер поля
+        ship_configs (list): Конфигурация флота
+        cache (TranspositionTable): Кэш решений ИИ (решения с кэшем и без него совпадают)
+
+    Returns:
+        list: Результаты выстрелов по порядку ("miss", "hit", "destroyed")
+    """
+    board = BitBoard(size)
+    board.place_layout(layout)
+    return play_out(create_strategy(strategy, board, ship_configs, cache), board)
+
+
+def play_out(ai, board):
+    """
+    Стрельба готового ИИ по полю до уничтожения всех кораблей
+
+    Args:
+        ai (SmartAI): ИИ, стреляющий по полю
+        board (Board): Поле с расставленным флотом
+
+    Returns:
+        list: Результаты выстрелов по порядку ("miss", "hit", "destroyed")
+    """
+    ships_left = len(board.ships)
+    results = []
+    # Защита от зацикливания стратегии: больше выстрелов, чем клеток, не бывает
+    for _ in range(board.size * board.size):
+        x, y = ai.get_next_shot()
+        result = board.shoot(x, y)
+        ai.register_shot(x, y, result)
+        results.append(result)
+        if result == "destroyed":
+            ships_left -= 1
+            if not ships_left:
+                break
+    return results
+
+
+def decide_winner(results, first):
+    """
+    Определение победителя по выстрелам обеих сторон
+
+    Стороны стреляют по очереди, попадание даёт ещё один выстрел, как в игре.
+    Выстрелы ИИ не зависят от выстрелов противника, поэтому партии сторон
+    можно сыграть по отдельности и затем свести по правилам очерёдности.
+
+    Args:
+        results (list): Результаты выстрелов каждой стороны [список_0, список_1]
+        first (int): Сторона, стреляющая первой
+
+    Returns:
+        int: Номер победившей стороны
+    """
+    positions = [0, 0]
+    side = first
+    while True:
+        shots = results[side]
+        position = positions[side]
+        while position < len(shots) and shots[position] != "miss":
+            position += 1
+        if position >= len(shots):
+            return side
+        positions[side] = position + 1
+        side = 1 - side
+
+
+def run_chunk(task):
+    """
+    Серия партий в одном процессе пула
+
+    Генераторы случайных чисел задачи заводятся от общего seed и номера
+    задачи, поэтому итог турнира не зависит от числа процессов и порядка
+    выполнения задач.
+
+    Args:
+        task (tuple): (стратегии, генератор, размер поля, флот, seed, номер задачи,
+            номер первой партии, число партий)
+
+    Returns:
+        dict: Распределения выстрелов до победы, победы сторон и число партий
+    """
+    strategies, generator_name, size, ship_configs, seed, chunk, first_game, games = task
+
+    # ИИ пользуются модулем random, поэтому поток задачи задаётся его seed
+    random.seed(f"{seed}:{chunk}:ai")
+    generator = GENERATORS[generator_name](size, ship_configs, rng=random.Random(f"{seed}:{chunk}:fleet"))
+
+    cache = get_process_cache()
+    shots = [Counter(), Counter()]
+    wins = [0, 0]
+    for game in range(games):
+        results = [play_solo(strategy, generator.generate(), size, ship_configs, cache)
+                   for strategy in strategies]
+        for side in (0, 1):
+            shots[side][len(results[side])] += 1
+        # Первый ход по очереди, чтобы не давать преимущество одной стороне
+        wins[decide_winner(results, (first_game + game) % 2)] += 1
+
+    return {'shots': shots, 'wins': wins, 'games': games}
+
+
+def percentile(histogram, fraction):
+    """Наименьшее значение, на котором набирается доля fraction распределения"""
+    total = sum(histogram.values())
+    threshold = fraction * total
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= threshold:
+            return value
+    return 0
+
+
+def summarize_shots(histogram):
+    """
+    Сводка распределения выстрелов до победы
+
+    Args:
+        histogram (Counter): Количество выстрелов -> число партий
+
+    Returns:
+        dict: Среднее, минимум, максимум, квантили и само распределение
+    """
+    total = sum(histogram.values())
+    if not total:
+        return {'mean': 0, 'min': 0, 'max': 0, 'p5': 0, 'p50': 0, 'p95': 0, 'histogram': {}}
+
+    return {
+        'mean': sum(value * count for value, count in histogram.items()) / total,
+        'min': min(histogram),
+        'max': max(histogram),
+        'p5': percentile(histogram, 0.05),
+        'p50': percentile(histogram, 0.5),
+        'p95': percentile(histogram, 0.95),
+        'histogram': dict(sorted(histogram.items()))
+    }
+
+
+def run_tournament(strategy_a, strategy_b=None, games=10000, generator='auto', size=None,
+                   ship_configs=None, seed=0, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Турнир двух стратегий на пуле процессов
+
+    Args:
+        strategy_a (str): Стратегия первой стороны
+        strategy_b (str): Стратегия второй стороны (по умолчанию та же)
+        games (int): Количество партий
+        generator (str): Генератор расстановок из GENERATORS
+        size (int): Размер поля
+        ship_configs (list): Конфигурация флота
+        seed (int): Общее начальное значение генераторов
+        workers (int): Количество процессов (по умолчанию - по числу ядер, 1 - без пула)
+        chunk_size (int): Партий в одной задаче пула
+
+    Returns:
+        dict: Итоги турнира
+    """
+    if strategy_b is None:
+        strategy_b = strategy_a
+    for name in (strategy_a, strategy_b):
+        if name not in STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия: {name}")
+    if generator not in GENERATORS:
+        raise ValueError(f"Неизвестный генератор расстановок: {generator}")
+    if size is None:
+        size = GAME_SETTINGS['board_size']
+    if ship_configs is None:
+        ship_configs = GAME_SETTINGS['ship_configs']
+    ship_configs = tuple(ship_configs)
+
+    tasks = []
+    for chunk, start in enumerate(range(0, games, chunk_size)):
+        tasks.append(((strategy_a, strategy_b), generator, size, ship_configs, seed,
+                      chunk, start, min(chunk_size, games - start)))
+
+    shots = [Counter(), Counter()]
+    wins = [0, 0]
+    played = 0
+
+    started = time.perf_counter()
+    if workers == 1:
+        outcomes = map(run_chunk, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        outcomes = pool.imap_unordered(run_chunk, tasks)
+
+    try:
+        for outcome in outcomes:
+            for side in (0, 1):
+                shots[side].update(outcome['shots'][side])
+                wins[side] += outcome['wins'][side]
+            played += outcome['games']
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'strategies': (strategy_a, strategy_b),
+        'generator': generator,
+        'games': played,
+        'seed': seed,
+        'seconds': elapsed,
+        'games_per_second': played / elapsed if elapsed else 0.0,
+        'win_rates': [count / played if played else 0.0 for count in wins],
+        'shots': [summarize_shots(histogram) for histogram in shots]
+    }
@@ -3,20 +3,83 @@
 """
 
 import random
+from functools import lru_cache
 from models.cell import Cell
+from models.geometry import get_geometry, DIRECTION_INDEX
+from ai.indexed_heap import IndexedHeap
+from ai.weights import get_weights, normalize_weights
+from ai.transposition import (get_zobrist_keys, strategy_salt,
+                              KNOWN_MISS, KNOWN_HIT, KNOWN_SUNK, KNOWN_MARKED)
+
+
+# Состояние клетки в знании ИИ по состоянию клетки поля
+KNOWLEDGE_STATES = {
+    Cell.MISS: KNOWN_MISS,
+    Cell.HIT: KNOWN_HIT,
+    Cell.DESTROYED: KNOWN_SUNK
+}
+
+
+@lru_cache(maxsize=None)
+def base_priorities(size, parity=10, center_weight=1, edge=5):
+    """
+    Постоянная часть приоритета охоты для каждой клетки поля
+
+    Шахматный порядок, близость к центру и штраф за край поля не зависят
+    от выстрелов, поэтому считаются один раз на размер поля и набор весов.
+
+    Args:
+        size (int): Размер поля
+        parity (float): Бонус клетке шахматного порядка
+        center_weight (float): Множитель бонуса за близость к центру
+        edge (float): Штраф клетке на краю поля
+
+    Returns:
+        tuple: Приоритеты по номеру клетки y * size + x
+    """
+    center = (size - 1) / 2
+    priorities = []
+    for y in range(size):
+        for x in range(size):
+            priority = 0
+
+            if (x + y) % 2 == 0:
+                priority += parity
+
+            distance_from_center = abs(x - center) + abs(y - center)
+            priority += center_weight * max(0, size - 1 - distance_from_center)
+
+            if x == 0 or x == size - 1 or y == 0 or y == size - 1:
+                priority -= edge
+
+            priorities.append(priority)
+    return tuple(priorities)
 
 
 class SmartAI:
     """Умный ИИ для компьютера"""
 
-    def __init__(self, board):
+    def __init__(self, board, cache=None, weights=None):
         """
         Инициализация ИИ
 
         Args:
             board (Board): Игровое поле игрока
+            cache (TranspositionTable): Кэш решений охоты (None - без кэша)
+            weights (dict): Веса приоритетов охоты (None - из профиля весов
+                для поля и флота, если он есть, иначе по умолчанию)
         """
         self.board = board
+        self.size = board.size
+        self.geometry = get_geometry(board.size)
+
+        if weights is None:
+            weights = get_weights(board.size)
+        self.weights = normalize_weights(weights)
+        self.base_priorities = base_priorities(board.size, self.weights['parity'],
+                                               self.weights['center'], self.weights['edge'])
+        self.miss_weight = self.weights['miss']
+        self.hit_weight = self.weights['hit']
         self.shots = set()
         self.last_hit = None
         self.hit_direction = None
@@ -24,6 +87,55 @@ class SmartAI:
         self.directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
         self.mode = "hunt"
 
+        # Приоритеты режима охоты: куча строится при первом выстреле охоты,
+        # затем пересчитываются только соседи новых клеток из self.shots
+        self.priority_heap = None
+        self.pending_cells = []
+
+        # Знание о поле (клетка -> KNOWN_*) и его хеш Зобриста для кэша решений
+        self.cache = cache
+        self.cache_salts = {}
+        self.zobrist = get_zobrist_keys(board.size)
+        self.knowledge = {}
+        self.knowledge_hash = 0
+
+    def cache_name(self):
+        """Имя стратегии для соли хеша: решения разных стратегий и весов не смешиваются в кэше"""
+        weights = ",".join(f"{name}={value}" for name, value in self.weights.items())
+        return f"{type(self).__name__}:{weights}"
+
+    def get_state(self):
+        """
+        Состояние ИИ для сохранения
+
+        Returns:
+            dict: Выстрелы, режим, последнее попадание, направление и очередь целей
+        """
+        return {
+            'shots': set(self.shots),
+            'mode': self.mode,
+            'last_hit': self.last_hit,
+            'hit_direction': self.hit_direction,
+            'hits_to_follow': list(self.hits_to_follow)
+        }
+
+    def set_state(self, state):
+        """
+        Восстановление состояния ИИ
+
+        Args:
+            state (dict): Состояние, полученное от get_state
+        """
+        self.shots = set(state['shots'])
+        self.priority_heap = None
+        self.pending_cells = []
+        self.knowledge = {(x, y): self.classify_cell(x, y) for x, y in self.shots}
+        self.knowledge_hash = self.zobrist.hash_cells(self.knowledge)
+        self.mode = state['mode']
+        self.last_hit = state['last_hit']
+        self.hit_direction = state['hit_direction']
+        self.hits_to_follow = list(state['hits_to_follow'])
+
     def get_next_shot(self):
         """Получить координаты следующего выстрела"""
         if self.mode == "target" and self.hits_to_follow:
@@ -70,87 +182,156 @@ class SmartAI:
 
     def check_line_for_hits(self, x, y, dx, dy):
         """Проверить линию на наличие попаданий"""
-        hits_in_line = 0
-
-        nx, ny = x + dx, y + dy
-        while 0 <= nx < 10 and 0 <= ny < 10:
-            if (nx, ny) in self.shots and self.board.grid[ny][nx] in [Cell.HIT, Cell.DESTROYED]:
-                hits_in_line += 1
-            nx += dx
-            ny += dy
+        rays = self.geometry.rays[y * self.size + x]
+        grid = self.board.grid
 
-        nx, ny = x - dx, y - dy
-        while 0 <= nx < 10 and 0 <= ny < 10:
-            if (nx, ny) in self.shots and self.board.grid[ny][nx] in [Cell.HIT, Cell.DESTROYED]:
-                hits_in_line += 1
-            nx -= dx
-            ny -= dy
+        for ray in (rays[DIRECTION_INDEX[(dx, dy)]], rays[DIRECTION_INDEX[(-dx, -dy)]]):
+            for nx, ny in ray:
+                if (nx, ny) in self.shots and grid[ny][nx] in (Cell.HIT, Cell.DESTROYED):
+                    return True
 
-        return hits_in_line > 0
+        return False
 
     def hunt_mode_shot(self):
         """Стратегическая стрельба в режиме охоты"""
-        priority_cells = []
+        candidates = self.cached_candidates(self.hunt_candidates)
 
-        for y in range(10):
-            for x in range(10):
-                if self.is_valid_shot(x, y):
-                    priority = self.calculate_priority(x, y)
-                    priority_cells.append((priority, (x, y)))
-
-        priority_cells.sort(reverse=True, key=lambda x: x[0])
-
-        if priority_cells:
-            return priority_cells[0][1]
+        if candidates:
+            return candidates[0]
 
         while True:
-            x = random.randint(0, 9)
-            y = random.randint(0, 9)
+            x = random.randrange(self.size)
+            y = random.randrange(self.size)
             if (x, y) not in self.shots:
                 return (x, y)
 
-    def calculate_priority(self, x, y):
-        """Рассчитать приоритет клетки для выстрела"""
-        priority = 0
+    def hunt_candidates(self):
+        """Лучшая клетка кучи приоритетов охоты"""
+        heap = self.update_priorities()
+        if heap:
+            return (heap.peek()[0],)
+        return ()
+
+    def cached_candidates(self, compute):
+        """
+        Клетки-кандидаты выстрела из кэша решений
 
-        if (x + y) % 2 == 0:
-            priority += 10
+        Решение охоты зависит только от знания о поле, поэтому его можно
+        взять из кэша по хешу знания. Вызывающий выбирает выстрел среди
+        кандидатов так же, как выбрал бы без кэша.
 
-        distance_from_center = abs(x - 4.5) + abs(y - 4.5)
-        priority += max(0, 9 - distance_from_center)
+        Args:
+            compute (callable): Вычисление кандидатов, если позиции нет в кэше
+
+        Returns:
+            tuple: Клетки-кандидаты (пустой кортеж - кандидатов нет)
+        """
+        if self.cache is None:
+            return compute()
+
+        key = self.knowledge_hash ^ self.cache_salt(compute)
+        candidates = self.cache.get(key)
+        if candidates is None:
+            candidates = compute()
+            if candidates:
+                self.cache.put(key, candidates)
+        return candidates
+
+    def cache_salt(self, compute):
+        """Соль ключа кэша, своя для каждой стратегии и вычисления"""
+        salt = self.cache_salts.get(compute.__name__)
+        if salt is None:
+            salt = strategy_salt(f"{self.cache_name()}.{compute.__name__}")
+            self.cache_salts[compute.__name__] = salt
+        return salt
+
+    def priority_key(self, x, y):
+        """Ключ кучи: больший приоритет выше, при равенстве - раньше по строкам"""
+        return (-self.calculate_priority(x, y), y, x)
+
+    def update_priorities(self):
+        """
+        Обновление кучи приоритетов охоты
 
-        if x == 0 or x == 9 or y == 0 or y == 9:
-            priority -= 5
+        Приоритет клетки зависит только от выстрелов в соседних клетках,
+        поэтому после выстрела пересчитываются лишь 8 соседей каждой новой клетки.
+
+        Returns:
+            IndexedHeap: Куча ещё не обстрелянных клеток
+        """
+        if self.priority_heap is None:
+            self.priority_heap = IndexedHeap({(x, y): self.priority_key(x, y)
+                                              for x, y in self.geometry.cells
+                                              if (x, y) not in self.shots})
+            self.pending_cells = []
+            return self.priority_heap
+
+        heap = self.priority_heap
+        around = self.geometry.around
+        changed = set()
+        for x, y in self.pending_cells:
+            heap.remove((x, y))
+            changed.update(around[y * self.size + x])
+        self.pending_cells = []
+
+        for cell in changed:
+            if cell in heap:
+                heap.push(cell, self.priority_key(*cell))
+        return heap
+
+    def mark_shot(self, x, y):
+        """Добавление клетки в множество выстрелов"""
+        self.shots.add((x, y))
+        self.pending_cells.append((x, y))
+        self.set_knowledge(x, y, self.classify_cell(x, y))
+
+    def classify_cell(self, x, y):
+        """Состояние известной клетки по полю: промах, попадание, потоплен или помечена"""
+        return KNOWLEDGE_STATES.get(self.board.grid[y][x], KNOWN_MARKED)
+
+    def set_knowledge(self, x, y, state):
+        """Изменение состояния клетки в знании с обновлением хеша"""
+        old_state = self.knowledge.get((x, y))
+        if old_state == state:
+            return
+
+        keys = self.zobrist.keys[y * self.size + x]
+        if old_state is not None:
+            self.knowledge_hash ^= keys[old_state]
+        self.knowledge_hash ^= keys[state]
+        self.knowledge[(x, y)] = state
+
+    def calculate_priority(self, x, y):
+        """Рассчитать приоритет клетки для выстрела"""
+        index = y * self.size + x
+        grid = self.board.grid
+        shots = self.shots
+        priority = self.base_priorities[index]
 
         misses_around = 0
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < 10 and 0 <= ny < 10:
-                if (nx, ny) in self.shots and self.board.grid[ny][nx] == Cell.MISS:
-                    misses_around += 1
+        for nx, ny in self.geometry.neighbors4[index]:
+            if (nx, ny) in shots and grid[ny][nx] == Cell.MISS:
+                misses_around += 1
 
-        priority -= misses_around * 3
+        priority -= misses_around * self.miss_weight
 
         hits_around = 0
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0),
-                       (1, 1), (1, -1), (-1, 1), (-1, -1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < 10 and 0 <= ny < 10:
-                if (nx, ny) in self.shots and self.board.grid[ny][nx] in [Cell.HIT, Cell.DESTROYED]:
-                    hits_around += 1
+        for nx, ny in self.geometry.neighbors8[index]:
+            if (nx, ny) in shots and grid[ny][nx] in (Cell.HIT, Cell.DESTROYED):
+                hits_around += 1
 
-        priority += hits_around * 15
+        priority += hits_around * self.hit_weight
 
         return priority
 
     def is_valid_shot(self, x, y):
         """Проверить, можно ли стрелять в клетку"""
-        return (0 <= x < 10 and 0 <= y < 10 and
+        return (0 <= x < self.size and 0 <= y < self.size and
                 (x, y) not in self.shots)
 
     def register_shot(self, x, y, result):
         """Зарегистрировать результат выстрела"""
-        self.shots.add((x, y))
+        self.mark_shot(x, y)
 
         if result in ["hit", "destroyed"]:
             self.mode = "target"
@@ -178,28 +359,25 @@ class SmartAI:
         """Построить цепочку целей вокруг попадания"""
         self.hits_to_follow = []
 
-        for dx, dy in self.directions:
-            nx, ny = x + dx, y + dy
-            if self.is_valid_shot(nx, ny):
-                self.hits_to_follow.append((nx, ny))
+        for cell in self.geometry.neighbors4[y * self.size + x]:
+            if cell not in self.shots:
+                self.hits_to_follow.append(cell)
 
         random.shuffle(self.hits_to_follow)
 
     def mark_around_destroyed(self, x, y):
         """Пометить клетки вокруг уничтоженного корабля"""
-        destroyed_ship = None
-        for ship in self.board.ships:
-            if ship.is_destroyed() and (x, y) in ship.cells:
-                destroyed_ship = ship
-                break
+        destroyed_ship = self.board.get_ship_at(x, y)
 
-        if not destroyed_ship:
+        if not destroyed_ship or not destroyed_ship.is_destroyed():
             return
 
+        # Попадания по кораблю теперь известны как потопленные
+        for sx, sy in destroyed_ship.cells:
+            self.set_knowledge(sx, sy, KNOWN_SUNK)
+
+        around = self.geometry.around
         for sx, sy in destroyed_ship.cells:
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    nx, ny = sx + dx, sy + dy
-                    if 0 <= nx < 10 and 0 <= ny < 10:
-                        if (nx, ny) not in self.shots:
-                            self.shots.add((nx, ny))
\ No newline at end of file
+            for nx, ny in around[sy * self.size + sx]:
+                if (nx, ny) not in self.shots:
+                    self.mark_shot(nx, ny)
\ No newline at end of file
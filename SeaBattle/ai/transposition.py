@@ -0,0 +1,189 @@
+"""
+Модуль с хешированием знаний ИИ и кэшем решений по позициям
+
+Знание ИИ о поле - состояние каждой обстрелянной или помеченной клетки.
+Хеш Зобриста - XOR случайных 64-битных ключей (клетка, состояние), поэтому
+он обновляется за O(1) при изменении одной клетки. Ключи строятся от
+фиксированного seed, так что хеши одинаковы во всех запусках и сохранённый
+кэш остаётся действительным.
+"""
+
+import random
+import struct
+from collections import OrderedDict
+from functools import lru_cache
+
+
+# Состояния клетки в знании ИИ
+KNOWN_MISS = 0
+KNOWN_HIT = 1
+KNOWN_SUNK = 2
+KNOWN_MARKED = 3
+
+ZOBRIST_SEED = "SeaBattle zobrist"
+
+# Двоичный формат кэша: заголовок и записи (хеш, число клеток, клетки x, y)
+CACHE_MAGIC = b"SBTT"
+CACHE_VERSION = 1
+CACHE_HEADER = struct.Struct("<4sBI")
+CACHE_ENTRY = struct.Struct("<QB")
+
+
+class ZobristKeys:
+    """Случайные ключи Зобриста для каждой клетки и состояния поля"""
+
+    def __init__(self, size):
+        """
+        Построение ключей
+
+        Args:
+            size (int): Размер поля
+        """
+        rng = random.Random(f"{ZOBRIST_SEED}:{size}")
+        self.size = size
+        self.keys = tuple(tuple(rng.getrandbits(64) for _ in range(4))
+                          for _ in range(size * size))
+
+    def hash_cells(self, states):
+        """
+        Хеш знания целиком
+
+        Args:
+            states (dict): Клетка (x, y) -> состояние KNOWN_*
+
+        Returns:
+            int: 64-битный хеш
+        """
+        value = 0
+        for (x, y), state in states.items():
+            value ^= self.keys[y * self.size + x][state]
+        return value
+
+
+@lru_cache(maxsize=None)
+def get_zobrist_keys(size):
+    """Ключи Зобриста для поля заданного размера (строятся один раз)"""
+    return ZobristKeys(size)
+
+
+def strategy_salt(name):
+    """
+    64-битная соль стратегии
+
+    Разные стратегии принимают разные решения в одной позиции, поэтому
+    их хеши смешиваются с солью, чтобы стратегии могли делить один кэш.
+    """
+    return random.Random(f"{ZOBRIST_SEED}:{name}").getrandbits(64)
+
+
+class TranspositionTable:
+    """
+    Ограниченный LRU-кэш решений ИИ по хешу знания
+
+    Значение - кортеж клеток-кандидатов, среди которых стратегия выбирает
+    выстрел. При переполнении вытесняется запись, к которой дольше всего
+    не обращались.
+    """
+
+    def __init__(self, capacity=65536):
+        """
+        Инициализация кэша
+
+        Args:
+            capacity (int): Наибольшее количество записей
+        """
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Решение для позиции
+
+        Args:
+            key (int): Хеш позиции
+
+        Returns:
+            tuple: Клетки-кандидаты или None, если позиции нет в кэше
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Запись решения для позиции"""
+        self.entries[key] = tuple(value)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        """Доля обращений, найденных в кэше"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Счётчики кэша"""
+        return {
+            'entries': len(self.entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate
+        }
+
+    def save(self, path):
+        """
+        Запись кэша в файл (от давно использованных записей к недавним)
+
+        Args:
+            path (str): Путь к файлу
+        """
+        chunks = [CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(self.entries))]
+        for key, cells in self.entries.items():
+            chunks.append(CACHE_ENTRY.pack(key, len(cells)))
+            chunks.append(bytes(coordinate for cell in cells for coordinate in cell))
+
+        with open(path, "wb") as file:
+            file.write(b"".join(chunks))
+
+    def load(self, path):
+        """
+        Добавление записей из файла в кэш
+
+        Args:
+            path (str): Путь к файлу, записанному save
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+
+        if len(data) < CACHE_HEADER.size:
+            raise ValueError("Файл кэша повреждён")
+        magic, version, count = CACHE_HEADER.unpack_from(data)
+        if magic != CACHE_MAGIC:
+            raise ValueError("Это не файл кэша ИИ Морского боя")
+        if version != CACHE_VERSION:
+            raise ValueError(f"Неподдерживаемая версия кэша: {version}")
+
+        offset = CACHE_HEADER.size
+        for _ in range(count):
+            if offset + CACHE_ENTRY.size > len(data):
+                raise ValueError("Файл кэша повреждён")
+            key, length = CACHE_ENTRY.unpack_from(data, offset)
+            offset += CACHE_ENTRY.size
+
+            raw = data[offset:offset + 2 * length]
+            if len(raw) != 2 * length:
+                raise ValueError("Файл кэша повреждён")
+            offset += 2 * length
+            self.put(key, tuple(zip(raw[::2], raw[1::2])))
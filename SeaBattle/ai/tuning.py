@@ -0,0 +1,206 @@
+"""
+Модуль с подбором весов SmartAI эволюционной стратегией на самоигре
+
+Каждое поколение - выборка кандидатов вокруг текущего среднего весов из
+нормального распределения с шагом по каждому весу. Все кандидаты
+поколения играют одни и те же партии: одинаковые расстановки флота и
+одинаковые seed генератора случайных чисел ИИ (общие случайные числа),
+поэтому разница результатов - следствие весов, а не удачи. Среднее
+сдвигается к лучшим кандидатам с убывающими весами по рангу, шаги -
+к их разбросу, как в упрощённой CMA-ES с диагональной ковариацией.
+"""
+
+import math
+import multiprocessing
+import random
+
+from ai.simulation import play_out
+from ai.smart_ai import SmartAI
+from ai.weights import DEFAULT_WEIGHTS, normalize_weights
+from models.bit_board import BitBoard
+from models.fleet_generator import FleetGenerator
+from utils.constants import GAME_SETTINGS
+
+
+# Подбираемые веса: бонус шахматного порядка остаётся масштабом, ведь
+# выбор клетки не меняется при умножении всех весов на одно число
+TUNED_NAMES = ("center", "edge", "miss", "hit")
+
+# Наименьший шаг поиска по каждому весу
+MIN_SIGMA = 0.05
+
+
+def evaluate_chunk(task):
+    """
+    Серия партий SmartAI с заданными весами
+
+    Args:
+        task (tuple): (веса, размер поля, флот, seed серии, номер первой партии, число партий)
+
+    Returns:
+        int: Сумма выстрелов до победы по всем партиям серии
+    """
+    weights, size, ship_configs, seed, start, games = task
+
+    generator = FleetGenerator(size, ship_configs, rng=random.Random(f"{seed}:{start}:fleet"))
+    total = 0
+    for game in range(start, start + games):
+        board = BitBoard(size)
+        board.place_layout(generator.generate())
+        random.seed(f"{seed}:{game}:ai")
+        total += len(play_out(SmartAI(board, weights=weights), board))
+    return total
+
+
+class WeightTuner:
+    """Подбор весов SmartAI для поля и флота на пуле процессов"""
+
+    def __init__(self, size=None, ship_configs=None, population=12, elite=4, games=400,
+                 generations=20, seed=0, workers=None, chunk_size=50, initial=None):
+        """
+        Инициализация подбора
+
+        Args:
+            size (int): Размер поля
+            ship_configs (list): Состав флота [(размер, количество), ...]
+            population (int): Кандидатов в поколении
+            elite (int): Лучших кандидатов, по которым сдвигается среднее
+            games (int): Партий на оценку кандидата
+            generations (int): Количество поколений
+            seed (int): Начальное значение генераторов
+            workers (int): Количество процессов (по умолчанию - по числу ядер, 1 - без пула)
+            chunk_size (int): Партий в одной задаче пула
+            initial (dict): Начальные веса (по умолчанию - DEFAULT_WEIGHTS)
+        """
+        self.size = size if size is not None else GAME_SETTINGS['board_size']
+        self.ship_configs = tuple(ship_configs if ship_configs is not None
+                                  else GAME_SETTINGS['ship_configs'])
+        self.population = population
+        self.elite = min(elite, population)
+        self.games = games
+        self.generations = generations
+        self.seed = seed
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+        self.base = normalize_weights(initial or DEFAULT_WEIGHTS)
+        self.mean = [float(self.base[name]) for name in TUNED_NAMES]
+        self.sigma = [max(1.0, abs(value) / 2) for value in self.mean]
+        self.rng = random.Random(f"{seed}:tuner")
+
+        # Веса рекомбинации по рангу: лучший кандидат весит больше
+        ranks = [math.log(self.elite + 0.5) - math.log(rank + 1) for rank in range(self.elite)]
+        self.recombination = [value / sum(ranks) for value in ranks]
+
+        self.history = []
+
+    def weights_of(self, vector):
+        """Полный набор весов для вектора подбираемых весов"""
+        weights = dict(self.base)
+        for name, value in zip(TUNED_NAMES, vector):
+            weights[name] = round(value, 3)
+        return weights
+
+    def evaluate(self, map_function, candidates, seed):
+        """
+        Среднее число выстрелов до победы для каждого кандидата на одних и тех же партиях
+
+        Args:
+            map_function (callable): map пула процессов или встроенный map
+            candidates (list): Наборы весов
+            seed (str): Seed партий
+
+        Returns:
+            list: Среднее число выстрелов каждого кандидата
+        """
+        tasks = []
+        for index, weights in enumerate(candidates):
+            for start in range(0, self.games, self.chunk_size):
+                tasks.append((index, (weights, self.size, self.ship_configs, seed, start,
+                                      min(self.chunk_size, self.games - start))))
+
+        totals = [0] * len(candidates)
+        for (index, _), total in zip(tasks, map_function(evaluate_chunk, [task for _, task in tasks])):
+            totals[index] += total
+        return [total / self.games for total in totals]
+
+    def step(self, map_function, generation):
+        """
+        Одно поколение: выборка, оценка, сдвиг среднего и шагов
+
+        Returns:
+            dict: Лучший кандидат поколения и оценка текущего среднего
+        """
+        vectors = [list(self.mean)]
+        for _ in range(self.population - 1):
+            vectors.append([value + self.rng.gauss(0, sigma)
+                            for value, sigma in zip(self.mean, self.sigma)])
+
+        candidates = [self.weights_of(vector) for vector in vectors]
+        scores = self.evaluate(map_function, candidates, f"{self.seed}:{generation}")
+        ranked = sorted(range(len(vectors)), key=lambda index: scores[index])
+        elite = [vectors[index] for index in ranked[:self.elite]]
+
+        old_mean = self.mean
+        self.mean = [sum(weight * vector[dim] for weight, vector in zip(self.recombination, elite))
+                     for dim in range(len(TUNED_NAMES))]
+        for dim in range(len(TUNED_NAMES)):
+            spread = math.sqrt(sum(weight * (vector[dim] - old_mean[dim]) ** 2
+                                   for weight, vector in zip(self.recombination, elite)))
+            self.sigma[dim] = max(MIN_SIGMA, 0.7 * self.sigma[dim] + 0.3 * spread)
+
+        record = {
+            'generation': generation,
+            'mean_shots': scores[0],
+            'best_shots': scores[ranked[0]],
+            'best_weights': candidates[ranked[0]]
+        }
+        self.history.append(record)
+        return record
+
+    def run(self, progress=None):
+        """
+        Подбор весов
+
+        После всех поколений итоговое среднее, лучший кандидат последнего
+        поколения и исходные веса сравниваются на отдельных партиях, и
+        выбираются лучшие из них.
+
+        Args:
+            progress (callable): Вызывается с итогами каждого поколения
+
+        Returns:
+            dict: Веса, среднее число выстрелов с ними и с исходными весами, история
+        """
+        pool = None
+        if self.workers == 1:
+            map_function = map
+        else:
+            pool = multiprocessing.Pool(self.workers)
+            map_function = pool.imap
+
+        try:
+            for generation in range(self.generations):
+                record = self.step(map_function, generation)
+                if progress is not None:
+                    progress(record)
+
+            finalists = [self.base, self.weights_of(self.mean)]
+            if self.history:
+                finalists.append(self.history[-1]['best_weights'])
+            scores = self.evaluate(map_function, finalists, f"{self.seed}:validation")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        best = min(range(len(finalists)), key=lambda index: scores[index])
+        return {
+            'weights': finalists[best],
+            'shots': scores[best],
+            'initial_shots': scores[0],
+            'games': self.games,
+            'generations': self.generations,
+            'history': self.history
+        }
+
@@ -0,0 +1,134 @@
+"""
+Модуль с весами приоритетов охоты SmartAI и файлом профилей весов
+
+Профиль - веса, подобранные для конкретного размера поля и состава флота
+(см. tune.py). Файл профилей - JSON со списком профилей; SmartAI берёт
+из него веса своего поля и флота, а если профиля нет - веса по умолчанию.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+from utils.constants import GAME_SETTINGS
+
+
+# Веса приоритета клетки:
+#   parity - бонус клетке шахматного порядка
+#   center - множитель бонуса за близость к центру
+#   edge   - штраф клетке на краю поля
+#   miss   - штраф за каждый соседний по стороне промах
+#   hit    - бонус за каждое соседнее попадание
+WEIGHT_NAMES = ("parity", "center", "edge", "miss", "hit")
+
+DEFAULT_WEIGHTS = {
+    'parity': 10,
+    'center': 1,
+    'edge': 5,
+    'miss': 3,
+    'hit': 15
+}
+
+
+def fleet_key(ship_configs):
+    """Состав флота в виде, не зависящем от порядка записей"""
+    return tuple(sorted((int(size), int(count)) for size, count in ship_configs))
+
+
+def normalize_weights(weights):
+    """
+    Полный набор весов: недостающие веса берутся по умолчанию
+
+    Args:
+        weights (dict): Веса по именам
+
+    Returns:
+        dict: Все веса WEIGHT_NAMES
+    """
+    unknown = set(weights) - set(WEIGHT_NAMES)
+    if unknown:
+        raise ValueError(f"Неизвестные веса: {', '.join(sorted(unknown))}")
+    return {name: weights.get(name, DEFAULT_WEIGHTS[name]) for name in WEIGHT_NAMES}
+
+
+def load_profiles(path):
+    """
+    Чтение файла профилей
+
+    Args:
+        path (str): Путь к файлу
+
+    Returns:
+        dict: (размер поля, состав флота) -> профиль с весами и статистикой подбора
+    """
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+
+    profiles = {}
+    for profile in data.get('profiles', []):
+        key = (int(profile['size']), fleet_key(profile['ship_configs']))
+        profile['weights'] = normalize_weights(profile['weights'])
+        profiles[key] = profile
+    return profiles
+
+
+def save_profile(path, size, ship_configs, weights, stats=None):
+    """
+    Запись профиля в файл (профиль того же поля и флота заменяется)
+
+    Args:
+        path (str): Путь к файлу
+        size (int): Размер поля
+        ship_configs (list): Состав флота [(размер, количество), ...]
+        weights (dict): Веса
+        stats (dict): Статистика подбора (среднее число выстрелов и т.п.)
+    """
+    profiles = load_profiles(path) if os.path.exists(path) else {}
+
+    key = (size, fleet_key(ship_configs))
+    profile = {'size': size, 'ship_configs': [list(config) for config in key[1]],
+               'weights': normalize_weights(weights)}
+    if stats:
+        profile['stats'] = stats
+    profiles[key] = profile
+
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({'profiles': [profiles[key] for key in sorted(profiles)]},
+                  file, indent=2, ensure_ascii=False)
+        file.write("\n")
+
+
+@lru_cache(maxsize=None)
+def profile_weights(path, size, ship_configs):
+    """Веса из файла профилей (файл читается один раз за процесс)"""
+    try:
+        profile = load_profiles(path).get((size, ship_configs))
+    except (OSError, ValueError, KeyError, TypeError):
+        # Файл профилей необязателен: при его отсутствии или порче - веса по умолчанию
+        profile = None
+    if profile is None:
+        return None
+    return tuple(profile['weights'][name] for name in WEIGHT_NAMES)
+
+
+def get_weights(size, ship_configs=None, path=None):
+    """
+    Веса для поля и флота: из профиля, если он есть, иначе по умолчанию
+
+    Args:
+        size (int): Размер поля
+        ship_configs (list): Состав флота (по умолчанию из настроек)
+        path (str): Файл профилей (по умолчанию из настроек)
+
+    Returns:
+        dict: Веса по именам
+    """
+    if ship_configs is None:
+        ship_configs = GAME_SETTINGS['ship_configs']
+    if path is None:
+        path = GAME_SETTINGS['ai_weights']
+
+    weights = profile_weights(path, size, fleet_key(ship_configs))
+    if weights is None:
+        return dict(DEFAULT_WEIGHTS)
+    return dict(zip(WEIGHT_NAMES, weights))
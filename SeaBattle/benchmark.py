@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Набор замеров производительности моделей, ИИ и отрисовки
+
+Примеры:
+    python benchmark.py
+    python benchmark.py --output bench.json
+    python benchmark.py --save-baseline baseline.json
+    python benchmark.py --baseline baseline.json --tolerance 0.15
+
+Замеры сравниваются с базой (по умолчанию benchmark_baseline.json). Время
+замеров зависит от машины, поэтому база не хранится в репозитории: если
+файла базы нет, первый запуск записывает в него свои результаты. Код
+возврата 1 означает, что какой-то замер стал медленнее допустимого.
+"""
+
+import argparse
+import os
+import random
+import sys
+
+from ai.simulation import play_solo, run_chunk
+from ai.smart_ai import SmartAI
+from models.board import Board
+from models.fleet_generator import FleetGenerator
+from models.ship import Ship
+from ui.canvas_manager import CanvasManager
+from ui.tile_cache import TileCache
+from utils.benchmark import (BenchmarkCase, run_benchmarks, compare_results,
+                             save_results, load_results)
+from utils.constants import GAME_SETTINGS
+
+
+SEED = 2024
+
+# Файл базы замеров по умолчанию (создаётся первым запуском)
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+
+class StubCanvas:
+    """Заглушка холста Tk для машин без дисплея: только считает созданные и изменённые элементы"""
+
+    def __init__(self):
+        self.items = 0
+        self.changes = 0
+
+    def delete(self, *tags):
+        self.items = 0
+
+    def create_rectangle(self, *args, **kwargs):
+        self.items += 1
+        return self.items
+
+    def create_text(self, *args, **kwargs):
+        self.items += 1
+        return self.items
+
+    def create_image(self, *args, **kwargs):
+        self.items += 1
+        return self.items
+
+    def itemconfig(self, *args, **kwargs):
+        self.changes += 1
+
+
+class StubImage:
+    """Заглушка изображения Tk: только считает закрашенные прямоугольники"""
+
+    def __init__(self, canvas, width, height):
+        self.puts = 0
+
+    def put(self, data, to=None):
+        self.puts += 1
+
+
+def make_canvas():
+    """
+    Холст для замера отрисовки
+
+    Returns:
+        tuple: (холст, название: "tk" - настоящий скрытый холст, "stub" - заглушка)
+    """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return tk.Canvas(root, width=400, height=400), "tk"
+    except Exception:
+        return StubCanvas(), "stub"
+
+
+def sample_layouts(count):
+    """Воспроизводимые расстановки флота"""
+    return FleetGenerator(GAME_SETTINGS['board_size'], seed=SEED).sample(count)
+
+
+def fleet_board(layout):
+    """Поле с расставленным флотом"""
+    board = Board(GAME_SETTINGS['board_size'])
+    board.place_layout(layout)
+    return board
+
+
+def recorded_game(layout):
+    """
+    Выстрелы SmartAI по флоту от начала до победы
+
+    Returns:
+        list: Выстрелы [(x, y), ...]
+    """
+    board = fleet_board(layout)
+    random.seed(SEED)
+    ai = SmartAI(board)
+    shots = []
+    while not all(ship.is_destroyed() for ship in board.ships):
+        x, y = ai.get_next_shot()
+        ai.register_shot(x, y, board.shoot(x, y))
+        shots.append((x, y))
+    return shots
+
+
+def setup_can_place_ship():
+    """Проверка всех размещений всех размеров на поле с флотом"""
+    board = fleet_board(sample_layouts(1)[0])
+    size = board.size
+    ships = [Ship(ship_size, x, y, horizontal)
+             for ship_size in (1, 2, 3, 4) for horizontal in (True, False)
+             for y in range(size) for x in range(size)]
+
+    def run():
+        can_place_ship = board.can_place_ship
+        for ship in ships:
+            can_place_ship(ship)
+    return run
+
+
+def setup_place_ship():
+    """Расстановка готовых флотов на новые поля"""
+    layouts = sample_layouts(10)
+
+    def run():
+        for layout in layouts:
+            board = Board(GAME_SETTINGS['board_size'])
+            for entry in layout:
+                board.place_ship(Ship(*entry))
+    return run
+
+
+def setup_shoot():
+    """Обстрел всех клеток копии поля с флотом"""
+    board = fleet_board(sample_layouts(1)[0])
+    cells = [(x, y) for y in range(board.size) for x in range(board.size)]
+    random.Random(SEED).shuffle(cells)
+
+    def run():
+        target = board.clone()
+        shoot = target.shoot
+        for x, y in cells:
+            shoot(x, y)
+    return run
+
+
+def setup_auto_place_ships():
+    """Авторасстановка флота на новое поле (генератор по умолчанию, как в игре)"""
+    def run():
+        random.seed(SEED)
+        Board(GAME_SETTINGS['board_size']).auto_place_ships()
+    return run
+
+
+def setup_register_shot():
+    """SmartAI: только регистрация выстрелов записанной партии"""
+    layout = sample_layouts(1)[0]
+    shots = recorded_game(layout)
+
+    def run():
+        board = fleet_board(layout)
+        ai = SmartAI(board)
+        for x, y in shots:
+            ai.register_shot(x, y, board.shoot(x, y))
+    return run
+
+
+def setup_ai_turn():
+    """SmartAI: выбор выстрела и его регистрация на протяжении всей партии"""
+    layout = sample_layouts(1)[0]
+
+    def run():
+        board = fleet_board(layout)
+        random.seed(SEED)
+        ai = SmartAI(board)
+        ships_left = len(board.ships)
+        while ships_left:
+            x, y = ai.get_next_shot()
+            result = board.shoot(x, y)
+            ai.register_shot(x, y, result)
+            if result == "destroyed":
+                ships_left -= 1
+    return run
+
+
+def setup_solo_game(strategy):
+    """Партия стратегии по одному флоту без интерфейса"""
+    layout = sample_layouts(1)[0]
+    size = GAME_SETTINGS['board_size']
+    ship_configs = GAME_SETTINGS['ship_configs']
+
+    def setup():
+        def run():
+            random.seed(SEED)
+            play_solo(strategy, layout, size, ship_configs)
+        return run
+    return setup
+
+
+def setup_match():
+    """Полная партия SmartAI против DensityAI с расстановкой флотов"""
+    task = (('smart', 'density'), 'auto', GAME_SETTINGS['board_size'],
+            tuple(GAME_SETTINGS['ship_configs']), SEED, 0, 0, 1)
+
+    def run():
+        run_chunk(task)
+    return run
+
+
+def make_cases(canvas):
+    """
+    Список замеров
+
+    Args:
+        canvas: Холст для замера отрисовки
+
+    Returns:
+        list: Список BenchmarkCase
+    """
+    layout = sample_layouts(1)[0]
+    shots = recorded_game(layout)
+
+    # Без дисплея изображения клеток тоже заменяются заглушками
+    tile_cache = TileCache(StubImage) if isinstance(canvas, StubCanvas) else None
+    manager = CanvasManager(None, tile_cache)
+    middle_game = fleet_board(layout)
+    for x, y in shots[:len(shots) // 2]:
+        middle_game.shoot(x, y)
+
+    def setup_draw_board():
+        def run():
+            manager.invalidate(canvas)
+            manager.draw_board(canvas, middle_game, hide_ships=False)
+        return run
+
+    # То же поле до и после одного выстрела: перерисовываются только изменившиеся клетки
+    after_shot = middle_game.clone()
+    after_shot.shoot(*shots[len(shots) // 2])
+
+    def setup_draw_shot():
+        def run():
+            manager.draw_board(canvas, middle_game, hide_ships=False)
+            manager.draw_board(canvas, after_shot, hide_ships=False)
+        return run
+
+    size = GAME_SETTINGS['board_size']
+    fleet_size = sum(count for _, count in GAME_SETTINGS['ship_configs'])
+
+    return [
+        BenchmarkCase("board.can_place_ship", setup_can_place_ship, 4 * 2 * size * size),
+        BenchmarkCase("board.place_ship", setup_place_ship, 10 * fleet_size),
+        BenchmarkCase("board.shoot", setup_shoot, size * size),
+        BenchmarkCase("board.auto_place_ships", setup_auto_place_ships),
+        BenchmarkCase("smart_ai.register_shot", setup_register_shot, len(shots)),
+        BenchmarkCase("smart_ai.turn", setup_ai_turn, len(shots)),
+        BenchmarkCase("game.solo.smart", setup_solo_game('smart')),
+        BenchmarkCase("game.solo.density", setup_solo_game('density')),
+        BenchmarkCase("game.match", setup_match),
+        BenchmarkCase("render.draw_board", setup_draw_board),
+        BenchmarkCase("render.draw_shot", setup_draw_shot, 2)
+    ]
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Замеры производительности Морского боя")
+    parser.add_argument("--output", help="файл для результатов в JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="файл базовых результатов для сравнения; если его нет, "
+                             "результаты записываются в него (по умолчанию %(default)s)")
+    parser.add_argument("--save-baseline", help="сохранить результаты как базовые")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="допустимое замедление относительно базы (0.15 = 15%%)")
+    parser.add_argument("--repeat", type=int, default=5, help="количество повторов замера")
+    parser.add_argument("--filter", help="только замеры, в имени которых есть эта строка")
+    return parser.parse_args()
+
+
+def main():
+    """Запуск замеров"""
+    args = parse_args()
+    canvas, canvas_kind = make_canvas()
+
+    def progress(name, result):
+        print(f"{name:28s} {result['ns_per_op']:14.0f} нс/оп "
+              f"(медиана {result['median_ns_per_op']:.0f})", file=sys.stderr)
+
+    results = run_benchmarks(make_cases(canvas), args.repeat, args.filter, progress)
+    results['environment']['canvas'] = canvas_kind
+
+    if args.output:
+        save_results(args.output, results)
+    if args.save_baseline:
+        save_results(args.save_baseline, results)
+
+    if args.baseline and not os.path.exists(args.baseline):
+        save_results(args.baseline, results)
+        print(f"\nБаза замеров создана: {args.baseline}", file=sys.stderr)
+    elif args.baseline:
+        regressions = 0
+        print(f"\n{'замер':28s} {'база':>12s} {'сейчас':>12s} {'отношение':>10s}")
+        for name, base, current, ratio, regressed in compare_results(results, load_results(args.baseline),
+                                                                     args.tolerance):
+            mark = "  РЕГРЕССИЯ" if regressed else ""
+            print(f"{name:28s} {base:12.0f} {current:12.0f} {ratio:10.2f}{mark}")
+            regressions += regressed
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,4 +3,5 @@
 """
 from .cell import Cell
 from .ship import Ship
-from .board import Board
\ No newline at end of file
+from .board import Board
+from .bit_board import BitBoard
\ No newline at end of file
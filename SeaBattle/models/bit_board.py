@@ -0,0 +1,396 @@
+"""
+Модуль с игровым полем на битовых масках
+"""
+
+from models.board import Board, MOVE_PLACE, MOVE_REMOVE, MOVE_SHOT
+from models.cell import Cell
+from models.placements import get_placement_table
+
+
+class BitGridRow:
+    """Строка представления grid, вычисляемая по битовым маскам поля"""
+
+    __slots__ = ("board", "y")
+
+    def __init__(self, board, y):
+        self.board = board
+        self.y = y
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            return [self.board.get_cell(cx, self.y) for cx in range(self.board.size)[x]]
+        return self.board.get_cell(x, self.y)
+
+    def __len__(self):
+        return self.board.size
+
+    def __iter__(self):
+        for x in range(self.board.size):
+            yield self.board.get_cell(x, self.y)
+
+
+class BitBoard(Board):
+    """
+    Игровое поле, хранящее корабли, выстрелы и попадания
+    в виде целочисленных битовых масок
+
+    Сохраняет интерфейс Board (place_ship, remove_ship, shoot, get_ship_at, grid,
+    undo/redo), поэтому может использоваться вместо него в SmartAI и CanvasManager.
+    """
+
+    def __init__(self, size=10):
+        """
+        Инициализация игрового поля
+
+        Args:
+            size (int): Размер поля (по умолчанию 10x10)
+        """
+        self.size = size
+        self.table = get_placement_table(size)
+        self.ships = []
+
+        self.ship_mask = 0
+        self.shot_mask = 0
+        self.hit_mask = 0
+        self.destroyed_mask = 0
+        # Клетки кораблей из self.ships
+        self.occupied_mask = 0
+
+        # Корабль -> (маска корабля, маска ореола)
+        self.ship_masks = {}
+        # Индекс клетки -> корабль (только корабли из self.ships)
+        self.cell_owner = {}
+
+        # (ship_mask, hit_mask, occupied_mask) -> маска запрета размещения
+        self.blocked_cache = (0, 0, 0, 0)
+        # (размер, horizontal) -> (маска запрета размещения, маска допустимых начал)
+        self.legal_cache = {}
+        # (shot_mask, множество выстрелов) для свойства shots
+        self.shots_cache = (0, frozenset())
+
+        self.grid = [BitGridRow(self, y) for y in range(size)]
+
+        # Журнал ходов общий с Board; снимки поля на масках журнал изменений не ведут
+        self.trail = None
+        self.reset_journal()
+
+    @property
+    def shots(self):
+        """
+        Клетки, по которым стреляли
+
+        В отличие от Board.shots, это неизменяемое множество, вычисляемое по
+        shot_mask: выстрелы добавляются только через shoot, а попытка
+        изменить множество напрямую сразу даёт ошибку, а не теряется молча.
+        Множество пересобирается только после новых выстрелов.
+
+        Returns:
+            frozenset: Клетки (x, y)
+        """
+        shot_mask, shots = self.shots_cache
+        if shot_mask != self.shot_mask:
+            shots = frozenset(self.table.cells_of(self.shot_mask))
+            self.shots_cache = (self.shot_mask, shots)
+        return shots
+
+    def get_cell(self, x, y):
+        """
+        Состояние клетки
+
+        Args:
+            x (int): Координата X
+            y (int): Координата Y
+
+        Returns:
+            int: Состояние клетки (значение Cell)
+        """
+        bit = self.table.cell_bits[y * self.size + x]
+        if self.destroyed_mask & bit:
+            return Cell.DESTROYED
+        if self.hit_mask & bit:
+            return Cell.HIT
+        if self.shot_mask & bit:
+            return Cell.MISS
+        if self.ship_mask & bit:
+            return Cell.SHIP
+        return Cell.EMPTY
+
+    def can_place_ship(self, ship, ignore_ships=False):
+        """
+        Проверка возможности размещения корабля
+
+        Args:
+            ship (Ship): Корабль для размещения
+            ignore_ships (bool): Игнорировать проверку на пересечение с другими кораблями
+
+        Returns:
+            bool: Можно ли разместить корабль
+        """
+        masks = self.table.masks.get((ship.size, ship.x, ship.y, ship.horizontal))
+        if masks is None:
+            return False
+        return ignore_ships or not masks[0] & self.blocked_mask()
+
+    def blocked_mask(self):
+        """
+        Маска клеток, в которых нельзя разместить палубу нового корабля
+
+        Правило то же, что в Board.can_place_ship: запрещены клетки кораблей
+        флота (даже подбитых) и соседи только целых палуб - рядом с подбитой
+        палубой корабль поставить можно. Маска пересчитывается, только если
+        корабли или попадания изменились после прошлого вызова.
+
+        Returns:
+            int: Маска запрещённых клеток
+        """
+        ship_mask, hit_mask, occupied_mask, blocked = self.blocked_cache
+        if (ship_mask == self.ship_mask and hit_mask == self.hit_mask
+                and occupied_mask == self.occupied_mask):
+            return blocked
+
+        blocked = self.occupied_mask
+        masks = self.table.masks
+        for x, y in self.table.cells_of(self.ship_mask & ~self.hit_mask):
+            blocked |= masks[(1, x, y, True)][1]
+
+        self.blocked_cache = (self.ship_mask, self.hit_mask, self.occupied_mask, blocked)
+        return blocked
+
+    def legal_placements(self, ship_size, horizontal):
+        """
+        Маска клеток, от которых можно разместить корабль
+
+        Маска пересчитывается, только если запрет размещения изменился после прошлого вызова.
+
+        Args:
+            ship_size (int): Размер корабля
+            horizontal (bool): Горизонтальное размещение
+
+        Returns:
+            int: Маска, в которой бит y * self.size + x (self.size - сторона
+                поля) означает, что корабль с началом в (x, y) можно разместить
+        """
+        blocked = self.blocked_mask()
+        key = (ship_size, horizontal)
+        cached = self.legal_cache.get(key)
+        if cached is not None and cached[0] == blocked:
+            return cached[1]
+
+        mask = self.table.legal_starts(ship_size, horizontal, blocked)
+        self.legal_cache[key] = (blocked, mask)
+        return mask
+
+    def place_ship(self, ship, ignore_ships=False):
+        """
+        Размещение корабля на поле
+
+        Args:
+            ship (Ship): Корабль для размещения
+            ignore_ships (bool): Игнорировать проверку на пересечение с другими кораблями
+
+        Returns:
+            bool: Успешно ли размещен корабль
+        """
+        masks = self.table.masks.get((ship.size, ship.x, ship.y, ship.horizontal))
+        if masks is None:
+            return False
+
+        if not ignore_ships and masks[0] & self.blocked_mask():
+            return False
+
+        if ignore_ships:
+            self.ship_mask |= masks[0]
+            self.ship_masks[ship] = masks
+        else:
+            self.attach_ship(ship)
+            self.log_move((MOVE_PLACE, self.group_chained(), ship))
+        return True
+
+    def remove_ship(self, ship):
+        """Удаление корабля с поля"""
+        position = self.detach_ship(ship)
+        if position is not None:
+            self.log_move((MOVE_REMOVE, self.group_chained(), ship, position))
+
+    def attach_ship(self, ship, position=None):
+        """
+        Добавление корабля во флот и в маски поля
+
+        Args:
+            ship (Ship): Корабль
+            position (int): Место в списке кораблей (None - в конец)
+        """
+        masks = self.table.masks[(ship.size, ship.x, ship.y, ship.horizontal)]
+        self.ship_mask |= masks[0]
+        self.occupied_mask |= masks[0]
+        self.ship_masks[ship] = masks
+
+        if position is None:
+            self.ships.append(ship)
+        else:
+            self.ships.insert(position, ship)
+        for x, y in ship.cells:
+            self.cell_owner[y * self.size + x] = ship
+
+    def detach_ship(self, ship):
+        """
+        Удаление корабля из флота и из масок поля
+
+        Args:
+            ship (Ship): Корабль
+
+        Returns:
+            int or None: Место корабля в списке кораблей (None - корабля не было во флоте)
+        """
+        masks = self.ship_masks.pop(ship, None)
+        if masks is not None:
+            self.ship_mask &= ~masks[0]
+            for x, y in ship.cells:
+                if self.cell_owner.get(y * self.size + x) is ship:
+                    del self.cell_owner[y * self.size + x]
+
+        if ship not in self.ships:
+            return None
+        if masks is not None:
+            self.occupied_mask &= ~masks[0]
+        position = self.ships.index(ship)
+        del self.ships[position]
+        return position
+
+    def shoot(self, x, y):
+        """
+        Выстрел по клетке
+
+        Args:
+            x (int): Координата X
+            y (int): Координата Y
+
+        Returns:
+            str: Результат выстрела ("hit", "miss", "destroyed", "already_shot")
+        """
+        index = y * self.size + x
+        bit = self.table.cell_bits[index]
+
+        if self.shot_mask & bit:
+            return "already_shot"
+
+        self.shot_mask |= bit
+
+        if not self.ship_mask & bit:
+            self.log_move((MOVE_SHOT, self.group_chained(), x, y, False, False))
+            return "miss"
+
+        self.hit_mask |= bit
+
+        ship = self.cell_owner.get(index)
+        if ship is not None:
+            ship.health -= 1
+            if ship.is_destroyed():
+                self.destroyed_mask |= self.ship_masks[ship][0]
+                self.log_move((MOVE_SHOT, self.group_chained(), x, y, True, True))
+                return "destroyed"
+        self.log_move((MOVE_SHOT, self.group_chained(), x, y, True, False))
+        return "hit"
+
+    def get_ship_at(self, x, y):
+        """
+        Получение корабля по координатам
+
+        Args:
+            x (int): Координата X
+            y (int): Координата Y
+
+        Returns:
+            Ship or None: Корабль в указанной клетке или None
+        """
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return None
+        return self.cell_owner.get(y * self.size + x)
+
+    def snapshot(self):
+        """
+        Снимок состояния поля
+
+        Состояние поля - несколько целых чисел, поэтому снимок хранит их
+        значения целиком вместе с составом флота, здоровьем кораблей
+        и журналом ходов.
+
+        Returns:
+            tuple: Снимок для restore
+        """
+        return (self.ship_mask, self.shot_mask, self.hit_mask,
+                self.destroyed_mask, self.occupied_mask,
+                self.ships[:], dict(self.ship_masks), dict(self.cell_owner),
+                [(ship, ship.health) for ship in self.ship_masks],
+                self.journal[:], self.journal_pos)
+
+    def restore(self, mark):
+        """
+        Откат поля к снимку
+
+        Args:
+            mark (tuple): Снимок, полученный от snapshot
+        """
+        (self.ship_mask, self.shot_mask, self.hit_mask,
+         self.destroyed_mask, self.occupied_mask,
+         ships, ship_masks, cell_owner, health, journal, self.journal_pos) = mark
+
+        self.ships = ships[:]
+        self.ship_masks = dict(ship_masks)
+        self.cell_owner = dict(cell_owner)
+        for ship, ship_health in health:
+            ship.health = ship_health
+        self.journal = journal[:]
+
+    def release(self, mark):
+        """Закрепление изменений после снимка (снимку поля на масках нечего освобождать)"""
+
+    def make_move(self, record):
+        """Повторное выполнение хода из журнала"""
+        kind = record[0]
+        if kind == MOVE_PLACE:
+            self.attach_ship(record[2])
+        elif kind == MOVE_REMOVE:
+            self.detach_ship(record[2])
+        else:
+            self.shoot(record[2], record[3])
+
+    def unmake_move(self, record):
+        """Отмена хода из журнала"""
+        kind = record[0]
+        if kind == MOVE_PLACE:
+            self.detach_ship(record[2])
+        elif kind == MOVE_REMOVE:
+            self.attach_ship(record[2], record[3])
+        else:
+            _, _, x, y, hit, destroyed = record
+            index = y * self.size + x
+            bit = self.table.cell_bits[index]
+            self.shot_mask &= ~bit
+            if hit:
+                self.hit_mask &= ~bit
+                ship = self.cell_owner.get(index)
+                if ship is not None:
+                    ship.health += 1
+                    if destroyed:
+                        self.destroyed_mask &= ~self.ship_masks[ship][0]
+
+    def clone(self):
+        """
+        Независимая копия поля
+
+        Returns:
+            BitBoard: Копия поля с собственными копиями кораблей
+        """
+        board = BitBoard(self.size)
+        board.ship_mask = self.ship_mask
+        board.shot_mask = self.shot_mask
+        board.hit_mask = self.hit_mask
+        board.destroyed_mask = self.destroyed_mask
+        board.occupied_mask = self.occupied_mask
+
+        copies = {ship: ship.copy() for ship in self.ship_masks}
+        board.ships = [copies[ship] for ship in self.ships]
+        board.ship_masks = {copies[ship]: masks for ship, masks in self.ship_masks.items()}
+        board.cell_owner = {index: copies[ship] for index, ship in self.cell_owner.items()}
+        return board
@@ -5,6 +5,23 @@
 import random
 from models.ship import Ship
 from models.cell import Cell
+from models.fleet_generator import FleetGenerator
+from models.placements import get_placement_table
+
+
+# Виды записей журнала изменений для snapshot/restore
+TRAIL_CELL = 0
+TRAIL_SHOT = 1
+TRAIL_HEALTH = 2
+TRAIL_PLACE = 3
+TRAIL_REMOVE = 4
+TRAIL_JOURNAL = 5
+TRAIL_SHOT_UNDO = 6
+
+# Виды ходов в журнале undo/redo
+MOVE_PLACE = 0
+MOVE_REMOVE = 1
+MOVE_SHOT = 2
 
 
 class Board:
@@ -22,6 +39,35 @@ class Board:
         self.ships = []
         self.shots = set()
 
+        # Индекс занятости: клетка (x, y) -> id корабля
+        self.ship_index = {}
+        self.ships_by_id = {}
+        self.next_ship_id = 0
+
+        # Копирование при записи: что из состояния принадлежит только этому полю
+        self.rows_owned = [True] * size
+        self.shots_owned = True
+        self.fleet_owned = True
+        self.shared_ship_ids = set()
+
+        # Журнал изменений после первого открытого снимка (None - снимков нет)
+        self.trail = None
+
+        # Счётчик изменений сетки и кэш допустимых размещений, сверяемый с ним
+        self.version = 0
+        self.legal_cache = {}
+
+        self.reset_journal()
+
+    def reset_journal(self):
+        """Очистка журнала ходов для undo/redo"""
+        # Записи до journal_pos сделаны, после - отменены
+        self.journal = []
+        self.journal_pos = 0
+        self.group_depth = 0
+        self.group_started = False
+        self.replaying = False
+
     def can_place_ship(self, ship, ignore_ships=False):
         """
         Проверка возможности размещения корабля
@@ -37,13 +83,19 @@ class Board:
             if not (0 <= x < self.size and 0 <= y < self.size):
                 return False
 
-            # Проверка соседних клеток
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < self.size and 0 <= ny < self.size:
-                        if not ignore_ships and self.grid[ny][nx] == Cell.SHIP:
-                            return False
+        if ignore_ships:
+            return True
+
+        # Клетки, занятые другим кораблём, даже подбитым
+        for cell in ship.cells:
+            if cell in self.ship_index:
+                return False
+
+        # Проверка клеток корабля и соседних с ними
+        for nx, ny in ship.halo:
+            if 0 <= nx < self.size and 0 <= ny < self.size:
+                if self.grid[ny][nx] == Cell.SHIP:
+                    return False
         return True
 
     def place_ship(self, ship, ignore_ships=False):
@@ -58,50 +110,148 @@ class Board:
             bool: Успешно ли размещен корабль
         """
         if self.can_place_ship(ship, ignore_ships):
+            if not ignore_ships:
+                previous = tuple(self.grid[y][x] for x, y in ship.cells)
             for x, y in ship.cells:
-                self.grid[y][x] = Cell.SHIP
+                self.set_cell(x, y, Cell.SHIP)
             if not ignore_ships:
-                self.ships.append(ship)
+                self.attach_ship(ship)
+                self.log_move((MOVE_PLACE, self.group_chained(), ship, previous))
             return True
         return False
 
     def remove_ship(self, ship):
         """Удаление корабля с поля"""
+        previous = tuple(self.grid[y][x] for x, y in ship.cells)
         for x, y in ship.cells:
-            self.grid[y][x] = Cell.EMPTY
+            self.set_cell(x, y, Cell.EMPTY)
         if ship in self.ships:
-            self.ships.remove(ship)
+            position = self.detach_ship(ship)
+            self.log_move((MOVE_REMOVE, self.group_chained(), ship, position, previous))
+
+    def legal_placements(self, ship_size, horizontal):
+        """
+        Маска клеток, от которых можно разместить корабль
+
+        Маска строится по таблице размещений: корабль нельзя ставить на
+        клетки других кораблей и на клетки рядом с целыми палубами - это
+        то же правило, что в can_place_ship. Маска пересчитывается, только
+        если сетка изменилась после прошлого вызова.
+
+        Args:
+            ship_size (int): Размер корабля
+            horizontal (bool): Горизонтальное размещение
+
+        Returns:
+            int: Маска, в которой бит y * self.size + x (self.size - сторона
+                поля) означает, что корабль с началом в (x, y) можно разместить
+        """
+        key = (ship_size, horizontal)
+        cached = self.legal_cache.get(key)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+
+        table = get_placement_table(self.size)
+        forbidden = 0
+        for x, y in self.ship_index:
+            forbidden |= table.bit(x, y)
+        for y, row in enumerate(self.grid):
+            for x, cell_state in enumerate(row):
+                if cell_state == Cell.SHIP:
+                    # Ореол клетки - сама клетка и все её соседи
+                    forbidden |= table.masks[(1, x, y, True)][1]
+
+        mask = table.legal_starts(ship_size, horizontal, forbidden)
+        self.legal_cache[key] = (self.version, mask)
+        return mask
+
+    def attach_ship(self, ship, position=None):
+        """
+        Добавление корабля во флот и индекс занятости (без изменения сетки)
+
+        Args:
+            ship (Ship): Корабль
+            position (int): Место в списке кораблей (None - в конец)
+        """
+        self.own_fleet()
+        if self.trail is not None:
+            # Индекс клеток, которые перекроет корабль, нужен для отката
+            covered = [(cell, self.ship_index.get(cell)) for cell in ship.cells]
+            self.trail.append((TRAIL_PLACE, self.next_ship_id, covered))
+        if position is None:
+            self.ships.append(ship)
+        else:
+            self.ships.insert(position, ship)
+        self.index_ship(ship)
+
+    def detach_ship(self, ship):
+        """
+        Удаление корабля из флота и индекса занятости (без изменения сетки)
+
+        Args:
+            ship (Ship): Корабль
+
+        Returns:
+            int: Место корабля в списке кораблей
+        """
+        self.own_fleet()
+        position = self.ships.index(ship)
+        ship_id = self.ship_index.get(ship.cells[0])
+        self.ships.remove(ship)
+        self.unindex_ship(ship)
+        if self.trail is not None:
+            self.trail.append((TRAIL_REMOVE, ship, position, ship_id))
+        return position
+
+    def index_ship(self, ship):
+        """Добавление корабля в индекс занятости клеток"""
+        self.own_fleet()
+        ship_id = self.next_ship_id
+        self.next_ship_id += 1
+        self.ships_by_id[ship_id] = ship
+        for cell in ship.cells:
+            self.ship_index[cell] = ship_id
+
+    def unindex_ship(self, ship):
+        """Удаление корабля из индекса занятости клеток"""
+        ship_id = self.ship_index.get(ship.cells[0])
+        if ship_id is None or self.ships_by_id[ship_id] is not ship:
+            return
 
-    def auto_place_ships(self):
+        self.own_fleet()
+        del self.ships_by_id[ship_id]
+        for cell in ship.cells:
+            del self.ship_index[cell]
+
+    def auto_place_ships(self, generator=None):
         """
         Автоматическая расстановка кораблей
 
+        Args:
+            generator: Генератор расстановок с методом generate()
+                (по умолчанию FleetGenerator для размера поля)
+
         Returns:
             bool: Успешно ли расставлены все корабли
         """
-        ships_config = [(4, 1), (3, 2), (2, 3), (1, 4)]
-
-        for size, count in ships_config:
-            for _ in range(count):
-                placed = False
-                attempts = 0
+        if generator is None:
+            generator = FleetGenerator(self.size, rng=random)
 
-                while not placed and attempts < 500:
-                    x = random.randint(0, self.size - 1)
-                    y = random.randint(0, self.size - 1)
-                    horizontal = random.choice([True, False])
+        return self.place_layout(generator.generate())
 
-                    if horizontal and x + size > self.size:
-                        continue
-                    if not horizontal and y + size > self.size:
-                        continue
+    def place_layout(self, layout):
+        """
+        Размещение готовой расстановки флота
 
-                    ship = Ship(size, x, y, horizontal)
-                    placed = self.place_ship(ship)
-                    attempts += 1
+        Args:
+            layout (list): Список кораблей [(размер, x, y, horizontal), ...]
 
-                if not placed:
-                    return False
+        Returns:
+            bool: Успешно ли размещены все корабли
+        """
+        for size, x, y, horizontal in layout:
+            if not self.place_ship(Ship(size, x, y, horizontal)):
+                return False
         return True
 
     def shoot(self, x, y):
@@ -118,22 +268,28 @@ class Board:
         if (x, y) in self.shots:
             return "already_shot"
 
-        self.shots.add((x, y))
+        self.add_shot((x, y))
+        previous = self.grid[y][x]
 
-        if self.grid[y][x] == Cell.SHIP:
-            self.grid[y][x] = Cell.HIT
+        if previous == Cell.SHIP:
+            self.set_cell(x, y, Cell.HIT)
 
-            for ship in self.ships:
-                if (x, y) in ship.cells:
-                    ship.health -= 1
-                    if ship.is_destroyed():
-                        for sx, sy in ship.cells:
-                            self.grid[sy][sx] = Cell.DESTROYED
-                        return "destroyed"
-                    return "hit"
+            ship_id = self.ship_index.get((x, y))
+            if ship_id is not None:
+                ship = self.own_ship(ship_id)
+                if self.trail is not None:
+                    self.trail.append((TRAIL_HEALTH, ship_id, ship.health))
+                ship.health -= 1
+                if ship.is_destroyed():
+                    for sx, sy in ship.cells:
+                        self.set_cell(sx, sy, Cell.DESTROYED)
+                    self.log_move((MOVE_SHOT, self.group_chained(), x, y, previous, True))
+                    return "destroyed"
+            self.log_move((MOVE_SHOT, self.group_chained(), x, y, previous, False))
             return "hit"
         else:
-            self.grid[y][x] = Cell.MISS
+            self.set_cell(x, y, Cell.MISS)
+            self.log_move((MOVE_SHOT, self.group_chained(), x, y, previous, False))
             return "miss"
 
     def get_ship_at(self, x, y):
@@ -147,7 +303,327 @@ class Board:
         Returns:
             Ship or None: Корабль в указанной клетке или None
         """
-        for ship in self.ships:
-            if (x, y) in ship.cells:
-                return ship
-        return None
\ No newline at end of file
+        ship_id = self.ship_index.get((x, y))
+        if ship_id is None:
+            return None
+        return self.ships_by_id[ship_id]
+
+    def set_cell(self, x, y, state):
+        """
+        Запись состояния клетки с копированием общей строки и записью в журнал
+
+        Args:
+            x (int): Координата X
+            y (int): Координата Y
+            state (int): Новое состояние клетки (значение Cell)
+        """
+        row = self.grid[y]
+        if not self.rows_owned[y]:
+            row = row[:]
+            self.grid[y] = row
+            self.rows_owned[y] = True
+        if self.trail is not None:
+            self.trail.append((TRAIL_CELL, x, y, row[x]))
+        row[x] = state
+        self.version += 1
+
+    def add_shot(self, cell):
+        """Добавление клетки в множество выстрелов"""
+        if not self.shots_owned:
+            self.shots = set(self.shots)
+            self.shots_owned = True
+        self.shots.add(cell)
+        if self.trail is not None:
+            self.trail.append((TRAIL_SHOT, cell))
+
+    def own_fleet(self):
+        """Получение собственных копий списка кораблей и индекса, если они общие"""
+        if not self.fleet_owned:
+            self.ships = self.ships[:]
+            self.ship_index = dict(self.ship_index)
+            self.ships_by_id = dict(self.ships_by_id)
+            self.fleet_owned = True
+
+    def own_ship(self, ship_id):
+        """
+        Получение собственной копии корабля перед изменением его здоровья
+
+        Args:
+            ship_id (int): id корабля в индексе
+
+        Returns:
+            Ship: Корабль, принадлежащий только этому полю
+        """
+        ship = self.ships_by_id[ship_id]
+        if ship_id not in self.shared_ship_ids:
+            return ship
+
+        self.own_fleet()
+        copy = ship.copy()
+        self.ships[self.ships.index(ship)] = copy
+        self.ships_by_id[ship_id] = copy
+        self.shared_ship_ids.discard(ship_id)
+        return copy
+
+    def clone(self):
+        """
+        Копия поля с копированием при записи
+
+        Копия разделяет с исходным полем строки сетки, выстрелы, корабли
+        и индекс. Изменяемая часть копируется только при первой записи
+        в неё - с любой из двух сторон.
+
+        Returns:
+            Board: Независимая копия поля
+        """
+        board = Board.__new__(Board)
+        board.size = self.size
+        board.grid = self.grid[:]
+        board.ships = self.ships
+        board.shots = self.shots
+        board.ship_index = self.ship_index
+        board.ships_by_id = self.ships_by_id
+        board.next_ship_id = self.next_ship_id
+        board.trail = None
+        board.version = self.version
+        board.legal_cache = {}
+
+        # Журнал ходов у копии свой и начинается с чистого листа
+        board.reset_journal()
+
+        # Всё состояние становится общим для обоих полей
+        self.rows_owned = [False] * self.size
+        self.shots_owned = False
+        self.fleet_owned = False
+        self.shared_ship_ids = set(self.ships_by_id)
+
+        board.rows_owned = [False] * self.size
+        board.shots_owned = False
+        board.fleet_owned = False
+        board.shared_ship_ids = set(self.ships_by_id)
+        return board
+
+    def snapshot(self):
+        """
+        Снимок состояния поля
+
+        После снимка изменения поля записываются в журнал в виде старых
+        значений, поэтому снимок ничего не копирует. Снимки вложенные:
+        восстанавливать их нужно в обратном порядке.
+
+        Returns:
+            int: Метка снимка для restore/release
+        """
+        if self.trail is None:
+            self.trail = []
+        return len(self.trail)
+
+    def restore(self, mark):
+        """
+        Откат поля к снимку
+
+        Args:
+            mark (int): Метка, полученная от snapshot
+        """
+        trail = self.trail
+        if trail is None:
+            return
+
+        # Откат идёт без записи в журнал
+        self.trail = None
+        while len(trail) > mark:
+            entry = trail.pop()
+            kind = entry[0]
+
+            if kind == TRAIL_CELL:
+                self.set_cell(entry[1], entry[2], entry[3])
+            elif kind == TRAIL_SHOT:
+                if not self.shots_owned:
+                    self.shots = set(self.shots)
+                    self.shots_owned = True
+                self.shots.discard(entry[1])
+            elif kind == TRAIL_SHOT_UNDO:
+                if not self.shots_owned:
+                    self.shots = set(self.shots)
+                    self.shots_owned = True
+                self.shots.add(entry[1])
+            elif kind == TRAIL_HEALTH:
+                self.own_ship(entry[1]).health = entry[2]
+            elif kind == TRAIL_PLACE:
+                self.own_fleet()
+                ship = self.ships_by_id.pop(entry[1])
+                self.ships.remove(ship)
+                for cell, ship_id in entry[2]:
+                    if ship_id is None:
+                        del self.ship_index[cell]
+                    else:
+                        self.ship_index[cell] = ship_id
+            elif kind == TRAIL_REMOVE:
+                _, ship, position, ship_id = entry
+                self.own_fleet()
+                self.ships.insert(position, ship)
+                if ship_id is not None:
+                    self.ships_by_id[ship_id] = ship
+                    for cell in ship.cells:
+                        self.ship_index[cell] = ship_id
+            elif kind == TRAIL_JOURNAL:
+                _, position, tail = entry
+                if tail is not None:
+                    del self.journal[position:]
+                    self.journal.extend(tail)
+                self.journal_pos = position
+
+        self.trail = trail if mark else None
+
+    def release(self, mark):
+        """
+        Закрепление изменений после снимка без отката
+
+        Args:
+            mark (int): Метка, полученная от snapshot
+        """
+        if not mark:
+            self.trail = None
+
+    def log_move(self, record):
+        """
+        Запись хода в журнал undo/redo
+
+        Новый ход отбрасывает отменённые ходы, которые ещё можно было повторить.
+
+        Args:
+            record (tuple): Запись хода (вид, связан с предыдущим, данные...)
+        """
+        if self.replaying:
+            return
+
+        position = self.journal_pos
+        if self.trail is not None:
+            self.trail.append((TRAIL_JOURNAL, position, self.journal[position:]))
+        del self.journal[position:]
+        self.journal.append(record)
+        self.journal_pos = position + 1
+
+    def begin_group(self):
+        """Начало группы ходов, которые отменяются и повторяются как один"""
+        self.group_depth += 1
+        if self.group_depth == 1:
+            self.group_started = False
+
+    def end_group(self):
+        """Конец группы ходов"""
+        self.group_depth -= 1
+
+    def group_chained(self):
+        """Связан ли следующий ход с предыдущим (внутри группы, кроме первого хода)"""
+        if not self.group_depth:
+            return False
+        chained = self.group_started
+        self.group_started = True
+        return chained
+
+    def can_undo(self):
+        """Есть ли ход для отмены"""
+        return self.journal_pos > 0
+
+    def can_redo(self):
+        """Есть ли отменённый ход для повтора"""
+        return self.journal_pos < len(self.journal)
+
+    def undo(self):
+        """
+        Отмена последнего хода (или группы ходов)
+
+        Returns:
+            bool: Был ли отменён ход
+        """
+        if not self.journal_pos:
+            return False
+
+        self.move_journal(self.journal_pos)
+        self.replaying = True
+        try:
+            while True:
+                self.journal_pos -= 1
+                record = self.journal[self.journal_pos]
+                self.unmake_move(record)
+                if not record[1] or not self.journal_pos:
+                    break
+        finally:
+            self.replaying = False
+        return True
+
+    def redo(self):
+        """
+        Повтор последнего отменённого хода (или группы ходов)
+
+        Returns:
+            bool: Был ли повторён ход
+        """
+        if self.journal_pos >= len(self.journal):
+            return False
+
+        self.move_journal(self.journal_pos)
+        self.replaying = True
+        try:
+            while True:
+                record = self.journal[self.journal_pos]
+                self.journal_pos += 1
+                self.make_move(record)
+                if self.journal_pos >= len(self.journal) or not self.journal[self.journal_pos][1]:
+                    break
+        finally:
+            self.replaying = False
+        return True
+
+    def move_journal(self, position):
+        """Запись сдвига позиции журнала ходов для отката по снимку"""
+        if self.trail is not None:
+            self.trail.append((TRAIL_JOURNAL, position, None))
+
+    def make_move(self, record):
+        """Повторное выполнение хода из журнала"""
+        kind = record[0]
+        if kind == MOVE_PLACE:
+            ship = record[2]
+            for x, y in ship.cells:
+                self.set_cell(x, y, Cell.SHIP)
+            self.attach_ship(ship)
+        elif kind == MOVE_REMOVE:
+            self.remove_ship(record[2])
+        else:
+            self.shoot(record[2], record[3])
+
+    def unmake_move(self, record):
+        """Отмена хода из журнала"""
+        kind = record[0]
+        if kind == MOVE_PLACE:
+            ship, previous = record[2], record[3]
+            self.detach_ship(ship)
+            for (x, y), state in zip(ship.cells, previous):
+                self.set_cell(x, y, state)
+        elif kind == MOVE_REMOVE:
+            ship, position, previous = record[2], record[3], record[4]
+            for (x, y), state in zip(ship.cells, previous):
+                self.set_cell(x, y, state)
+            self.attach_ship(ship, position)
+        else:
+            _, _, x, y, previous, destroyed = record
+            if not self.shots_owned:
+                self.shots = set(self.shots)
+                self.shots_owned = True
+            self.shots.discard((x, y))
+            if self.trail is not None:
+                self.trail.append((TRAIL_SHOT_UNDO, (x, y)))
+            self.set_cell(x, y, previous)
+
+            ship_id = self.ship_index.get((x, y))
+            if ship_id is not None and previous == Cell.SHIP:
+                ship = self.own_ship(ship_id)
+                if self.trail is not None:
+                    self.trail.append((TRAIL_HEALTH, ship_id, ship.health))
+                ship.health += 1
+                if destroyed:
+                    for cell in ship.cells:
+                        if cell != (x, y):
+                            self.set_cell(cell[0], cell[1], Cell.HIT)
\ No newline at end of file
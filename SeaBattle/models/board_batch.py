@@ -0,0 +1,190 @@
+"""
+Модуль с пачкой игровых полей на массивах NumPy
+
+Требует NumPy (необязательная зависимость, requirements-optional.txt):
+основная игра его не использует.
+"""
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("Для models.board_batch нужен NumPy: "
+                      "pip install -r requirements-optional.txt") from error
+
+from models.cell import Cell
+from models.fleet_generator import FleetGenerator
+
+
+# Коды результатов выстрела
+MISS = 0
+HIT = 1
+DESTROYED = 2
+ALREADY_SHOT = 3
+
+# Код результата -> строка, которую возвращает Board.shoot
+RESULT_NAMES = ("miss", "hit", "destroyed", "already_shot")
+
+
+class BoardBatch:
+    """
+    Пачка из N игровых полей одного размера, хранящаяся в общих массивах
+
+    Все поля обрабатываются одновременно: один вызов shoot делает по
+    выстрелу в каждой игре пачки. Массивы:
+        ship_ids (N, size, size) - id корабля в клетке или -1
+        occupied (N, size, size) - занята ли клетка кораблём
+        shots (N, size, size) - стреляли ли по клетке
+        health (N, ships) - оставшееся здоровье каждого корабля
+        ships_left (N,) - количество неуничтоженных кораблей
+    """
+
+    def __init__(self, count, size=10, max_ships=10):
+        """
+        Инициализация пустой пачки полей
+
+        Args:
+            count (int): Количество полей
+            size (int): Размер поля
+            max_ships (int): Наибольшее количество кораблей на одном поле
+        """
+        self.count = count
+        self.size = size
+
+        self.ship_ids = np.full((count, size, size), -1, dtype=np.int16)
+        self.occupied = np.zeros((count, size, size), dtype=bool)
+        self.shots = np.zeros((count, size, size), dtype=bool)
+        self.health = np.zeros((count, max_ships), dtype=np.int16)
+        self.ships_left = np.zeros(count, dtype=np.int16)
+
+        self.all_boards = np.arange(count)
+
+    @classmethod
+    def from_layouts(cls, layouts, size=10):
+        """
+        Создание пачки из готовых расстановок
+
+        Args:
+            layouts (list): Расстановки [[(размер, x, y, horizontal), ...], ...]
+            size (int): Размер поля
+
+        Returns:
+            BoardBatch: Пачка полей
+        """
+        max_ships = max((len(layout) for layout in layouts), default=0)
+        batch = cls(len(layouts), size, max_ships)
+
+        ship_ids = batch.ship_ids
+        health = batch.health
+        for board, layout in enumerate(layouts):
+            for ship_id, (ship_size, x, y, horizontal) in enumerate(layout):
+                if horizontal:
+                    ship_ids[board, y, x:x + ship_size] = ship_id
+                else:
+                    ship_ids[board, y:y + ship_size, x] = ship_id
+                health[board, ship_id] = ship_size
+            batch.ships_left[board] = len(layout)
+
+        batch.occupied = ship_ids >= 0
+        return batch
+
+    @classmethod
+    def from_boards(cls, boards):
+        """
+        Создание пачки из объектов Board
+
+        Args:
+            boards (list): Поля с расставленными кораблями
+
+        Returns:
+            BoardBatch: Пачка полей (без выстрелов)
+        """
+        layouts = [[(ship.size, ship.x, ship.y, ship.horizontal) for ship in board.ships]
+                   for board in boards]
+        size = boards[0].size if boards else 10
+        return cls.from_layouts(layouts, size)
+
+    @classmethod
+    def random(cls, count, size=10, ship_configs=None, seed=None, generator=None):
+        """
+        Создание пачки со случайными расстановками
+
+        Args:
+            count (int): Количество полей
+            size (int): Размер поля
+            ship_configs (list): Конфигурация флота [(размер, количество), ...]
+            seed (int): Начальное значение генератора случайных чисел
+            generator: Генератор расстановок с методом sample(n, seed)
+                (по умолчанию FleetGenerator)
+
+        Returns:
+            BoardBatch: Пачка полей
+        """
+        if generator is None:
+            generator = FleetGenerator(size, ship_configs)
+        return cls.from_layouts(generator.sample(count, seed), size)
+
+    def shoot(self, xs, ys, boards=None):
+        """
+        Выстрел по одной клетке в каждом поле
+
+        Args:
+            xs (array): Координаты X выстрелов
+            ys (array): Координаты Y выстрелов
+            boards (array): Номера полей, по которым стреляют (по умолчанию - все по порядку);
+                каждое поле должно встречаться не более одного раза
+
+        Returns:
+            numpy.ndarray: Коды результатов (MISS, HIT, DESTROYED, ALREADY_SHOT),
+                названия кодов - в RESULT_NAMES
+        """
+        boards = self.all_boards if boards is None else np.asarray(boards)
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+
+        already = self.shots[boards, ys, xs]
+        self.shots[boards, ys, xs] = True
+
+        ids = self.ship_ids[boards, ys, xs]
+        hit = (ids >= 0) & ~already
+
+        hit_boards = boards[hit]
+        hit_ids = ids[hit]
+        self.health[hit_boards, hit_ids] -= 1
+
+        destroyed = np.zeros_like(hit)
+        destroyed[hit] = self.health[hit_boards, hit_ids] == 0
+        self.ships_left[boards[destroyed]] -= 1
+
+        results = np.full(boards.shape, MISS, dtype=np.int8)
+        results[hit] = HIT
+        results[destroyed] = DESTROYED
+        results[already] = ALREADY_SHOT
+        return results
+
+    def is_finished(self):
+        """Маска полей, на которых уничтожены все корабли"""
+        return self.ships_left == 0
+
+    def cell_states(self):
+        """
+        Состояния клеток всех полей, как в Board.grid
+
+        Returns:
+            numpy.ndarray: Массив (N, size, size) значений Cell
+        """
+        states = np.full(self.ship_ids.shape, Cell.EMPTY, dtype=np.int8)
+        states[self.occupied] = Cell.SHIP
+        states[self.shots] = Cell.MISS
+        states[self.shots & self.occupied] = Cell.HIT
+
+        # Без кораблей (max_ships == 0) уничтоженных клеток нет, а индексировать здоровье нечем
+        if self.health.shape[1]:
+            board_index = np.arange(self.count)[:, None, None]
+            ship_health = self.health[board_index, np.maximum(self.ship_ids, 0)]
+            states[self.occupied & (ship_health == 0)] = Cell.DESTROYED
+        return states
+
+    @staticmethod
+    def result_names(results):
+        """Список строковых результатов по массиву кодов"""
+        return [RESULT_NAMES[code] for code in results]
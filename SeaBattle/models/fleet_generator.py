@@ -0,0 +1,162 @@
+"""
+Модуль с генератором расстановок флота
+"""
+
+import random
+
+from models.placements import get_placement_table
+from utils.constants import GAME_SETTINGS
+
+
+class FleetGenerator:
+    """
+    Генератор случайных расстановок флота
+
+    Все допустимые размещения каждого корабля и их маски запрета берутся
+    из предвычисленной таблицы поля. Корабли ставятся по очереди: сначала
+    несколько случайных проб из списка кандидатов, а если они не подошли -
+    полный перебор оставшихся кандидатов с возвратом назад. Поэтому
+    генерация всегда завершается, если расстановка вообще существует.
+    """
+
+    # Количество случайных проб на корабль до перехода к полному перебору
+    PROBES = 32
+
+    def __init__(self, size=10, ship_configs=None, seed=None, rng=None):
+        """
+        Инициализация генератора
+
+        Args:
+            size (int): Размер поля
+            ship_configs (list): Конфигурация флота [(размер, количество), ...]
+            seed (int): Начальное значение генератора случайных чисел
+            rng (random.Random): Готовый генератор случайных чисел (вместо seed)
+        """
+        if ship_configs is None:
+            ship_configs = GAME_SETTINGS['ship_configs']
+
+        self.size = size
+        self.table = get_placement_table(size)
+        self.rng = rng if rng is not None else random.Random(seed)
+
+        # Большие корабли ставятся первыми - так тупики встречаются реже
+        self.ship_sizes = []
+        for ship_size, count in sorted(ship_configs, reverse=True):
+            if ship_size > size:
+                raise ValueError(f"Корабль размера {ship_size} не помещается на поле {size}x{size}")
+            self.ship_sizes.extend([ship_size] * count)
+
+        # Кандидаты каждого размера: ((размер, x, y, horizontal), маска корабля, маска ореола)
+        options_by_size = {}
+        for ship_size in set(self.ship_sizes):
+            options_by_size[ship_size] = tuple(((ship_size, x, y, horizontal), ship_mask, halo_mask)
+                                               for x, y, horizontal, ship_mask, halo_mask
+                                               in self.table.by_size[ship_size])
+        option_index = {ship_size: {option[0]: option for option in options}
+                        for ship_size, options in options_by_size.items()}
+
+        # Кандидаты и их индекс для каждого корабля флота по порядку постановки
+        self.candidates = [options_by_size[ship_size] for ship_size in self.ship_sizes]
+        self.option_index = [option_index[ship_size] for ship_size in self.ship_sizes]
+        self.levels = [(options, len(options)) for options in self.candidates]
+        self.probes = range(self.PROBES - 1)
+
+    def generate(self):
+        """
+        Генерация одной расстановки флота
+
+        Returns:
+            list: Список кораблей [(размер, x, y, horizontal), ...]
+        """
+        rng_random = self.rng.random
+        probes = self.probes
+
+        layout = []
+        forbidden = 0
+
+        for options, option_count in self.levels:
+            option = options[int(rng_random() * option_count)]
+            if option[1] & forbidden:
+                for _ in probes:
+                    option = options[int(rng_random() * option_count)]
+                    if not option[1] & forbidden:
+                        break
+                else:
+                    return self._backtrack(layout)
+
+            forbidden |= option[2]
+            layout.append(option[0])
+
+        return layout
+
+    def _backtrack(self, layout):
+        """
+        Достроение расстановки полным перебором с возвратом назад
+
+        Вызывается, когда случайные пробы не нашли места для очередного корабля.
+        Выбор среди допустимых кандидатов равновероятен, как и при пробах.
+
+        Args:
+            layout (list): Уже выбранные корабли [(размер, x, y, horizontal), ...]
+
+        Returns:
+            list: Список кораблей [(размер, x, y, horizontal), ...]
+        """
+        candidates = self.candidates
+        ship_count = len(candidates)
+
+        chosen = [self.option_index[level][entry] for level, entry in enumerate(layout)]
+        # Маски запрета перед постановкой каждого корабля
+        forbidden_stack = [0]
+        for option in chosen:
+            forbidden_stack.append(forbidden_stack[-1] | option[2])
+
+        # Оставшиеся кандидаты уровней, на которых идёт полный перебор
+        pending = [None] * ship_count
+        level = len(chosen)
+
+        while level < ship_count:
+            if pending[level] is None:
+                pending[level] = self._legal_options(candidates[level], forbidden_stack[level])
+
+            if pending[level]:
+                option = self.rng.choice(pending[level])
+                pending[level].remove(option)
+
+                del chosen[level:]
+                del forbidden_stack[level + 1:]
+                chosen.append(option)
+                forbidden_stack.append(forbidden_stack[level] | option[2])
+                level += 1
+                continue
+
+            # Кандидаты уровня исчерпаны: выбор на предыдущем уровне ведёт в тупик
+            pending[level] = None
+            if level == 0:
+                raise ValueError("Флот невозможно расставить на поле")
+            level -= 1
+            if pending[level] is None:
+                pending[level] = self._legal_options(candidates[level], forbidden_stack[level])
+                pending[level].remove(chosen[level])
+
+        return [option[0] for option in chosen]
+
+    def _legal_options(self, options, forbidden):
+        """Список кандидатов, не пересекающих маску запрета"""
+        return [option for option in options if not option[1] & forbidden]
+
+    def sample(self, n, seed=None):
+        """
+        Генерация пачки расстановок
+
+        Args:
+            n (int): Количество расстановок
+            seed (int): Начальное значение генератора (None - продолжить текущую последовательность)
+
+        Returns:
+            list: Список расстановок
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        generate = self.generate
+        return [generate() for _ in range(n)]
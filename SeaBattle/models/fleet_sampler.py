@@ -0,0 +1,115 @@
+"""
+Модуль с равновероятным генератором расстановок флота
+"""
+
+import random
+from functools import lru_cache
+
+from models.fleet_generator import FleetGenerator
+from models.placements import get_placement_table
+from utils.constants import GAME_SETTINGS
+
+
+@lru_cache(maxsize=None)
+def fleet_fits(size, ship_configs):
+    """
+    Можно ли расставить флот на поле (с кэшированием по полю и флоту)
+
+    Проверка - одна генерация FleetGenerator: её перебор с возвратом
+    находит расстановку, если она существует, за доли миллисекунды,
+    без подсчёта всех расстановок.
+
+    Args:
+        size (int): Размер поля
+        ship_configs (tuple): Конфигурация флота ((размер, количество), ...)
+
+    Returns:
+        bool: True, если хотя бы одна расстановка существует
+    """
+    try:
+        FleetGenerator(size, list(ship_configs), seed=0).generate()
+    except ValueError:
+        return False
+    return True
+
+
+class UniformFleetSampler:
+    """
+    Генератор расстановок флота, равновероятный среди всех допустимых расстановок
+
+    Каждый корабль выбирается независимо и равновероятно из всех своих
+    размещений в таблице поля; при первом же касании или пересечении
+    попытка начинается заново. Принятые наборы равновероятны среди
+    допустимых упорядоченных наборов, а у каждой расстановки одинаковое
+    число упорядочиваний (перестановки одинаковых кораблей), поэтому
+    расстановки выпадают строго равновероятно.
+    """
+
+    def __init__(self, size=10, ship_configs=None, seed=None, rng=None):
+        """
+        Инициализация генератора
+
+        Args:
+            size (int): Размер поля
+            ship_configs (list): Конфигурация флота [(размер, количество), ...]
+            seed (int): Начальное значение генератора случайных чисел
+            rng (random.Random): Готовый генератор случайных чисел (вместо seed)
+        """
+        if ship_configs is None:
+            ship_configs = GAME_SETTINGS['ship_configs']
+
+        self.size = size
+        self.ship_configs = tuple(sorted(ship_configs))
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.table = get_placement_table(size)
+
+        # Большие корабли выбираются первыми - так неудачные попытки обрываются раньше
+        self.levels = []
+        for ship_size, count in sorted(ship_configs, reverse=True):
+            if ship_size > size:
+                raise ValueError(f"Корабль размера {ship_size} не помещается на поле {size}x{size}")
+            options = tuple(((ship_size, x, y, horizontal), ship_mask, halo_mask)
+                            for x, y, horizontal, ship_mask, halo_mask
+                            in self.table.by_size[ship_size])
+            self.levels.extend([(options, len(options))] * count)
+
+    def generate(self):
+        """
+        Генерация одной расстановки флота
+
+        Returns:
+            list: Список кораблей [(размер, x, y, horizontal), ...]
+        """
+        if not fleet_fits(self.size, self.ship_configs):
+            raise ValueError("Флот невозможно расставить на поле")
+
+        rng_random = self.rng.random
+        levels = self.levels
+
+        while True:
+            layout = []
+            forbidden = 0
+            for options, option_count in levels:
+                option = options[int(rng_random() * option_count)]
+                if option[1] & forbidden:
+                    break
+                forbidden |= option[2]
+                layout.append(option[0])
+            else:
+                return layout
+
+    def sample(self, n, seed=None):
+        """
+        Генерация пачки равновероятных расстановок
+
+        Args:
+            n (int): Количество расстановок
+            seed (int): Начальное значение генератора (None - продолжить текущую последовательность)
+
+        Returns:
+            list: Список расстановок
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        generate = self.generate
+        return [generate() for _ in range(n)]
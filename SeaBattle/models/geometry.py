@@ -0,0 +1,92 @@
+"""
+Модуль с предвычисленными геометрическими таблицами поля
+"""
+
+from functools import lru_cache
+
+
+# Четыре направления (порядок совпадает с SmartAI.directions)
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+DIRECTION_INDEX = {direction: index for index, direction in enumerate(DIRECTIONS)}
+
+# Восемь соседей клетки
+OFFSETS8 = ((0, 1), (1, 0), (0, -1), (-1, 0),
+            (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class Geometry:
+    """
+    Таблицы соседей и лучей для поля заданного размера
+
+    Все таблицы - кортежи, индексируемые номером клетки y * size + x, и
+    содержат только клетки внутри поля, поэтому проверять границы не нужно.
+    """
+
+    def __init__(self, size):
+        """
+        Построение таблиц
+
+        Args:
+            size (int): Размер поля
+        """
+        self.size = size
+        self.cells = tuple((x, y) for y in range(size) for x in range(size))
+
+        # Соседи по стороне (в порядке DIRECTIONS) и по стороне или углу
+        self.neighbors4 = tuple(self._offsets(x, y, DIRECTIONS) for x, y in self.cells)
+        self.neighbors8 = tuple(self._offsets(x, y, OFFSETS8) for x, y in self.cells)
+
+        # Квадрат 3x3 вокруг клетки вместе с ней самой
+        self.around = tuple(((x, y),) + self.neighbors8[y * size + x] for x, y in self.cells)
+
+        # Лучи: для каждой клетки и направления - клетки до края поля
+        self.rays = tuple(tuple(self._ray(x, y, dx, dy) for dx, dy in DIRECTIONS)
+                          for x, y in self.cells)
+
+        # Те же соседства в виде битовых масок
+        self.neighbors4_masks = tuple(self._mask(cells) for cells in self.neighbors4)
+        self.neighbors8_masks = tuple(self._mask(cells) for cells in self.neighbors8)
+
+    def _offsets(self, x, y, offsets):
+        """Клетки со сдвигами offsets от (x, y), попадающие на поле"""
+        return tuple((x + dx, y + dy) for dx, dy in offsets
+                     if 0 <= x + dx < self.size and 0 <= y + dy < self.size)
+
+    def _ray(self, x, y, dx, dy):
+        """Клетки от (x, y) (не включая) в направлении (dx, dy) до края поля"""
+        cells = []
+        nx, ny = x + dx, y + dy
+        while 0 <= nx < self.size and 0 <= ny < self.size:
+            cells.append((nx, ny))
+            nx += dx
+            ny += dy
+        return tuple(cells)
+
+    def _mask(self, cells):
+        """Битовая маска набора клеток"""
+        mask = 0
+        for x, y in cells:
+            mask |= 1 << (y * self.size + x)
+        return mask
+
+    def index(self, x, y):
+        """Номер клетки (x, y)"""
+        return y * self.size + x
+
+    def contains(self, x, y):
+        """Лежит ли клетка на поле"""
+        return 0 <= x < self.size and 0 <= y < self.size
+
+
+@lru_cache(maxsize=None)
+def get_geometry(size):
+    """
+    Получение геометрических таблиц для поля заданного размера
+
+    Args:
+        size (int): Размер поля
+
+    Returns:
+        Geometry: Таблицы (строятся один раз на размер поля)
+    """
+    return Geometry(size)
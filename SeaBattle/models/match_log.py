@@ -0,0 +1,291 @@
+"""
+Модуль с журналом событий партии и движком повтора
+
+Партия записывается как поток событий, в который только добавляют:
+расстановка кораблей и выстрелы с результатами и временем. Любая позиция
+восстанавливается применением событий к полям, а для быстрой перемотки
+движок хранит ключевые кадры - копии полей через каждые N событий.
+"""
+
+import os
+import struct
+import time
+
+from models.bit_board import BitBoard
+from models.ship import Ship
+
+
+# Виды событий
+EVENT_PLACE = 0
+EVENT_SHOT = 1
+
+# Стороны: чьё поле затронуто событием
+PLAYER = 0
+COMPUTER = 1
+
+# Результаты выстрелов (порядок кодов как в BoardBatch)
+RESULTS = ("miss", "hit", "destroyed", "already_shot")
+RESULT_CODES = {name: code for code, name in enumerate(RESULTS)}
+
+# Двоичный формат: заголовок партии и события фиксированного размера
+LOG_MAGIC = b"SBML"
+LOG_VERSION = 1
+HEADER = struct.Struct("<4sBBI")
+EVENT = struct.Struct("<BBBBBd")
+
+
+class MatchLog:
+    """
+    Журнал событий одной партии
+
+    Событие - кортеж (вид, сторона, x, y, значение, время). Значение
+    расстановки - размер корабля * 2 + horizontal, значение выстрела -
+    код результата из RESULTS.
+    """
+
+    def __init__(self, size=10, events=None):
+        """
+        Инициализация журнала
+
+        Args:
+            size (int): Размер поля
+            events (list): Готовый список событий
+        """
+        self.size = size
+        self.events = events if events is not None else []
+
+    def __len__(self):
+        return len(self.events)
+
+    def record_place(self, side, ship, timestamp=None):
+        """Запись расстановки корабля"""
+        self.events.append((EVENT_PLACE, side, ship.x, ship.y,
+                            ship.size * 2 + int(ship.horizontal),
+                            time.time() if timestamp is None else timestamp))
+
+    def record_fleet(self, side, board):
+        """Запись расстановки всех кораблей поля"""
+        now = time.time()
+        for ship in board.ships:
+            self.record_place(side, ship, now)
+
+    def record_shot(self, side, x, y, result, timestamp=None):
+        """
+        Запись выстрела
+
+        Args:
+            side (int): Сторона, по полю которой стреляли (PLAYER или COMPUTER)
+            x (int): Координата X
+            y (int): Координата Y
+            result (str): Результат выстрела ("hit", "miss", "destroyed", "already_shot")
+            timestamp (float): Время события (по умолчанию - текущее)
+        """
+        self.events.append((EVENT_SHOT, side, x, y, RESULT_CODES[result],
+                            time.time() if timestamp is None else timestamp))
+
+    def record_position(self, side, board):
+        """
+        Запись уже сложившейся позиции поля (например, загруженной партии)
+
+        Выстрелы повторяются на чистом поле, чтобы записать их настоящие результаты.
+
+        Args:
+            side (int): Сторона поля
+            board (Board): Поле с кораблями и выстрелами
+        """
+        self.record_fleet(side, board)
+
+        scratch = BitBoard(board.size)
+        for ship in board.ships:
+            scratch.place_ship(Ship(ship.size, ship.x, ship.y, ship.horizontal))
+
+        now = time.time()
+        for x, y in sorted(board.shots, key=lambda cell: (cell[1], cell[0])):
+            self.record_shot(side, x, y, scratch.shoot(x, y), now)
+
+    def to_bytes(self):
+        """Упаковка журнала: заголовок и события фиксированного размера"""
+        header = HEADER.pack(LOG_MAGIC, LOG_VERSION, self.size, len(self.events))
+        return header + b"".join(EVENT.pack(*event) for event in self.events)
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        """
+        Распаковка журнала
+
+        Args:
+            data (bytes): Данные с одним или несколькими журналами подряд
+            offset (int): Смещение журнала в данных
+
+        Returns:
+            tuple: (MatchLog, смещение следующего журнала)
+        """
+        if len(data) - offset < HEADER.size:
+            raise ValueError("Журнал партии повреждён")
+
+        magic, version, size, count = HEADER.unpack_from(data, offset)
+        if magic != LOG_MAGIC:
+            raise ValueError("Это не журнал партии Морского боя")
+        if version != LOG_VERSION:
+            raise ValueError(f"Неподдерживаемая версия журнала: {version}")
+
+        start = offset + HEADER.size
+        end = start + count * EVENT.size
+        if end > len(data):
+            raise ValueError("Журнал партии повреждён")
+
+        events = list(EVENT.iter_unpack(data[start:end]))
+        return cls(size, events), end
+
+    def save(self, path, append=True, max_bytes=None):
+        """
+        Запись журнала в файл архива
+
+        Если дописанный журнал сделает архив больше max_bytes, старый архив
+        переименовывается в path + ".1" (прежний .1 удаляется), и журнал
+        пишется в новый файл.
+
+        Args:
+            path (str): Путь к файлу
+            append (bool): Дописать журнал в конец архива
+            max_bytes (int): Предельный размер архива (None - без ограничения)
+        """
+        data = self.to_bytes()
+        if append and max_bytes is not None and os.path.exists(path):
+            if os.path.getsize(path) + len(data) > max_bytes:
+                os.replace(path, path + ".1")
+
+        with open(path, "ab" if append else "wb") as file:
+            file.write(data)
+
+    @classmethod
+    def load_archive(cls, path):
+        """
+        Чтение всех журналов из файла архива
+
+        Args:
+            path (str): Путь к файлу
+
+        Returns:
+            list: Список MatchLog
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+
+        logs = []
+        offset = 0
+        while offset < len(data):
+            log, offset = cls.from_bytes(data, offset)
+            logs.append(log)
+        return logs
+
+
+class ReplayEngine:
+    """
+    Движок повтора партии по журналу событий
+
+    Позиция - количество применённых событий. Через каждые KEYFRAME_INTERVAL
+    событий движок сохраняет копии обоих полей, поэтому перемотка к любой
+    позиции применяет не больше KEYFRAME_INTERVAL событий. По умолчанию
+    используются поля на битовых масках - это самый быстрый вариант без
+    интерфейса; для отрисовки можно передать board_class=Board.
+    """
+
+    KEYFRAME_INTERVAL = 256
+
+    def __init__(self, log, board_class=BitBoard, keyframe_interval=None):
+        """
+        Инициализация движка
+
+        Args:
+            log (MatchLog): Журнал партии
+            board_class (type): Класс полей (Board или BitBoard)
+            keyframe_interval (int): Расстояние между ключевыми кадрами
+        """
+        self.log = log
+        self.board_class = board_class
+        self.interval = keyframe_interval or self.KEYFRAME_INTERVAL
+
+        self.boards = [board_class(log.size), board_class(log.size)]
+        self.position = 0
+        self.mismatches = []
+
+        # Номер кадра -> копии полей в позиции номер * interval
+        self.keyframes = {0: [board.clone() for board in self.boards]}
+
+    def apply(self, end):
+        """
+        Применение событий от текущей позиции до end
+
+        Args:
+            end (int): Позиция, до которой применяются события
+        """
+        events = self.log.events
+        boards = self.boards
+        shoots = (boards[PLAYER].shoot, boards[COMPUTER].shoot)
+        mismatches = self.mismatches
+        interval = self.interval
+        results = RESULTS
+
+        position = self.position
+        while position < end:
+            # События применяются кусками до ближайшего ключевого кадра
+            stop = min(end, (position // interval + 1) * interval)
+            for index in range(position, stop):
+                kind, side, x, y, value, _ = events[index]
+                if kind == EVENT_SHOT:
+                    if shoots[side](x, y) != results[value]:
+                        mismatches.append(index)
+                else:
+                    boards[side].place_ship(Ship(value >> 1, x, y, bool(value & 1)))
+            position = stop
+
+            frame = position // interval
+            if position % interval == 0 and frame not in self.keyframes:
+                self.keyframes[frame] = [board.clone() for board in boards]
+
+        self.position = position
+
+    def seek(self, position):
+        """
+        Переход к позиции
+
+        Args:
+            position (int): Количество применённых событий (0 - начало партии)
+
+        Returns:
+            list: Поля [игрока, компьютера] в этой позиции
+        """
+        position = max(0, min(position, len(self.log.events)))
+
+        if not self.position <= position < self.position + self.interval:
+            frame = position // self.interval
+            while frame not in self.keyframes:
+                frame -= 1
+
+            if frame * self.interval > self.position or position < self.position:
+                self.boards = [board.clone() for board in self.keyframes[frame]]
+                self.position = frame * self.interval
+                self.mismatches = [index for index in self.mismatches if index < self.position]
+
+        self.apply(position)
+        return self.boards
+
+    def run(self):
+        """
+        Повтор партии до конца
+
+        Returns:
+            list: Поля [игрока, компьютера] в конце партии
+        """
+        return self.seek(len(self.log.events))
+
+    def audit(self):
+        """
+        Проверка журнала: совпадают ли записанные результаты выстрелов с повтором
+
+        Returns:
+            list: Номера событий, результат которых не совпал
+        """
+        self.run()
+        return list(self.mismatches)
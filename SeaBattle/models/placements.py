@@ -0,0 +1,117 @@
+"""
+Модуль с предвычисленными таблицами размещений кораблей
+"""
+
+from functools import lru_cache
+
+
+class PlacementTable:
+    """Таблица всех размещений кораблей на поле заданного размера"""
+
+    def __init__(self, size):
+        """
+        Построение таблицы размещений
+
+        Args:
+            size (int): Размер поля
+        """
+        self.size = size
+        self.full_mask = (1 << (size * size)) - 1
+
+        # Бит каждой клетки: cell_bits[y * size + x]
+        self.cell_bits = tuple(1 << i for i in range(size * size))
+
+        # (размер, x, y, horizontal) -> (маска корабля, маска ореола)
+        self.masks = {}
+
+        # размер -> список (x, y, horizontal, маска корабля, маска ореола)
+        self.by_size = {}
+
+        for ship_size in range(1, size + 1):
+            placements = []
+            for horizontal in (True, False):
+                for y in range(size):
+                    for x in range(size):
+                        if horizontal and x + ship_size > size:
+                            continue
+                        if not horizontal and y + ship_size > size:
+                            continue
+
+                        ship_mask, halo_mask = self._build_masks(ship_size, x, y, horizontal)
+                        self.masks[(ship_size, x, y, horizontal)] = (ship_mask, halo_mask)
+
+                        # Однопалубный корабль не зависит от ориентации
+                        if ship_size == 1 and not horizontal:
+                            continue
+                        placements.append((x, y, horizontal, ship_mask, halo_mask))
+            self.by_size[ship_size] = placements
+
+    def _build_masks(self, ship_size, x, y, horizontal):
+        """Построение маски корабля и маски его ореола (корабль + соседние клетки)"""
+        ship_mask = 0
+        halo_mask = 0
+
+        for i in range(ship_size):
+            cx, cy = (x + i, y) if horizontal else (x, y + i)
+            ship_mask |= self.cell_bits[cy * self.size + cx]
+
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    nx, ny = cx + dx, cy + dy
+                    if 0 <= nx < self.size and 0 <= ny < self.size:
+                        halo_mask |= self.cell_bits[ny * self.size + nx]
+
+        return ship_mask, halo_mask
+
+    def legal_starts(self, ship_size, horizontal, forbidden):
+        """
+        Маска клеток, от которых корабль не задевает запрещённые клетки
+
+        Args:
+            ship_size (int): Размер корабля
+            horizontal (bool): Горизонтальное размещение
+            forbidden (int): Маска клеток, на которые корабль встать не может
+
+        Returns:
+            int: Маска, в которой бит y * self.size + x (self.size - сторона
+                поля) означает, что корабль с началом в (x, y) помещается на поле
+                и не задевает forbidden
+        """
+        mask = 0
+        cell_bits = self.cell_bits
+        size = self.size
+        for x, y, placement_horizontal, ship_mask, _ in self.by_size.get(ship_size, ()):
+            if placement_horizontal == horizontal or ship_size == 1:
+                if not ship_mask & forbidden:
+                    mask |= cell_bits[y * size + x]
+        return mask
+
+    def bit(self, x, y):
+        """Бит клетки (x, y)"""
+        return self.cell_bits[y * self.size + x]
+
+    def cells_of(self, mask):
+        """Список клеток (x, y), входящих в маску"""
+        cells = []
+        while mask:
+            low = mask & -mask
+            index = low.bit_length() - 1
+            cells.append((index % self.size, index // self.size))
+            mask ^= low
+        return cells
+
+
+@lru_cache(maxsize=None)
+def get_placement_table(size):
+    """
+    Получение таблицы размещений для поля заданного размера
+
+    Таблица строится один раз на каждый размер поля и затем переиспользуется.
+
+    Args:
+        size (int): Размер поля
+
+    Returns:
+        PlacementTable: Таблица размещений
+    """
+    return PlacementTable(size)
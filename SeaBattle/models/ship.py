@@ -2,10 +2,42 @@
 Модуль с классом корабля
 """
 
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def ship_geometry(size, x, y, horizontal):
+    """
+    Клетки корабля и его ореола (с кэшированием по положению)
+
+    Args:
+        size (int): Размер корабля
+        x (int): Координата X начальной точки
+        y (int): Координата Y начальной точки
+        horizontal (bool): Ориентация
+
+    Returns:
+        tuple: (кортеж клеток, множество клеток, множество клеток ореола)
+    """
+    if horizontal:
+        cells = tuple((x + i, y) for i in range(size))
+    else:
+        cells = tuple((x, y + i) for i in range(size))
+
+    # Ореол - клетки корабля и все соседние с ними (без обрезки по краю поля)
+    halo = frozenset((cx + dx, cy + dy)
+                     for cx, cy in cells
+                     for dx in (-1, 0, 1)
+                     for dy in (-1, 0, 1))
+
+    return cells, frozenset(cells), halo
+
 
 class Ship:
     """Класс для представления корабля"""
 
+    __slots__ = ("size", "x", "y", "horizontal", "health", "cells", "cell_set", "halo")
+
     def __init__(self, size, x, y, horizontal):
         """
         Инициализация корабля
@@ -21,17 +53,28 @@ class Ship:
         self.y = y
         self.horizontal = horizontal
         self.health = size
-        self.cells = []
         self.update_cells()
 
     def update_cells(self):
-        """Обновление списка клеток, занимаемых кораблем"""
-        self.cells = []
-        for i in range(self.size):
-            if self.horizontal:
-                self.cells.append((self.x + i, self.y))
-            else:
-                self.cells.append((self.x, self.y + i))
+        """Обновление клеток, занимаемых кораблем, и его ореола"""
+        self.cells, self.cell_set, self.halo = ship_geometry(self.size, self.x, self.y, self.horizontal)
+
+    def copy(self):
+        """Копия корабля с тем же положением и здоровьем"""
+        ship = Ship.__new__(Ship)
+        ship.size = self.size
+        ship.x = self.x
+        ship.y = self.y
+        ship.horizontal = self.horizontal
+        ship.health = self.health
+        ship.cells = self.cells
+        ship.cell_set = self.cell_set
+        ship.halo = self.halo
+        return ship
+
+    def occupies(self, x, y):
+        """Проверка, занимает ли корабль клетку (x, y)"""
+        return (x, y) in self.cell_set
 
     def is_destroyed(self):
         """Проверка, уничтожен ли корабль"""
@@ -0,0 +1,69 @@
+"""
+Проверка совпадения правил BitBoard и Board
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.board import Board
+from models.bit_board import BitBoard
+from models.ship import Ship
+
+
+def all_ships(size):
+    """Все корабли размеров 1-4, которые помещаются на поле"""
+    return [Ship(ship_size, x, y, horizontal)
+            for ship_size in range(1, 5)
+            for x in range(size)
+            for y in range(size)
+            for horizontal in (True, False)]
+
+
+class BitBoardPlacementTest(unittest.TestCase):
+    """Размещение кораблей на BitBoard по тем же правилам, что и на Board"""
+
+    def assert_same_placements(self, board, bit_board):
+        """Проверка совпадения can_place_ship и legal_placements на двух полях"""
+        for ship in all_ships(board.size):
+            self.assertEqual(board.can_place_ship(ship), bit_board.can_place_ship(ship), ship)
+        for ship_size in range(1, 5):
+            for horizontal in (True, False):
+                self.assertEqual(board.legal_placements(ship_size, horizontal),
+                                 bit_board.legal_placements(ship_size, horizontal))
+
+    def test_next_to_hit_ship(self):
+        """Рядом с подбитой палубой ставить можно, рядом с целой - нельзя"""
+        board = Board()
+        bit_board = BitBoard()
+        for target in (board, bit_board):
+            target.place_ship(Ship(3, 2, 2, True))
+            target.shoot(2, 2)
+
+        self.assertTrue(bit_board.can_place_ship(Ship(1, 1, 1, True)))
+        self.assertFalse(bit_board.can_place_ship(Ship(1, 2, 2, True)))
+        self.assertFalse(bit_board.can_place_ship(Ship(1, 5, 3, True)))
+        self.assert_same_placements(board, bit_board)
+
+    def test_random_games(self):
+        """Случайные расстановки и выстрелы, включая подбитые и потопленные корабли"""
+        rng = random.Random(7)
+        for _ in range(20):
+            board = Board()
+            bit_board = BitBoard()
+            for ship in rng.sample(all_ships(board.size), 30):
+                if board.place_ship(ship):
+                    bit_board.place_ship(Ship(ship.size, ship.x, ship.y, ship.horizontal))
+
+            for _ in range(rng.randrange(10, 60)):
+                x = rng.randrange(board.size)
+                y = rng.randrange(board.size)
+                self.assertEqual(board.shoot(x, y), bit_board.shoot(x, y))
+            self.assert_same_placements(board, bit_board)
+
+
+if __name__ == "__main__":
+    unittest.main()
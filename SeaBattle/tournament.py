@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Турнир ИИ против ИИ без графического интерфейса
+
+Пример:
+    python tournament.py smart density --games 1000000 --workers 8
+"""
+
+import argparse
+
+from ai.simulation import STRATEGIES, GENERATORS, CHUNK_SIZE, run_tournament
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Турнир стратегий ИИ Морского боя")
+    parser.add_argument("strategy_a", choices=sorted(STRATEGIES), help="стратегия первой стороны")
+    parser.add_argument("strategy_b", nargs="?", choices=sorted(STRATEGIES),
+                        help="стратегия второй стороны (по умолчанию та же)")
+    parser.add_argument("--games", type=int, default=10000, help="количество партий")
+    parser.add_argument("--generator", choices=sorted(GENERATORS), default="auto",
+                        help="генератор расстановок флота")
+    parser.add_argument("--seed", type=int, default=0, help="начальное значение генераторов")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="количество процессов (по умолчанию - по числу ядер)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="партий в одной задаче пула")
+    parser.add_argument("--histogram", action="store_true", help="вывести распределения выстрелов")
+    return parser.parse_args()
+
+
+def print_report(report, histogram=False):
+    """Вывод итогов турнира"""
+    print(f"Партий: {report['games']}, генератор: {report['generator']}, seed: {report['seed']}")
+    print(f"Время: {report['seconds']:.1f} с, {report['games_per_second']:.0f} партий/с")
+
+    for side, name in enumerate(report['strategies']):
+        shots = report['shots'][side]
+        print(f"\n[{side + 1}] {name}: побед {report['win_rates'][side]:.2%}")
+        print(f"    выстрелов до победы: среднее {shots['mean']:.2f}, медиана {shots['p50']}, "
+              f"5% {shots['p5']}, 95% {shots['p95']}, мин {shots['min']}, макс {shots['max']}")
+        if histogram:
+            for value, count in shots['histogram'].items():
+                print(f"    {value:4d} {count}")
+
+
+def main():
+    """Запуск турнира"""
+    args = parse_args()
+    report = run_tournament(args.strategy_a, args.strategy_b, games=args.games,
+                            generator=args.generator, seed=args.seed,
+                            workers=args.workers, chunk_size=args.chunk)
+    print_report(report, args.histogram)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Подбор весов SmartAI самоигрой для размера поля и состава флота
+
+Пример:
+    python tune.py --size 10 --fleet 4x1,3x2,2x3,1x4 --generations 20 --workers 8
+
+Подобранные веса записываются профилем в файл весов (по умолчанию
+GAME_SETTINGS['ai_weights']), откуда SmartAI читает их при запуске.
+"""
+
+import argparse
+
+from ai.tuning import WeightTuner
+from ai.weights import save_profile
+from utils.constants import GAME_SETTINGS
+
+
+def parse_fleet(text):
+    """Разбор состава флота вида "4x1,3x2" в [(4, 1), (3, 2)]"""
+    ship_configs = []
+    for item in text.split(","):
+        size, count = item.lower().split("x")
+        ship_configs.append((int(size), int(count)))
+    return ship_configs
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Подбор весов SmartAI")
+    parser.add_argument("--size", type=int, default=GAME_SETTINGS['board_size'], help="размер поля")
+    parser.add_argument("--fleet", type=parse_fleet, default=GAME_SETTINGS['ship_configs'],
+                        help="состав флота: размерxколичество через запятую")
+    parser.add_argument("--generations", type=int, default=20, help="количество поколений")
+    parser.add_argument("--population", type=int, default=12, help="кандидатов в поколении")
+    parser.add_argument("--elite", type=int, default=4, help="лучших кандидатов для сдвига среднего")
+    parser.add_argument("--games", type=int, default=400, help="партий на оценку кандидата")
+    parser.add_argument("--seed", type=int, default=0, help="начальное значение генераторов")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="количество процессов (по умолчанию - по числу ядер)")
+    parser.add_argument("--output", default=GAME_SETTINGS['ai_weights'], help="файл профилей весов")
+    return parser.parse_args()
+
+
+def main():
+    """Запуск подбора"""
+    args = parse_args()
+    tuner = WeightTuner(args.size, args.fleet, population=args.population, elite=args.elite,
+                        games=args.games, generations=args.generations, seed=args.seed,
+                        workers=args.workers)
+
+    def progress(record):
+        print(f"Поколение {record['generation'] + 1}: среднее {record['mean_shots']:.2f}, "
+              f"лучший {record['best_shots']:.2f} {record['best_weights']}")
+
+    result = tuner.run(progress)
+    print(f"\nИтог: {result['weights']}")
+    print(f"Выстрелов до победы: {result['shots']:.2f} (исходные веса: {result['initial_shots']:.2f})")
+
+    save_profile(args.output, args.size, args.fleet, result['weights'],
+                 {'shots': round(result['shots'], 3),
+                  'initial_shots': round(result['initial_shots'], 3),
+                  'games': result['games'], 'generations': result['generations']})
+    print(f"Профиль записан в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
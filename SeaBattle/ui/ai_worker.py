@@ -0,0 +1,163 @@
+"""
+Модуль с фоновым потоком для вычислений ИИ
+"""
+
+import queue
+import threading
+
+from ai.anytime import AnytimeAI
+
+
+def compute_shot(ai, cancelled):
+    """
+    Выбор выстрела ИИ в фоновом потоке
+
+    AnytimeAI проверяет отмену между шагами поиска, остальные ИИ
+    считают выстрел целиком.
+
+    Args:
+        ai (SmartAI): ИИ компьютера
+        cancelled (threading.Event): Признак отмены вычисления
+
+    Returns:
+        tuple: Координаты (x, y) выстрела
+    """
+    if isinstance(ai, AnytimeAI):
+        return ai.choose_shot(ai.budget, cancelled, ai.max_steps)
+    return ai.get_next_shot()
+
+
+class AIWorker:
+    """
+    Фоновый поток для вычислений ИИ с передачей результата в поток Tk
+
+    Задачи выполняются по одной в постоянном потоке. Результат кладётся
+    в очередь, которую главный поток опрашивает через after, поэтому
+    обработчик результата всегда вызывается в потоке Tk. У каждой задачи
+    есть номер поколения: отмена увеличивает номер, и результаты старых
+    задач отбрасываются, даже если вычисление уже закончилось. Ошибка
+    задачи передаётся в поток Tk так же, как результат.
+
+    Пока задача выполняется, главный поток не должен менять данные, которые
+    она читает (поле игрока и ИИ): они меняются только в обработчике результата.
+    """
+
+    # Период опроса очереди результатов, миллисекунды
+    POLL_INTERVAL = 15
+
+    def __init__(self, root):
+        """
+        Инициализация и запуск потока
+
+        Args:
+            root (tk.Tk): Главное окно, через которое опрашивается очередь
+        """
+        self.root = root
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+
+        self.generation = 0
+        self.callback = None
+        self.error_callback = None
+        self.cancelled = threading.Event()
+        self.poll_job = None
+
+        # Число задач, ещё не законченных фоновым потоком
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.idle = threading.Event()
+        self.idle.set()
+
+        self.thread = threading.Thread(target=self._run, name="ai-worker", daemon=True)
+        self.thread.start()
+
+    @property
+    def busy(self):
+        """Ожидается ли результат задачи"""
+        return self.callback is not None
+
+    def submit(self, task, callback, error_callback=None):
+        """
+        Запуск задачи в фоновом потоке
+
+        Предыдущая задача, если она ещё выполняется, отменяется.
+
+        Args:
+            task (callable): Функция task(cancelled), выполняемая в фоновом потоке
+            callback (callable): Обработчик callback(результат) в потоке Tk
+            error_callback (callable): Обработчик error_callback(исключение) в потоке Tk,
+                если задача завершилась ошибкой (None - сообщить об ошибке через Tk)
+        """
+        self.cancel()
+        self.cancelled = threading.Event()
+        self.callback = callback
+        self.error_callback = error_callback
+        with self.lock:
+            self.pending += 1
+            self.idle.clear()
+        self.jobs.put((self.generation, task, self.cancelled))
+
+        if self.poll_job is None:
+            self.poll_job = self.root.after(self.POLL_INTERVAL, self._poll)
+
+    def cancel(self):
+        """Отмена текущей задачи (без ожидания фонового потока)"""
+        self.generation += 1
+        self.callback = None
+        self.error_callback = None
+        self.cancelled.set()
+
+    def when_idle(self, callback):
+        """
+        Вызов callback() в потоке Tk, как только фоновый поток закончит все задачи
+
+        Ожидание идёт опросом через after и не блокирует окно.
+
+        Args:
+            callback (callable): Обработчик без аргументов
+        """
+        if self.idle.is_set():
+            callback()
+        else:
+            self.root.after(self.POLL_INTERVAL, self.when_idle, callback)
+
+    def _run(self):
+        """Цикл фонового потока: выполнение задач по очереди"""
+        while True:
+            generation, task, cancelled = self.jobs.get()
+            if not cancelled.is_set():
+                try:
+                    self.results.put((generation, task(cancelled), None))
+                except Exception as error:
+                    self.results.put((generation, None, error))
+            with self.lock:
+                self.pending -= 1
+                if not self.pending:
+                    self.idle.set()
+
+    def _poll(self):
+        """Опрос очереди результатов в потоке Tk"""
+        self.poll_job = None
+
+        while True:
+            try:
+                generation, result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            if generation != self.generation or self.callback is None:
+                continue
+
+            callback = self.callback
+            error_callback = self.error_callback
+            self.callback = None
+            self.error_callback = None
+            if error is None:
+                callback(result)
+            elif error_callback is not None:
+                error_callback(error)
+            else:
+                self.root.report_callback_exception(type(error), error, error.__traceback__)
+
+        if self.busy and self.poll_job is None:
+            self.poll_job = self.root.after(self.POLL_INTERVAL, self._poll)
@@ -3,32 +3,209 @@
 """
 
 import tkinter as tk
+import weakref
+
 from models.cell import Cell
+from ui.tile_cache import TileCache
+
+
+# Вид клетки: (цвет заливки, символ, размер шрифта символа, цвет символа)
+CELL_STYLES = {
+    Cell.EMPTY: ("white", "", 16, "black"),
+    Cell.SHIP: ("#3498DB", "■", 16, "white"),
+    Cell.MISS: ("#BDC3C7", "○", 16, "black"),
+    Cell.HIT: ("#E74C3C", "✕", 16, "black"),
+    Cell.DESTROYED: ("#2C3E50", "☠", 18, "white")
+}
+
+# Легенда: состояние клетки и подпись (образцы рисуются теми же изображениями, что и поле)
+LEGEND_CELLS = [
+    (Cell.SHIP, "Ваш корабль"),
+    (Cell.HIT, "Попадание"),
+    (Cell.MISS, "Промах"),
+    (Cell.DESTROYED, "Уничтожен"),
+    (Cell.EMPTY, "Пустая клетка")
+]
+
+# Вид призрака корабля при расстановке: (заливка, цвет контура, толщина контура)
+GHOST_STYLES = {
+    True: ("#3498DB", "black", 1),
+    False: ("", "#E74C3C", 3)
+}
+
+
+class BoardView:
+    """Элементы холста, на котором нарисовано поле, и то, что в них сейчас показано"""
+
+    def __init__(self, size):
+        """
+        Инициализация
+
+        Args:
+            size (int): Размер поля
+        """
+        self.size = size
+        # индекс клетки -> id изображения клетки
+        self.items = []
+        # индекс клетки -> показанный вид клетки из CELL_STYLES
+        self.shown = [None] * (size * size)
+        # Прямоугольники призрака корабля (слой "ghost") и что в них показано
+        self.ghost = []
+        self.ghost_shown = None
 
 
 class CanvasManager:
-    """Класс для управления отрисовкой на холстах"""
+    """
+    Класс для управления отрисовкой на холстах
+
+    Элементы поля создаются на холсте один раз. Для каждого холста
+    запоминается, какой вид показан в каждой клетке, и при следующей
+    отрисовке меняются только клетки, вид которых изменился. Клетка -
+    элемент-изображение с готовым изображением вида из TileCache.
+    """
 
-    def __init__(self, game_ui):
+    # Размер клетки и отступ поля от края холста (под номера строк и столбцов)
+    CELL_SIZE = 32
+    OFFSET = 40
+
+    def __init__(self, game_ui, tile_cache=None):
         """
         Инициализация менеджера холстов
 
         Args:
             game_ui (SeaBattleGame): Основной класс UI игры
+            tile_cache (TileCache): Кэш изображений клеток (по умолчанию - свой)
         """
         self.ui = game_ui
+        self.tiles = tile_cache or TileCache()
+        # холст -> BoardView; запись пропадает вместе с холстом
+        self.views = weakref.WeakKeyDictionary()
+
+    def create_legend_tile(self, parent, cell_state, bg):
+        """
+        Образец клетки для легенды
+
+        Args:
+            parent (tk.Widget): Родительский виджет
+            cell_state (int): Состояние клетки (значение Cell)
+            bg (str): Цвет фона вокруг образца
+
+        Returns:
+            tk.Canvas: Холст с изображением клетки из TileCache
+        """
+        canvas = tk.Canvas(parent, width=self.CELL_SIZE, height=self.CELL_SIZE,
+                           bg=bg, highlightthickness=0)
+        canvas.create_image(0, 0, anchor=tk.NW,
+                            image=self.tiles.get(canvas, CELL_STYLES[cell_state], self.CELL_SIZE))
+        return canvas
+
+    def invalidate(self, canvas):
+        """Забыть элементы холста: следующая отрисовка создаст поле заново"""
+        self.views.pop(canvas, None)
 
     def draw_board(self, canvas, board, hide_ships=True):
-        """Отрисовка игрового поля на холсте"""
+        """
+        Отрисовка игрового поля на холсте
+
+        Args:
+            canvas (tk.Canvas): Холст
+            board (Board): Игровое поле
+            hide_ships (bool): Скрывать неподбитые корабли
+
+        Returns:
+            int: Количество изменённых элементов холста
+        """
+        view = self.views.get(canvas)
+        if view is None or view.size != board.size:
+            view = self.create_view(canvas, board.size)
+
+        size = board.size
+        shown = view.shown
+        items = view.items
+        tiles = self.tiles
+        cell_size = self.CELL_SIZE
+        changed = 0
+
+        for y, row in enumerate(board.grid):
+            for x, cell_state in enumerate(row):
+                if hide_ships and cell_state == Cell.SHIP:
+                    cell_state = Cell.EMPTY
+                style = CELL_STYLES[cell_state]
+
+                index = y * size + x
+                if shown[index] is style:
+                    continue
+                shown[index] = style
+
+                canvas.itemconfig(items[index], image=tiles.get(canvas, style, cell_size))
+                changed += 1
+
+        return changed
+
+    def show_ghost(self, canvas, cells, valid):
+        """
+        Призрак корабля поверх поля при расстановке
+
+        Призрак - отдельный слой прямоугольников с тегом "ghost": при
+        движении мыши они только переносятся и перекрашиваются, поле
+        под ними не перерисовывается.
+
+        Args:
+            canvas (tk.Canvas): Холст с уже нарисованным полем
+            cells (list): Клетки корабля [(x, y), ...]
+            valid (bool): Можно ли разместить корабль здесь
+        """
+        view = self.views.get(canvas)
+        if view is None:
+            return
+
+        shown = (tuple(cells), valid)
+        if view.ghost_shown == shown:
+            return
+        view.ghost_shown = shown
+
+        while len(view.ghost) < len(cells):
+            view.ghost.append(canvas.create_rectangle(0, 0, 0, 0, tags="ghost", state="hidden"))
+
+        fill_color, outline, width = GHOST_STYLES[valid]
+        cell_size = self.CELL_SIZE
+        for item, (x, y) in zip(view.ghost, cells):
+            x1 = self.OFFSET + x * cell_size
+            y1 = self.OFFSET + y * cell_size
+            canvas.coords(item, x1, y1, x1 + cell_size, y1 + cell_size)
+            canvas.itemconfig(item, fill=fill_color, outline=outline, width=width, state="normal")
+        for item in view.ghost[len(cells):]:
+            canvas.itemconfig(item, state="hidden")
+        canvas.tag_raise("ghost")
+
+    def hide_ghost(self, canvas):
+        """Скрытие призрака корабля"""
+        view = self.views.get(canvas)
+        if view is None or view.ghost_shown is None:
+            return
+        view.ghost_shown = None
+        canvas.itemconfig("ghost", state="hidden")
+
+    def create_view(self, canvas, size):
+        """
+        Создание всех элементов поля на чистом холсте
+
+        Args:
+            canvas (tk.Canvas): Холст
+            size (int): Размер поля
+
+        Returns:
+            BoardView: Элементы поля, ещё ничего не показывающие
+        """
         canvas.delete("all")
+        view = BoardView(size)
 
-        # Размер клетки
-        cell_size = 32
-        offset_x = 40
-        offset_y = 40
+        cell_size = self.CELL_SIZE
+        offset_x = self.OFFSET
+        offset_y = self.OFFSET
 
         # Номера столбцов
-        for x in range(10):
+        for x in range(size):
             x_center = offset_x + x * cell_size + cell_size // 2
             canvas.create_text(x_center, offset_y // 2,
                                text=str(x),
@@ -36,62 +213,24 @@ class CanvasManager:
                                fill="black")
 
         # Номера строк
-        for y in range(10):
+        for y in range(size):
             y_center = offset_y + y * cell_size + cell_size // 2
             canvas.create_text(offset_x // 2, y_center,
                                text=str(y),
                                font=("Arial", 12, "bold"),
                                fill="black")
 
-        # Сетка и клетки
-        for y in range(10):
-            for x in range(10):
-                x1 = offset_x + x * cell_size
-                y1 = offset_y + y * cell_size
-                x2 = x1 + cell_size
-                y2 = y1 + cell_size
-
-                cell_state = board.grid[y][x]
-
-                # Цвет и символ
-                if cell_state == Cell.EMPTY:
-                    fill_color = "white"
-                    symbol = ""
-                elif cell_state == Cell.SHIP:
-                    if hide_ships:
-                        fill_color = "white"
-                        symbol = ""
-                    else:
-                        fill_color = "#3498DB"
-                        symbol = "■"
-                elif cell_state == Cell.MISS:
-                    fill_color = "#BDC3C7"
-                    symbol = "○"
-                elif cell_state == Cell.HIT:
-                    fill_color = "#E74C3C"
-                    symbol = "✕"
-                elif cell_state == Cell.DESTROYED:
-                    fill_color = "#2C3E50"
-                    symbol = "☠"
-
-                # Рисуем клетку
-                canvas.create_rectangle(x1, y1, x2, y2,
-                                        fill=fill_color,
-                                        outline="black",
-                                        width=1)
-
-                # Символ
-                if symbol:
-                    font_size = 16
-                    if symbol == "☠":
-                        font_size = 18
-
-                    canvas.create_text(x1 + cell_size // 2, y1 + cell_size // 2,
-                                       text=symbol,
-                                       font=("Arial", font_size),
-                                       fill="white" if cell_state in [Cell.SHIP, Cell.DESTROYED] else "black")
+        # Клетки: изображения, вид которых задаёт draw_board
+        for y in range(size):
+            for x in range(size):
+                view.items.append(canvas.create_image(offset_x + x * cell_size,
+                                                      offset_y + y * cell_size,
+                                                      anchor="nw"))
 
         # Внешняя рамка
         canvas.create_rectangle(offset_x, offset_y,
-                                offset_x + 10 * cell_size, offset_y + 10 * cell_size,
-                                outline="black", width=2)
\ No newline at end of file
+                                offset_x + size * cell_size, offset_y + size * cell_size,
+                                outline="black", width=2)
+
+        self.views[canvas] = view
+        return view
\ No newline at end of file
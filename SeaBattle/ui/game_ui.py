@@ -7,9 +7,18 @@ from tkinter import messagebox
 
 from models.board import Board
 from models.ship import Ship
+from models.match_log import MatchLog, PLAYER, COMPUTER
 from ai.smart_ai import SmartAI
+from ai.density_ai import DensityAI, EndgameAI
+from ai.anytime import AnytimeAI
+from ai.transposition import TranspositionTable
 from ui.menu_screens import MenuScreens
-from ui.canvas_manager import CanvasManager
+from ui.canvas_manager import CanvasManager, LEGEND_CELLS
+from ui.render_scheduler import RenderScheduler
+from ui.perf_hud import PerfStats, PerfHUD, DEFAULT_CSV
+from ui.ai_worker import AIWorker, compute_shot
+from utils.constants import GAME_SETTINGS
+from utils.savegame import pack_game, save_game, load_game
 
 
 class SeaBattleGame:
@@ -40,6 +49,18 @@ class SeaBattleGame:
         self.menu_screens = MenuScreens(self)
         self.canvas_manager = CanvasManager(self)
 
+        # Замеры времени отрисовки, ходов и ввода (оверлей - по F3)
+        self.perf_stats = PerfStats()
+        self.perf_hud = PerfHUD(self.root, self.perf_stats, self.perf_counters)
+        self.render_scheduler = RenderScheduler(self.root, self.canvas_manager, self.perf_stats)
+
+        # Кэш решений ИИ, общий для всех партий сеанса
+        self.ai_cache = self.load_ai_cache()
+
+        # Ход компьютера считается в фоновом потоке
+        self.ai_worker = AIWorker(self.root)
+        self.computer_turn_job = None
+
         # Инициализация игры
         self.init_game_state()
 
@@ -48,14 +69,21 @@ class SeaBattleGame:
 
         # Привязка клавиш
         self.root.bind('<Escape>', self.exit_fullscreen)
+        self.root.bind('<F3>', self.perf_hud.toggle)
+        self.root.bind('<F5>', self.save_current_game)
+        self.root.bind('<F9>', self.load_saved_game)
 
     def init_game_state(self):
         """Инициализация состояния игры"""
+        self.cancel_computer_turn()
+        self.render_scheduler.cancel()
+
         self.placement_mode = True
         self.player_turn = True
         self.game_over = False
         self.computer_shots = []
         self.computer_ai = None
+        self.match_log = MatchLog()
 
         # Игровые доски
         self.player_board = Board()
@@ -63,6 +91,7 @@ class SeaBattleGame:
 
         # Переменные для расстановки
         self.current_ship_size = None
+        self.hover_state = None
         self.current_ship_horizontal = True
         self.ships_to_place = None
         self.start_game_btn = None
@@ -94,11 +123,14 @@ class SeaBattleGame:
 
         # Привязка событий
         self.player_canvas.bind("<Motion>", self.on_player_hover)
+        self.player_canvas.bind("<Leave>", self.on_player_leave)
         self.player_canvas.bind("<Button-1>", self.on_player_click)
         self.player_canvas.bind("<Button-3>", self.on_player_right_click)
+        self.root.bind("<Control-z>", self.undo_placement)
+        self.root.bind("<Control-y>", self.redo_placement)
 
         # Отрисовка пустого поля
-        self.canvas_manager.draw_board(self.player_canvas, self.player_board, hide_ships=False)
+        self.render_scheduler.mark_dirty(self.player_canvas, self.player_board, hide_ships=False)
 
     # Методы управления игрой
     def update_ship_buttons(self):
@@ -120,6 +152,7 @@ class SeaBattleGame:
 
         self.current_ship_size = size
         self.current_ship_horizontal = True
+        self.on_player_leave()
         orient = "горизонтально" if self.current_ship_horizontal else "вертикально"
         self.status_label.config(text=f"Выбран {size}-палубный корабль ({orient})")
 
@@ -127,6 +160,7 @@ class SeaBattleGame:
         """Поворот корабля"""
         if self.current_ship_size:
             self.current_ship_horizontal = not self.current_ship_horizontal
+            self.on_player_leave()
             orient = "горизонтально" if self.current_ship_horizontal else "вертикально"
             self.status_label.config(text=f"Корабль повёрнут: {orient}")
 
@@ -141,42 +175,60 @@ class SeaBattleGame:
 
         x = (event.x - offset_x) // cell_size
         y = (event.y - offset_y) // cell_size
+        size = self.current_ship_size
+        horizontal = self.current_ship_horizontal
+        board = self.player_board
 
-        if 0 <= x < 10 and 0 <= y < 10:
-            if self.current_ship_horizontal and x + self.current_ship_size > 10:
-                x = 10 - self.current_ship_size
-            elif not self.current_ship_horizontal and y + self.current_ship_size > 10:
-                y = 10 - self.current_ship_size
+        # Пока клетка, корабль и поле те же, призрак уже нарисован
+        hover = (x, y, size, horizontal, board.version)
+        if hover == self.hover_state:
+            return
+        self.hover_state = hover
 
-            if x >= 0 and y >= 0:
-                temp_board = Board()
-                temp_board.grid = [row[:] for row in self.player_board.grid]
-                temp_ship = Ship(self.current_ship_size, x, y, self.current_ship_horizontal)
+        board_size = board.size
+        if 0 <= x < board_size and 0 <= y < board_size:
+            if horizontal and x + size > board_size:
+                x = board_size - size
+            elif not horizontal and y + size > board_size:
+                y = board_size - size
 
-                can_place = temp_board.can_place_ship(temp_ship)
+            if x >= 0 and y >= 0:
+                if horizontal:
+                    cells = [(x + i, y) for i in range(size)]
+                else:
+                    cells = [(x, y + i) for i in range(size)]
 
-                if can_place:
-                    count_placed = 0
-                    for placed_ship in self.player_board.ships:
-                        if placed_ship.size == self.current_ship_size:
-                            count_placed += 1
+                can_place = (board.legal_placements(size, horizontal) >> (y * board_size + x) & 1
+                             and not self.ship_limit_reached(size))
+                self.canvas_manager.show_ghost(self.player_canvas, cells, bool(can_place))
+                return
 
-                    for ship_info in self.ships_to_place:
-                        if ship_info["size"] == self.current_ship_size:
-                            if count_placed >= ship_info["count"]:
-                                can_place = False
-                            break
+        self.canvas_manager.hide_ghost(self.player_canvas)
 
-                if can_place:
-                    temp_board.place_ship(temp_ship, ignore_ships=True)
+    def on_player_leave(self, event=None):
+        """Скрытие предпросмотра, когда мышь уходит с поля или корабль больше не выбран"""
+        self.hover_state = None
+        if self.player_canvas is not None:
+            self.canvas_manager.hide_ghost(self.player_canvas)
 
-                self.canvas_manager.draw_board(self.player_canvas, temp_board, hide_ships=False)
+    def ship_limit_reached(self, size):
+        """Размещены ли уже все корабли данного размера"""
+        for ship_info in self.ships_to_place:
+            if ship_info["size"] == size:
+                return ship_info["placed"] >= ship_info["count"]
+        return False
 
     def on_player_click(self, event):
         """Размещение корабля"""
         if not self.current_ship_size or not self.placement_mode:
             return
 
+        self.perf_stats.begin_input()
+        with self.perf_stats.timer('event.handler'):
+            self.place_ship_at(event)
+
+    def place_ship_at(self, event):
+        """Размещение выбранного корабля в клетке под курсором"""
         cell_size = 32
         offset_x = 40
         offset_y = 40
@@ -184,11 +236,12 @@ class SeaBattleGame:
         x = (event.x - offset_x) // cell_size
         y = (event.y - offset_y) // cell_size
 
-        if 0 <= x < 10 and 0 <= y < 10:
-            if self.current_ship_horizontal and x + self.current_ship_size > 10:
-                x = 10 - self.current_ship_size
-            elif not self.current_ship_horizontal and y + self.current_ship_size > 10:
-                y = 10 - self.current_ship_size
+        board_size = self.player_board.size
+        if 0 <= x < board_size and 0 <= y < board_size:
+            if self.current_ship_horizontal and x + self.current_ship_size > board_size:
+                x = board_size - self.current_ship_size
+            elif not self.current_ship_horizontal and y + self.current_ship_size > board_size:
+                y = board_size - self.current_ship_size
 
             if x >= 0 and y >= 0:
                 ship = Ship(self.current_ship_size, x, y, self.current_ship_horizontal)
@@ -225,7 +278,8 @@ class SeaBattleGame:
                         self.current_ship_size = None
                         self.start_game_btn.config(state=tk.NORMAL, bg="#27AE60")
 
-                    self.canvas_manager.draw_board(self.player_canvas, self.player_board, hide_ships=False)
+                    self.render_scheduler.mark_dirty(self.player_canvas, self.player_board, hide_ships=False)
+                    self.on_player_leave()
                 else:
                     self.status_label.config(text="Нельзя разместить корабль здесь!")
 
@@ -241,59 +295,100 @@ class SeaBattleGame:
         x = (event.x - offset_x) // cell_size
         y = (event.y - offset_y) // cell_size
 
-        if 0 <= x < 10 and 0 <= y < 10:
-            for ship in self.player_board.ships[:]:
-                if (x, y) in ship.cells:
-                    self.player_board.remove_ship(ship)
+        board_size = self.player_board.size
+        if 0 <= x < board_size and 0 <= y < board_size:
+            ship = self.player_board.get_ship_at(x, y)
+            if ship is not None:
+                self.player_board.remove_ship(ship)
 
-                    for ship_info in self.ships_to_place:
-                        if ship_info["size"] == ship.size:
-                            ship_info["placed"] -= 1
-                            break
+                for ship_info in self.ships_to_place:
+                    if ship_info["size"] == ship.size:
+                        ship_info["placed"] -= 1
+                        break
 
-                    self.update_ship_buttons()
+                self.update_ship_buttons()
 
-                    placed_total = sum(s["placed"] for s in self.ships_to_place)
-                    self.status_label.config(text=f"Корабль удален. Размещено: {placed_total}/10")
-                    self.start_game_btn.config(state=tk.DISABLED, bg="#2C3E50")
+                placed_total = sum(s["placed"] for s in self.ships_to_place)
+                self.status_label.config(text=f"Корабль удален. Размещено: {placed_total}/10")
+                self.start_game_btn.config(state=tk.DISABLED, bg="#2C3E50")
 
-                    self.canvas_manager.draw_board(self.player_canvas, self.player_board, hide_ships=False)
-                    break
+                self.render_scheduler.mark_dirty(self.player_canvas, self.player_board, hide_ships=False)
 
     def auto_place_ships(self):
         """Автоматическая расстановка кораблей"""
-        self.player_board = Board()
-
-        for ship_info in self.ships_to_place:
-            ship_info["placed"] = 0
-
-        if self.player_board.auto_place_ships():
-            for ship in self.player_board.ships:
-                for ship_info in self.ships_to_place:
-                    if ship_info["size"] == ship.size:
-                        ship_info["placed"] += 1
-                        break
-
-            self.update_ship_buttons()
-            self.canvas_manager.draw_board(self.player_canvas, self.player_board, hide_ships=False)
+        # Очистка и расстановка - один ход журнала, он отменяется целиком
+        self.player_board.begin_group()
+        for ship in list(self.player_board.ships):
+            self.player_board.remove_ship(ship)
+        placed = self.player_board.auto_place_ships()
+        self.player_board.end_group()
+
+        self.sync_ship_counts()
+        self.render_scheduler.mark_dirty(self.player_canvas, self.player_board, hide_ships=False)
+        self.on_player_leave()
+
+        if placed:
             self.status_label.config(text="Все корабли автоматически размещены!")
-            self.start_game_btn.config(state=tk.NORMAL, bg="#27AE60")
             self.current_ship_size = None
         else:
             messagebox.showerror("Ошибка", "Не удалось разместить корабли!")
 
     def clear_ships(self):
         """Очистка всех кораблей"""
-        self.player_board = Board()
+        self.player_board.begin_group()
+        for ship in list(self.player_board.ships):
+            self.player_board.remove_ship(ship)
+        self.player_board.end_group()
+
+        self.sync_ship_counts()
+        self.render_scheduler.mark_dirty(self.player_canvas, self.player_board, hide_ships=False)
+        self.on_player_leave()
+        self.status_label.config(text="Поле очищено. Выберите корабли.")
+        self.current_ship_size = None
 
+    def undo_placement(self, event=None):
+        """Отмена последнего действия расстановки"""
+        if not self.placement_mode or self.status_label is None:
+            return
+
+        if self.player_board.undo():
+            placed_total = self.sync_ship_counts()
+            self.render_scheduler.mark_dirty(self.player_canvas, self.player_board, hide_ships=False)
+            self.status_label.config(text=f"Действие отменено. Размещено: {placed_total}/10")
+        else:
+            self.status_label.config(text="Нечего отменять")
+
+    def redo_placement(self, event=None):
+        """Повтор отменённого действия расстановки"""
+        if not self.placement_mode or self.status_label is None:
+            return
+
+        if self.player_board.redo():
+            placed_total = self.sync_ship_counts()
+            self.render_scheduler.mark_dirty(self.player_canvas, self.player_board, hide_ships=False)
+            self.status_label.config(text=f"Действие повторено. Размещено: {placed_total}/10")
+        else:
+            self.status_label.config(text="Нечего повторять")
+
+    def sync_ship_counts(self):
+        """
+        Пересчёт размещённых кораблей по полю игрока
+
+        Returns:
+            int: Общее количество размещённых кораблей
+        """
         for ship_info in self.ships_to_place:
-            ship_info["placed"] = 0
+            ship_info["placed"] = sum(1 for ship in self.player_board.ships
+                                      if ship.size == ship_info["size"])
 
         self.update_ship_buttons()
-        self.canvas_manager.draw_board(self.player_canvas, self.player_board, hide_ships=False)
-        self.status_label.config(text="Поле очищено. Выберите корабли.")
-        self.start_game_btn.config(state=tk.DISABLED, bg="#2C3E50")
-        self.current_ship_size = None
+
+        placed_total = sum(s["placed"] for s in self.ships_to_place)
+        if placed_total < 10:
+            self.start_game_btn.config(state=tk.DISABLED, bg="#2C3E50")
+        else:
+            self.start_game_btn.config(state=tk.NORMAL, bg="#27AE60")
+        return placed_total
 
     def start_battle(self):
         """Начало битвы"""
@@ -307,11 +402,35 @@ class SeaBattleGame:
             return
 
         # Инициализация умного ИИ
-        self.computer_ai = SmartAI(self.player_board)
+        self.computer_ai = self.create_ai()
+
+        self.match_log.record_fleet(PLAYER, self.player_board)
+        self.match_log.record_fleet(COMPUTER, self.computer_board)
 
         self.placement_mode = False
         self.show_battle_screen()
 
+    def create_ai(self):
+        """Создание ИИ компьютера по режиму из настроек"""
+        if GAME_SETTINGS['ai_mode'] == 'anytime':
+            return AnytimeAI.for_difficulty(self.player_board, GAME_SETTINGS['ai_difficulty'],
+                                            cache=self.ai_cache)
+        if GAME_SETTINGS['ai_mode'] == 'density':
+            return DensityAI(self.player_board, cache=self.ai_cache)
+        if GAME_SETTINGS['ai_mode'] == 'endgame':
+            return EndgameAI(self.player_board, cache=self.ai_cache)
+        return SmartAI(self.player_board, cache=self.ai_cache)
+
+    def load_ai_cache(self):
+        """Создание кэша решений ИИ с записями, сохранёнными в прошлых сеансах"""
+        cache = TranspositionTable(GAME_SETTINGS['ai_cache_size'])
+        try:
+            cache.load(GAME_SETTINGS['ai_cache'])
+        except (OSError, ValueError):
+            # Кэш необязателен: без файла ИИ просто начинает с пустого кэша
+            pass
+        return cache
+
     def show_battle_screen(self):
         """Показывает экран битвы"""
         for widget in self.root.winfo_children():
@@ -400,29 +519,15 @@ class SeaBattleGame:
                                      font=("Arial", 14, "bold"), bg="#ECF0F1")
         legend_frame.pack(fill=tk.X, padx=10, pady=5)
 
-        legend_items = [
-            ("■", "Ваш корабль", "#3498DB"),
-            ("✕", "Попадание", "#E74C3C"),
-            ("○", "Промах", "#BDC3C7"),
-            ("☠", "Уничтожен", "#2C3E50"),
-            ("□", "Пустая клетка", "#FFFFFF")
-        ]
-
         legend_row = tk.Frame(legend_frame, bg="#ECF0F1")
         legend_row.pack(fill=tk.X, padx=10, pady=5)
 
-        for symbol, desc, color in legend_items:
+        for cell_state, desc in LEGEND_CELLS:
             item_frame = tk.Frame(legend_row, bg="#ECF0F1")
             item_frame.pack(side=tk.LEFT, padx=15)
 
-            color_frame = tk.Frame(item_frame, width=30, height=30, bg=color, relief=tk.RAISED, bd=1)
-            color_frame.pack(side=tk.LEFT)
-            color_frame.pack_propagate(False)
-
-            color_label = tk.Label(color_frame, text=symbol,
-                                   font=("Arial", 14),
-                                   bg=color, fg="white" if color in ["#3498DB", "#2C3E50", "#E74C3C"] else "black")
-            color_label.pack(expand=True)
+            tile = self.canvas_manager.create_legend_tile(item_frame, cell_state, "#ECF0F1")
+            tile.pack(side=tk.LEFT)
 
             desc_label = tk.Label(item_frame, text=desc,
                                   font=("Arial", self.font_sizes['small']),
@@ -430,8 +535,8 @@ class SeaBattleGame:
             desc_label.pack(side=tk.LEFT, padx=5)
 
         # Отрисовываем поля
-        self.canvas_manager.draw_board(self.player_canvas_battle, self.player_board, hide_ships=False)
-        self.canvas_manager.draw_board(self.computer_canvas, self.computer_board, hide_ships=True)
+        self.render_scheduler.mark_dirty(self.player_canvas_battle, self.player_board, hide_ships=False)
+        self.render_scheduler.mark_dirty(self.computer_canvas, self.computer_board, hide_ships=True)
 
     def on_computer_click(self, event):
         """Выстрел по полю компьютера"""
@@ -445,23 +550,29 @@ class SeaBattleGame:
         x = (event.x - offset_x) // cell_size
         y = (event.y - offset_y) // cell_size
 
-        if 0 <= x < 10 and 0 <= y < 10:
-            self.player_shoot(x, y)
+        board_size = self.computer_board.size
+        if 0 <= x < board_size and 0 <= y < board_size:
+            self.perf_stats.begin_input()
+            with self.perf_stats.timer('event.handler'):
+                self.player_shoot(x, y)
 
     def player_shoot(self, x, y):
         """Обработка выстрела игрока"""
-        result = self.computer_board.shoot(x, y)
+        with self.perf_stats.timer('board.shoot'):
+            result = self.computer_board.shoot(x, y)
 
         if result == "already_shot":
             self.battle_status.config(text="Вы уже стреляли в эту клетку!")
             return
 
-        self.canvas_manager.draw_board(self.computer_canvas, self.computer_board, hide_ships=True)
+        self.match_log.record_shot(COMPUTER, x, y, result)
+
+        self.render_scheduler.mark_dirty(self.computer_canvas, self.computer_board, hide_ships=True)
 
         if result == "miss":
             self.battle_status.config(text="Промах! Ход компьютера...")
             self.player_turn = False
-            self.root.after(1000, self.smart_computer_turn)
+            self.schedule_computer_turn(1000)
         elif result == "hit":
             self.battle_status.config(text="Попадание! Стреляйте ещё!")
         elif result == "destroyed":
@@ -470,21 +581,67 @@ class SeaBattleGame:
         if self.check_game_over():
             return
 
+    def schedule_computer_turn(self, delay):
+        """Планирует ход компьютера через delay миллисекунд"""
+        self.computer_turn_job = self.root.after(delay, self.smart_computer_turn)
+
+    def cancel_computer_turn(self):
+        """Отменяет запланированный ход компьютера и его вычисление в фоне"""
+        if self.computer_turn_job is not None:
+            self.root.after_cancel(self.computer_turn_job)
+            self.computer_turn_job = None
+        self.ai_worker.cancel()
+
     def smart_computer_turn(self):
-        """Ход умного компьютера"""
+        """Ход умного компьютера: выстрел ИИ считается в фоновом потоке"""
+        self.computer_turn_job = None
+        if self.game_over:
+            return
+
+        ai = self.computer_ai
+        perf_stats = self.perf_stats
+
+        def task(cancelled):
+            with perf_stats.timer('ai.get_next_shot'):
+                return compute_shot(ai, cancelled)
+
+        self.ai_worker.submit(task, self.apply_computer_shot, self.computer_shot_failed)
+
+    def computer_shot_failed(self, error):
+        """
+        Ошибка вычисления выстрела в фоне: выстрел считается заново в потоке Tk
+
+        Args:
+            error (Exception): Ошибка фонового вычисления
+        """
         if self.game_over:
             return
 
-        # Получаем следующий выстрел от ИИ
-        x, y = self.computer_ai.get_next_shot()
+        with self.perf_stats.timer('ai.get_next_shot'):
+            shot = self.computer_ai.get_next_shot()
+        self.apply_computer_shot(shot)
 
-        result = self.player_board.shoot(x, y)
+    def apply_computer_shot(self, shot):
+        """
+        Применение выстрела компьютера (в потоке Tk, после вычисления в фоне)
+
+        Args:
+            shot (tuple): Координаты (x, y) выстрела
+        """
+        if self.game_over:
+            return
+
+        x, y = shot
+        with self.perf_stats.timer('board.shoot'):
+            result = self.player_board.shoot(x, y)
 
         # Регистрируем выстрел в ИИ
         self.computer_ai.register_shot(x, y, result)
+        self.computer_shots.append((x, y, result))
+        self.match_log.record_shot(PLAYER, x, y, result)
 
         # Обновляем поле игрока
-        self.canvas_manager.draw_board(self.player_canvas_battle, self.player_board, hide_ships=False)
+        self.render_scheduler.mark_dirty(self.player_canvas_battle, self.player_board, hide_ships=False)
 
         if result == "miss":
             self.battle_status.config(
@@ -494,7 +651,7 @@ class SeaBattleGame:
             hit_text = "Попадание" if result == "hit" else "Корабль уничтожен"
             self.battle_status.config(
                 text=f"Компьютер стрелял в ({x},{y}) - {hit_text}!\nКомпьютер стреляет ещё...")
-            self.root.after(1500, self.smart_computer_turn)
+            self.schedule_computer_turn(1500)
 
         if self.check_game_over():
             return
@@ -508,9 +665,10 @@ class SeaBattleGame:
             self.game_over = True
             self.computer_canvas.unbind("<Button-1>")
 
-            self.canvas_manager.draw_board(self.computer_canvas, self.computer_board, hide_ships=False)
+            self.render_scheduler.mark_dirty(self.computer_canvas, self.computer_board, hide_ships=False)
 
             winner = "КОМПЬЮТЕР" if not player_ships_alive else "ВЫ"
+            self.archive_match()
 
             self.show_game_over_screen(winner)
             return True
@@ -561,10 +719,37 @@ class SeaBattleGame:
         """Сдача"""
         if messagebox.askyesno("Сдаться", "Вы уверены, что хотите сдаться?"):
             self.game_over = True
+            self.cancel_computer_turn()
             self.computer_canvas.unbind("<Button-1>")
+            self.archive_match()
 
             self.show_surrender_screen()
 
+    def archive_match(self):
+        """Дописывает журнал завершённой партии в архив партий, если архив включён"""
+        if not len(self.match_log):
+            return
+
+        self.ai_worker.cancel()
+        if GAME_SETTINGS['match_archive'] is not None:
+            try:
+                self.match_log.save(GAME_SETTINGS['match_archive'],
+                                    max_bytes=GAME_SETTINGS['match_archive_size'])
+            except OSError:
+                # Архив партий необязателен: ошибка записи не должна мешать игре
+                pass
+
+        # Кэш ИИ читается фоновым потоком: он сохраняется, когда поток остановится
+        self.ai_worker.when_idle(self.save_ai_cache)
+
+    def save_ai_cache(self):
+        """Сохранение кэша решений ИИ для следующих сеансов"""
+        try:
+            self.ai_cache.save(GAME_SETTINGS['ai_cache'])
+        except OSError:
+            # Кэш ИИ необязателен: ошибка записи не должна мешать игре
+            pass
+
     def show_surrender_screen(self):
         """Показывает экран сдачи"""
         result_window = tk.Toplevel(self.root)
@@ -595,6 +780,65 @@ class SeaBattleGame:
                                  width=15, height=2)
         new_game_btn.pack(pady=30)
 
+    def save_current_game(self, event=None):
+        """Сохранение партии в файл (F5)"""
+        if self.placement_mode or self.computer_ai is None or self.game_over:
+            return
+
+        if not self.player_turn:
+            self.battle_status.config(text="Сохранить игру можно только в свой ход")
+            return
+
+        try:
+            record = pack_game(self.player_board, self.computer_board, self.computer_ai,
+                               self.placement_mode, self.player_turn, self.game_over)
+            save_game(GAME_SETTINGS['save_file'], record)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить игру: {e}")
+            return
+
+        self.battle_status.config(text="Игра сохранена (F9 - загрузить). ВАШ ХОД.")
+
+    def load_saved_game(self, event=None):
+        """Загрузка партии из файла (F9)"""
+        # Во время хода компьютера уже запланирован его следующий выстрел
+        if not self.placement_mode and not self.player_turn and not self.game_over:
+            return
+
+        try:
+            state = load_game(GAME_SETTINGS['save_file'])
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Ошибка", f"Не удалось загрузить игру: {e}")
+            return
+
+        if state['ai_state'] is None:
+            messagebox.showerror("Ошибка", "В сохранении нет начатой битвы")
+            return
+
+        for widget in self.root.winfo_children():
+            if isinstance(widget, tk.Toplevel):
+                widget.destroy()
+
+        self.init_game_state()
+        self.player_board = state['player_board']
+        self.computer_board = state['computer_board']
+        self.computer_ai = self.create_ai()
+        self.computer_ai.set_state(state['ai_state'])
+        self.placement_mode = False
+        self.player_turn = state['player_turn']
+
+        self.match_log.record_position(PLAYER, self.player_board)
+        self.match_log.record_position(COMPUTER, self.computer_board)
+
+        self.show_battle_screen()
+        self.battle_status.config(text="Игра загружена. ВАШ ХОД.")
+
+        if self.check_game_over():
+            return
+        if not self.player_turn:
+            self.battle_status.config(text="Игра загружена. Ход компьютера...")
+            self.schedule_computer_turn(1000)
+
     def new_game(self):
         """Начинает новую игру"""
         for widget in self.root.winfo_children():
@@ -604,6 +848,46 @@ class SeaBattleGame:
         self.init_game_state()
         self.show_main_menu()
 
+    def perf_counters(self):
+        """Счётчики для оверлея замеров: элементы холстов и перерисовки"""
+        items = 0
+        for canvas in (self.player_canvas, self.player_canvas_battle, self.computer_canvas):
+            try:
+                if canvas is not None and canvas.winfo_exists():
+                    items += len(canvas.find_all())
+            except tk.TclError:
+                # Окно уже закрыто (замеры пишутся при выходе)
+                pass
+
+        renders = self.render_scheduler.stats()
+        return {
+            'canvas_items': items,
+            'renders_requested': renders['requested'],
+            'renders_performed': renders['performed']
+        }
+
+    def export_perf_stats(self):
+        """
+        Запись замеров сеанса в CSV
+
+        Замеры пишутся в GAME_SETTINGS['perf_csv'], а если путь не задан -
+        в DEFAULT_CSV и только когда в сеансе открывали оверлей замеров.
+        """
+        path = GAME_SETTINGS['perf_csv']
+        if path is None:
+            if not self.perf_hud.shown:
+                return
+            path = DEFAULT_CSV
+
+        try:
+            self.perf_stats.export_csv(path, self.perf_counters())
+        except OSError:
+            # Замеры необязательны: ошибка записи не должна мешать выходу
+            pass
+
     def run(self):
         """Запуск игры"""
-        self.root.mainloop()
\ No newline at end of file
+        try:
+            self.root.mainloop()
+        finally:
+            self.export_perf_stats()
\ No newline at end of file
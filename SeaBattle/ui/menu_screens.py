@@ -4,6 +4,8 @@
 
 import tkinter as tk
 
+from ui.canvas_manager import LEGEND_CELLS
+
 
 class MenuScreens:
     """Класс для управления экранами меню"""
@@ -186,6 +188,23 @@ class MenuScreens:
                               width=25, height=1)
         clear_btn.pack(pady=3)
 
+        undo_frame = tk.Frame(control_frame, bg="#ECF0F1")
+        undo_frame.pack(pady=3)
+
+        undo_btn = tk.Button(undo_frame, text="ОТМЕНИТЬ (Ctrl+Z)",
+                             command=self.ui.undo_placement,
+                             font=("Arial", self.ui.font_sizes['small']),
+                             bg="#F39C12", fg="white",
+                             width=12, height=1)
+        undo_btn.pack(side=tk.LEFT, padx=2)
+
+        redo_btn = tk.Button(undo_frame, text="ПОВТОРИТЬ (Ctrl+Y)",
+                             command=self.ui.redo_placement,
+                             font=("Arial", self.ui.font_sizes['small']),
+                             bg="#F39C12", fg="white",
+                             width=12, height=1)
+        redo_btn.pack(side=tk.LEFT, padx=2)
+
         # Кнопка начала игры
         start_battle_frame = tk.Frame(right_column, bg="#ECF0F1", height=70)
         start_battle_frame.pack(fill=tk.X, pady=10)
@@ -204,29 +223,15 @@ class MenuScreens:
                                      font=("Arial", 14, "bold"), bg="#ECF0F1")
         legend_frame.pack(fill=tk.X, padx=10, pady=5)
 
-        legend_items = [
-            ("■", "Ваш корабль", "#3498DB"),
-            ("✕", "Попадание", "#E74C3C"),
-            ("○", "Промах", "#BDC3C7"),
-            ("☠", "Уничтожен", "#2C3E50"),
-            ("□", "Пустая клетка", "#FFFFFF")
-        ]
-
         legend_row = tk.Frame(legend_frame, bg="#ECF0F1")
         legend_row.pack(fill=tk.X, padx=10, pady=5)
 
-        for symbol, desc, color in legend_items:
+        for cell_state, desc in LEGEND_CELLS:
             item_frame = tk.Frame(legend_row, bg="#ECF0F1")
             item_frame.pack(side=tk.LEFT, padx=15)
 
-            color_frame = tk.Frame(item_frame, width=30, height=30, bg=color, relief=tk.RAISED, bd=1)
-            color_frame.pack(side=tk.LEFT)
-            color_frame.pack_propagate(False)
-
-            color_label = tk.Label(color_frame, text=symbol,
-                                   font=("Arial", 14),
-                                   bg=color, fg="white" if color in ["#3498DB", "#2C3E50", "#E74C3C"] else "black")
-            color_label.pack(expand=True)
+            tile = self.ui.canvas_manager.create_legend_tile(item_frame, cell_state, "#ECF0F1")
+            tile.pack(side=tk.LEFT)
 
             desc_label = tk.Label(item_frame, text=desc,
                                   font=("Arial", self.ui.font_sizes['small']),
@@ -0,0 +1,186 @@
+"""
+Модуль с замерами времени интерфейса и их оверлеем
+"""
+
+import csv
+import math
+import threading
+import time
+import tkinter as tk
+from collections import deque
+from contextlib import contextmanager
+
+
+# Файл замеров по умолчанию: пишется при выходе, если оверлей открывали
+DEFAULT_CSV = "perf_stats.csv"
+
+
+class PerfStats:
+    """
+    Скользящие замеры времени операций
+
+    Для каждой операции хранятся последние WINDOW замеров и общее их число.
+    Замеры можно добавлять из любого потока (ход компьютера считается в фоне).
+    """
+
+    # Количество последних замеров каждой операции
+    WINDOW = 500
+
+    def __init__(self, window=None):
+        """
+        Инициализация замеров
+
+        Args:
+            window (int): Количество последних замеров (по умолчанию WINDOW)
+        """
+        self.window = window or self.WINDOW
+        self.samples = {}
+        self.counts = {}
+        self.lock = threading.Lock()
+
+        # Время начала ввода, которое ещё не отрисовано
+        self.input_started = None
+
+    def record(self, name, seconds):
+        """
+        Добавление замера
+
+        Args:
+            name (str): Операция
+            seconds (float): Длительность в секундах
+        """
+        with self.lock:
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+                self.counts[name] = 0
+            samples.append(seconds)
+            self.counts[name] += 1
+
+    @contextmanager
+    def timer(self, name):
+        """Замер времени выполнения блока with"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def begin_input(self):
+        """Начало обработки ввода: время до следующей отрисовки попадёт в event.to_paint"""
+        # Ввод, после которого ничего не перерисовалось, перекрывается новым
+        self.input_started = time.perf_counter()
+
+    def end_input(self):
+        """Отрисовка после ввода закончена"""
+        if self.input_started is not None:
+            self.record('event.to_paint', time.perf_counter() - self.input_started)
+            self.input_started = None
+
+    def summary(self):
+        """
+        Сводка по операциям
+
+        Returns:
+            dict: Операция -> {'count', 'p50', 'p95', 'max'}, время в миллисекундах
+        """
+        with self.lock:
+            snapshot = {name: (sorted(samples), self.counts[name])
+                        for name, samples in self.samples.items()}
+
+        result = {}
+        for name, (samples, count) in sorted(snapshot.items()):
+            result[name] = {
+                'count': count,
+                'p50': percentile(samples, 0.5) * 1000,
+                'p95': percentile(samples, 0.95) * 1000,
+                'max': samples[-1] * 1000
+            }
+        return result
+
+    def export_csv(self, path, counters=None):
+        """
+        Запись сводки в CSV
+
+        Args:
+            path (str): Путь к файлу
+            counters (dict): Дополнительные счётчики: имя -> значение
+        """
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["metric", "count", "p50_ms", "p95_ms", "max_ms"])
+            for name, row in self.summary().items():
+                writer.writerow([name, row['count'], f"{row['p50']:.3f}",
+                                 f"{row['p95']:.3f}", f"{row['max']:.3f}"])
+            for name, value in (counters or {}).items():
+                writer.writerow([name, value, "", "", ""])
+
+
+def percentile(samples, fraction):
+    """Квантиль отсортированных замеров по ближайшему рангу"""
+    if not samples:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+
+class PerfHUD:
+    """Оверлей со сводкой замеров в углу окна"""
+
+    # Период обновления оверлея, миллисекунды
+    REFRESH_INTERVAL = 500
+
+    def __init__(self, root, stats, counters=None):
+        """
+        Инициализация оверлея (скрыт до первого переключения)
+
+        Args:
+            root (tk.Tk): Главное окно
+            stats (PerfStats): Замеры
+            counters (callable): Возвращает дополнительные счётчики: имя -> значение
+        """
+        self.root = root
+        self.stats = stats
+        self.counters = counters
+        self.label = None
+        self.visible = False
+        self.shown = False
+        self.refresh_job = None
+
+    def toggle(self, event=None):
+        """Показ и скрытие оверлея"""
+        self.visible = not self.visible
+        if self.visible:
+            self.shown = True
+            self.refresh()
+            return
+
+        if self.refresh_job is not None:
+            self.root.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        if self.label is not None and self.label.winfo_exists():
+            self.label.place_forget()
+
+    def refresh(self):
+        """Обновление текста оверлея"""
+        self.refresh_job = None
+        if not self.visible:
+            return
+
+        # Смена экрана удаляет все виджеты окна, вместе с оверлеем
+        if self.label is None or not self.label.winfo_exists():
+            self.label = tk.Label(self.root, font=("Courier", 10), justify=tk.LEFT,
+                                  bg="black", fg="#2ECC71", padx=8, pady=6)
+
+        lines = [f"{'операция':18s} {'p50':>7s} {'p95':>7s} {'max':>7s} {'n':>6s}"]
+        for name, row in self.stats.summary().items():
+            lines.append(f"{name:18s} {row['p50']:7.2f} {row['p95']:7.2f} "
+                         f"{row['max']:7.2f} {row['count']:6d}")
+        if self.counters is not None:
+            for name, value in self.counters().items():
+                lines.append(f"{name}: {value}")
+
+        self.label.config(text="\n".join(lines))
+        self.label.place(relx=1.0, x=-10, y=10, anchor=tk.NE)
+        self.label.lift()
+        self.refresh_job = self.root.after(self.REFRESH_INTERVAL, self.refresh)
@@ -0,0 +1,104 @@
+"""
+Модуль с планировщиком перерисовки холстов
+"""
+
+import time
+
+
+class RenderScheduler:
+    """
+    Отложенная перерисовка холстов
+
+    Код игры не рисует поле сразу, а помечает холст как требующий
+    перерисовки. Все пометки до ближайшего простоя цикла событий Tk
+    собираются вместе, и каждый помеченный холст перерисовывается один раз
+    с последним переданным полем. Перерисовки идут не чаще одного раза
+    за кадр (FRAME_INTERVAL).
+    """
+
+    # Наименьший промежуток между перерисовками, миллисекунды
+    FRAME_INTERVAL = 16
+
+    def __init__(self, root, canvas_manager, perf_stats=None):
+        """
+        Инициализация планировщика
+
+        Args:
+            root (tk.Tk): Главное окно
+            canvas_manager (CanvasManager): Менеджер, рисующий поля
+            perf_stats (PerfStats): Замеры времени отрисовки (None - без замеров)
+        """
+        self.root = root
+        self.canvas_manager = canvas_manager
+        self.perf_stats = perf_stats
+
+        # холст -> (поле, скрывать корабли); порядок - порядок первых пометок
+        self.dirty = {}
+        self.flush_job = None
+        self.last_flush = 0.0
+
+        # Счётчики: запрошенные перерисовки, выполненные и проходы перерисовки
+        self.requested = 0
+        self.performed = 0
+        self.frames = 0
+
+    def mark_dirty(self, canvas, board, hide_ships=True):
+        """
+        Пометка холста для перерисовки
+
+        Args:
+            canvas (tk.Canvas): Холст
+            board (Board): Поле, которое нужно на нём нарисовать
+            hide_ships (bool): Скрывать неподбитые корабли
+        """
+        self.requested += 1
+        self.dirty[canvas] = (board, hide_ships)
+
+        if self.flush_job is None:
+            wait = self.last_flush + self.FRAME_INTERVAL / 1000 - time.perf_counter()
+            if wait > 0:
+                self.flush_job = self.root.after(int(wait * 1000) + 1, self.flush)
+            else:
+                self.flush_job = self.root.after_idle(self.flush)
+
+    def flush(self):
+        """Перерисовка всех помеченных холстов"""
+        if self.flush_job is not None:
+            self.root.after_cancel(self.flush_job)
+            self.flush_job = None
+
+        dirty = self.dirty
+        self.dirty = {}
+        if not dirty:
+            return
+
+        for canvas, (board, hide_ships) in dirty.items():
+            # Холст мог исчезнуть вместе с экраном, пока ждал перерисовки
+            if not canvas.winfo_exists():
+                continue
+            started = time.perf_counter()
+            self.canvas_manager.draw_board(canvas, board, hide_ships)
+            if self.perf_stats is not None:
+                self.perf_stats.record('draw_board', time.perf_counter() - started)
+            self.performed += 1
+
+        self.frames += 1
+        self.last_flush = time.perf_counter()
+        if self.perf_stats is not None:
+            self.perf_stats.end_input()
+
+    def cancel(self):
+        """Отмена всех ожидающих перерисовок"""
+        if self.flush_job is not None:
+            self.root.after_cancel(self.flush_job)
+            self.flush_job = None
+        self.dirty = {}
+
+    def stats(self):
+        """Счётчики перерисовок"""
+        return {
+            'requested': self.requested,
+            'performed': self.performed,
+            'frames': self.frames,
+            'coalesced': self.requested - self.performed
+        }
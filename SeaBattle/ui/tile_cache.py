@@ -0,0 +1,149 @@
+"""
+Модуль с кэшем готовых изображений клеток поля
+"""
+
+import tkinter as tk
+
+
+# Череп (☠) в виде маски: X - пиксель символа
+SKULL_PATTERN = (
+    "..XXXXX..",
+    ".XXXXXXX.",
+    "XX..X..XX",
+    "XX..X..XX",
+    "XXXXXXXXX",
+    ".XXX.XXX.",
+    "..XXXXX..",
+    "..X.X.X..",
+    "..X.X.X.."
+)
+
+
+def photo_image(canvas, width, height):
+    """Пустое изображение Tk для холста"""
+    return tk.PhotoImage(master=canvas, width=width, height=height)
+
+
+class TileCache:
+    """
+    Изображения клеток поля, нарисованные один раз
+
+    Каждый вид клетки (заливка, символ, размер символа, цвет символа)
+    рисуется в изображение размером с клетку вместе с её рамкой. Клетки
+    на холстах - элементы-изображения, ссылающиеся на общие изображения
+    кэша, поэтому смена вида клетки - это смена изображения, без
+    раскладки текста. При смене размера клетки кэш очищается.
+    """
+
+    def __init__(self, image_factory=None):
+        """
+        Инициализация кэша
+
+        Args:
+            image_factory (callable): Создание пустого изображения
+                image_factory(холст, ширина, высота) (по умолчанию tk.PhotoImage)
+        """
+        self.image_factory = image_factory or photo_image
+        self.cell_size = None
+        # вид клетки -> изображение
+        self.tiles = {}
+
+    def clear(self):
+        """Очистка кэша"""
+        self.tiles = {}
+        self.cell_size = None
+
+    def get(self, canvas, style, cell_size):
+        """
+        Изображение клетки
+
+        Args:
+            canvas (tk.Canvas): Холст, для которого нужно изображение
+            style (tuple): Вид клетки (заливка, символ, размер символа, цвет символа)
+            cell_size (int): Размер клетки в пикселях
+
+        Returns:
+            tk.PhotoImage: Изображение клетки
+        """
+        if cell_size != self.cell_size:
+            self.tiles = {}
+            self.cell_size = cell_size
+
+        tile = self.tiles.get(style)
+        if tile is None:
+            tile = self.render(canvas, style, cell_size)
+            self.tiles[style] = tile
+        return tile
+
+    def render(self, canvas, style, cell_size):
+        """Рисование изображения клетки: заливка, рамка и символ"""
+        fill_color, symbol, symbol_size, symbol_color = style
+        image = self.image_factory(canvas, cell_size, cell_size)
+
+        last = cell_size - 1
+        image.put(fill_color, to=(0, 0, cell_size, cell_size))
+        image.put("black", to=(0, 0, cell_size, 1))
+        image.put("black", to=(0, last, cell_size, cell_size))
+        image.put("black", to=(0, 0, 1, cell_size))
+        image.put("black", to=(last, 0, cell_size, cell_size))
+
+        if symbol:
+            # Половина размера символа: при размере шрифта 16 - четверть клетки
+            half = max(2, cell_size * symbol_size // 64)
+            for x1, y1, x2, y2 in self.glyph_spans(symbol, cell_size, half):
+                image.put(symbol_color, to=(x1, y1, x2, y2))
+        return image
+
+    @staticmethod
+    def glyph_spans(symbol, cell_size, half):
+        """
+        Пиксели символа в виде прямоугольников
+
+        Args:
+            symbol (str): Символ клетки
+            cell_size (int): Размер клетки
+            half (int): Половина размера символа
+
+        Returns:
+            list: Прямоугольники (x1, y1, x2, y2) без правой и нижней границы
+        """
+        center = cell_size // 2
+        thickness = max(1, half // 4)
+        spans = []
+
+        if symbol == "■":
+            side = half * 3 // 4
+            spans.append((center - side, center - side, center + side, center + side))
+
+        elif symbol == "○":
+            outer = half * half
+            inner = (half - thickness) ** 2
+            for dy in range(-half, half + 1):
+                run = None
+                for dx in range(-half, half + 2):
+                    inside = inner <= dx * dx + dy * dy <= outer
+                    if inside and run is None:
+                        run = dx
+                    elif not inside and run is not None:
+                        spans.append((center + run, center + dy, center + dx, center + dy + 1))
+                        run = None
+
+        elif symbol == "✕":
+            for dy in range(-half, half + 1):
+                for dx in (dy, -dy):
+                    spans.append((center + dx - thickness // 2, center + dy,
+                                  center + dx - thickness // 2 + thickness, center + dy + 1))
+
+        elif symbol == "☠":
+            rows = len(SKULL_PATTERN)
+            pixel = max(1, 2 * half // rows)
+            left = center - pixel * len(SKULL_PATTERN[0]) // 2
+            top = center - pixel * rows // 2
+            for row, line in enumerate(SKULL_PATTERN):
+                for column, mark in enumerate(line):
+                    if mark == "X":
+                        x1 = left + column * pixel
+                        y1 = top + row * pixel
+                        spans.append((x1, y1, x1 + pixel, y1 + pixel))
+
+        return spans
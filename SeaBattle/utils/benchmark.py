@@ -0,0 +1,132 @@
+"""
+Модуль с замером производительности и сравнением с базовыми результатами
+"""
+
+import json
+import platform
+import statistics
+import timeit
+
+
+# Минимальная длительность одного повтора замера, секунды
+MIN_REPEAT_TIME = 0.2
+
+
+class BenchmarkCase:
+    """
+    Один замер: функция и количество операций за вызов
+
+    setup() вызывается один раз и возвращает функцию без аргументов. Время
+    одного вызова делится на ops, поэтому результат - наносекунды на одну
+    операцию (выстрел, размещение, партию).
+    """
+
+    def __init__(self, name, setup, ops=1):
+        """
+        Инициализация замера
+
+        Args:
+            name (str): Имя замера
+            setup (callable): Подготовка, возвращающая замеряемую функцию
+            ops (int): Количество операций за один вызов функции
+        """
+        self.name = name
+        self.setup = setup
+        self.ops = ops
+
+    def run(self, repeat=5):
+        """
+        Выполнение замера
+
+        Количество вызовов в повторе подбирается так, чтобы повтор длился
+        не меньше MIN_REPEAT_TIME. Основной результат - лучший повтор: он
+        меньше всего зависит от фоновой нагрузки на машину.
+
+        Args:
+            repeat (int): Количество повторов
+
+        Returns:
+            dict: Наносекунды на операцию (лучший повтор и медиана) и параметры замера
+        """
+        timer = timeit.Timer(self.setup())
+
+        number = 1
+        while timer.timeit(number) < MIN_REPEAT_TIME:
+            number *= 2
+
+        times = [total / (number * self.ops) * 1e9 for total in timer.repeat(repeat, number)]
+        return {
+            'ns_per_op': min(times),
+            'median_ns_per_op': statistics.median(times),
+            'ops': self.ops,
+            'number': number,
+            'repeat': repeat
+        }
+
+
+def run_benchmarks(cases, repeat=5, selected=None, progress=None):
+    """
+    Выполнение набора замеров
+
+    Args:
+        cases (list): Список BenchmarkCase
+        repeat (int): Количество повторов каждого замера
+        selected (str): Выполнять только замеры, в имени которых есть эта строка
+        progress (callable): Вызывается с именем и результатом каждого замера
+
+    Returns:
+        dict: Описание окружения и результаты по именам замеров
+    """
+    results = {}
+    for case in cases:
+        if selected and selected not in case.name:
+            continue
+        results[case.name] = case.run(repeat)
+        if progress is not None:
+            progress(case.name, results[case.name])
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'system': platform.system()
+        },
+        'results': results
+    }
+
+
+def compare_results(current, baseline, tolerance=0.15):
+    """
+    Сравнение результатов с базовыми
+
+    Args:
+        current (dict): Текущие результаты run_benchmarks
+        baseline (dict): Базовые результаты в том же формате
+        tolerance (float): Допустимое относительное замедление
+
+    Returns:
+        list: Строки (имя, база нс/оп, текущее нс/оп, отношение, регрессия ли)
+            для замеров, которые есть в обоих результатах
+    """
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        ratio = result['ns_per_op'] / base['ns_per_op']
+        rows.append((name, base['ns_per_op'], result['ns_per_op'], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def save_results(path, results):
+    """Запись результатов в JSON"""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def load_results(path):
+    """Чтение результатов из JSON"""
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
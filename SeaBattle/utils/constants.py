@@ -21,6 +21,15 @@ GAME_SETTINGS = {
     'ship_configs': [(4, 1), (3, 2), (2, 3), (1, 4)],
     'canvas_size': 400,
     'cell_size': 32,
+    'save_file': 'seabattle.sav',
+    'match_archive': 'matches.sblog',
+    'match_archive_size': 1048576,
+    'ai_mode': 'smart',
+    'ai_difficulty': 'normal',
+    'ai_cache': 'ai_cache.sbtt',
+    'ai_cache_size': 65536,
+    'ai_weights': 'ai_weights.json',
+    'perf_csv': None,
     'font_sizes': {
         'title': 36,
         'button': 16,
@@ -29,6 +38,15 @@ GAME_SETTINGS = {
     }
 }
 
+# Ограничения поиска AnytimeAI по уровням сложности: steps - число шагов на ход
+# (1 - без оценки клеток, 2 - один шаг оценки), budget - время на ход в секундах;
+# None - без ограничения
+AI_DIFFICULTY = {
+    'easy': {'steps': 1, 'budget': None},
+    'normal': {'steps': 2, 'budget': None},
+    'hard': {'steps': None, 'budget': 0.05}
+}
+
 # Легенда
 LEGEND_ITEMS = [
     ("■", "Ваш корабль", "#3498DB"),
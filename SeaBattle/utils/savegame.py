@@ -0,0 +1,248 @@
+"""
+Модуль с двоичным форматом сохранения партии
+
+Партия записывается одной записью фиксированного размера (RECORD.size байт):
+    заголовок   3s B B B    сигнатура b"SBG", версия, флаги хода, размер поля
+    поле игрока 10H 16s     корабли и маска выстрелов
+    поле ИИ     10H 16s     корабли и маска выстрелов
+    ИИ          16s B B B B 4B
+                            маска выстрелов, режим, последнее попадание,
+                            направление, длина и клетки очереди целей
+
+Корабль - 16-битное число: x | y << 4 | размер << 8 | horizontal << 12
+(0 - пустой слот). Клетка - байт y * size + x (0xFF - нет клетки).
+Здоровье кораблей не хранится: оно восстанавливается повторением выстрелов.
+Записи одного размера можно складывать подряд в файл и читать через
+RECORD.iter_unpack без какого-либо разбора.
+"""
+
+import struct
+
+from models.board import Board
+from models.ship import Ship
+from utils.constants import GAME_SETTINGS
+
+
+MAGIC = b"SBG"
+VERSION = 1
+
+MAX_SHIPS = 10
+MAX_FOLLOW = 4
+NO_CELL = 0xFF
+MASK_BYTES = 16
+
+# Флаги хода
+FLAG_PLACEMENT = 1
+FLAG_PLAYER_TURN = 2
+FLAG_GAME_OVER = 4
+FLAG_HAS_AI = 8
+
+AI_MODES = ("hunt", "target")
+AI_DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+RECORD = struct.Struct(f"<3sBBB{MAX_SHIPS}H{MASK_BYTES}s{MAX_SHIPS}H{MASK_BYTES}s"
+                       f"{MASK_BYTES}sBBBB{MAX_FOLLOW}B")
+
+
+def pack_cells(cells, size):
+    """Упаковка множества клеток в битовую маску фиксированной длины"""
+    mask = 0
+    for x, y in cells:
+        mask |= 1 << (y * size + x)
+    return mask.to_bytes(MASK_BYTES, "little")
+
+
+def unpack_cells(data, size):
+    """Распаковка битовой маски в список клеток"""
+    mask = int.from_bytes(data, "little")
+    cells = []
+    while mask:
+        low = mask & -mask
+        index = low.bit_length() - 1
+        cells.append((index % size, index // size))
+        mask ^= low
+    return cells
+
+
+def pack_ships(board):
+    """Упаковка кораблей поля в MAX_SHIPS 16-битных чисел"""
+    ships = [ship.x | ship.y << 4 | ship.size << 8 | int(ship.horizontal) << 12
+             for ship in board.ships]
+    if len(ships) > MAX_SHIPS:
+        raise ValueError(f"На поле больше {MAX_SHIPS} кораблей")
+    return ships + [0] * (MAX_SHIPS - len(ships))
+
+
+def check_size(size):
+    """Проверка, что поле такого размера помещается в формат"""
+    if not 0 < size <= 15 or size * size > MASK_BYTES * 8:
+        raise ValueError(f"Формат не поддерживает поле {size}x{size}")
+
+
+def unpack_board(ships, shots, size):
+    """
+    Восстановление поля по кораблям и маске выстрелов
+
+    Args:
+        ships (tuple): Упакованные корабли
+        shots (bytes): Маска выстрелов
+        size (int): Размер поля
+
+    Returns:
+        Board: Поле с кораблями и выстрелами
+    """
+    # Кораблей каждого размера не больше, чем во флоте игры
+    fleet = dict(GAME_SETTINGS['ship_configs'])
+
+    board = Board(size)
+    for value in ships:
+        if value:
+            ship_size = value >> 8 & 0xF
+            if not fleet.get(ship_size):
+                raise ValueError("Повреждённое сохранение: лишний корабль")
+            fleet[ship_size] -= 1
+
+            ship = Ship(ship_size, value & 0xF, value >> 4 & 0xF, bool(value >> 12 & 1))
+            if not board.place_ship(ship):
+                raise ValueError("Повреждённое сохранение: корабли пересекаются или выходят за поле")
+
+    for x, y in unpack_cells(shots, size):
+        board.shoot(x, y)
+    return board
+
+
+def pack_game(player_board, computer_board, ai=None, placement_mode=False,
+              player_turn=True, game_over=False):
+    """
+    Упаковка партии в запись фиксированного размера
+
+    Args:
+        player_board (Board): Поле игрока
+        computer_board (Board): Поле компьютера
+        ai (SmartAI): ИИ компьютера (None - ИИ ещё не создан)
+        placement_mode (bool): Идёт ли расстановка
+        player_turn (bool): Ход игрока
+        game_over (bool): Окончена ли игра
+
+    Returns:
+        bytes: Запись партии
+    """
+    size = player_board.size
+    check_size(size)
+
+    flags = ((FLAG_PLACEMENT if placement_mode else 0) |
+             (FLAG_PLAYER_TURN if player_turn else 0) |
+             (FLAG_GAME_OVER if game_over else 0) |
+             (FLAG_HAS_AI if ai is not None else 0))
+
+    if ai is not None:
+        state = ai.get_state()
+        ai_shots = pack_cells(state['shots'], size)
+        mode = AI_MODES.index(state['mode'])
+        last_hit = NO_CELL if state['last_hit'] is None else state['last_hit'][1] * size + state['last_hit'][0]
+        direction = NO_CELL if state['hit_direction'] is None else AI_DIRECTIONS.index(state['hit_direction'])
+        if len(state['hits_to_follow']) > MAX_FOLLOW:
+            raise ValueError(f"Формат не поддерживает больше {MAX_FOLLOW} клеток добивания")
+        follow = [y * size + x for x, y in state['hits_to_follow']]
+    else:
+        ai_shots = bytes(MASK_BYTES)
+        mode = 0
+        last_hit = NO_CELL
+        direction = NO_CELL
+        follow = []
+
+    follow_count = len(follow)
+    follow += [NO_CELL] * (MAX_FOLLOW - follow_count)
+
+    return RECORD.pack(MAGIC, VERSION, flags, size,
+                       *pack_ships(player_board), pack_cells(player_board.shots, size),
+                       *pack_ships(computer_board), pack_cells(computer_board.shots, size),
+                       ai_shots, mode, last_hit, direction, follow_count, *follow)
+
+
+def unpack_game(data, offset=0):
+    """
+    Распаковка записи партии
+
+    Args:
+        data (bytes): Данные с одной или несколькими записями подряд
+        offset (int): Смещение записи в данных
+
+    Returns:
+        dict: Поля, состояние ИИ (или None) и флаги хода
+    """
+    if len(data) - offset < RECORD.size:
+        raise ValueError("Файл сохранения повреждён")
+
+    fields = RECORD.unpack_from(data, offset)
+    magic, version, flags, size = fields[:4]
+    if magic != MAGIC:
+        raise ValueError("Это не файл сохранения Морского боя")
+    if version != VERSION:
+        raise ValueError(f"Неподдерживаемая версия сохранения: {version}")
+    try:
+        check_size(size)
+    except ValueError:
+        raise ValueError("Повреждённое сохранение: неверный размер поля") from None
+
+    position = 4
+    player_ships = fields[position:position + MAX_SHIPS]
+    player_shots = fields[position + MAX_SHIPS]
+    position += MAX_SHIPS + 1
+    computer_ships = fields[position:position + MAX_SHIPS]
+    computer_shots = fields[position + MAX_SHIPS]
+    position += MAX_SHIPS + 1
+
+    ai_shots, mode, last_hit, direction, follow_count = fields[position:position + 5]
+    if follow_count > MAX_FOLLOW:
+        raise ValueError("Повреждённое сохранение: неверная длина очереди целей")
+    follow = fields[position + 5:position + 5 + follow_count]
+
+    cells = size * size
+    for mask in (player_shots, computer_shots, ai_shots):
+        if int.from_bytes(mask, "little") >> cells:
+            raise ValueError("Повреждённое сохранение: выстрел за пределами поля")
+
+    ai_state = None
+    if flags & FLAG_HAS_AI:
+        if (mode >= len(AI_MODES) or direction >= len(AI_DIRECTIONS) and direction != NO_CELL
+                or last_hit >= cells and last_hit != NO_CELL
+                or any(cell >= cells for cell in follow)):
+            raise ValueError("Повреждённое сохранение: неверное состояние ИИ")
+
+        ai_state = {
+            'shots': set(unpack_cells(ai_shots, size)),
+            'mode': AI_MODES[mode],
+            'last_hit': None if last_hit == NO_CELL else (last_hit % size, last_hit // size),
+            'hit_direction': None if direction == NO_CELL else AI_DIRECTIONS[direction],
+            'hits_to_follow': [(cell % size, cell // size) for cell in follow]
+        }
+
+    return {
+        'player_board': unpack_board(player_ships, player_shots, size),
+        'computer_board': unpack_board(computer_ships, computer_shots, size),
+        'ai_state': ai_state,
+        'placement_mode': bool(flags & FLAG_PLACEMENT),
+        'player_turn': bool(flags & FLAG_PLAYER_TURN),
+        'game_over': bool(flags & FLAG_GAME_OVER)
+    }
+
+
+def save_game(path, record):
+    """Запись упакованной партии в файл"""
+    with open(path, "wb") as file:
+        file.write(record)
+
+
+def load_game(path):
+    """
+    Чтение партии из файла
+
+    Args:
+        path (str): Путь к файлу сохранения
+
+    Returns:
+        dict: Распакованная партия (см. unpack_game)
+    """
+    with open(path, "rb") as file:
+        return unpack_game(file.read())